@@ -11,7 +11,7 @@ from alembic import context
 from app.db.session import Base
 from app.models import (  # noqa: F401
     User, Region, Mine, UserMine, GoalSeekScenario, NsrSnapshot,
-    BlockImport, Block, BlockNsrSnapshot, MineFeature,
+    BlockImport, Block, BlockNsrSnapshotBatch, MineFeature,
 )
 from app.config import get_settings
 
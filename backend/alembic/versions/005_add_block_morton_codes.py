@@ -0,0 +1,38 @@
+"""Add Morton codes to blocks for spatial range queries
+
+Revision ID: 005_block_morton
+Revises: 004_blocks_features
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "005_block_morton"
+down_revision: Union[str, None] = "004_blocks_features"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing imports keep NULL codes and fall back to coordinate filters
+    op.add_column("block_imports", sa.Column("morton_origin_x", sa.Float(), nullable=True))
+    op.add_column("block_imports", sa.Column("morton_origin_y", sa.Float(), nullable=True))
+    op.add_column("block_imports", sa.Column("morton_origin_z", sa.Float(), nullable=True))
+    op.add_column("block_imports", sa.Column("morton_cell_size", sa.Float(), nullable=True))
+
+    op.add_column("blocks", sa.Column("morton", sa.BigInteger(), nullable=True))
+    op.create_index("ix_blocks_morton", "blocks", ["import_id", "morton"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_blocks_morton", table_name="blocks")
+    op.drop_column("blocks", "morton")
+
+    op.drop_column("block_imports", "morton_cell_size")
+    op.drop_column("block_imports", "morton_origin_z")
+    op.drop_column("block_imports", "morton_origin_y")
+    op.drop_column("block_imports", "morton_origin_x")
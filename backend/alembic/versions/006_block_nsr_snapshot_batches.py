@@ -0,0 +1,202 @@
+"""Store block NSR snapshots as one packed row per calculation run
+
+Revision ID: 006_snapshot_batches
+Revises: 005_block_morton
+Create Date: 2026-10-15
+
+"""
+import sys
+import uuid
+from array import array
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "006_snapshot_batches"
+down_revision: Union[str, None] = "005_block_morton"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _pack(values) -> bytes:
+    packed = array("d", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(blob: bytes) -> array:
+    values = array("d")
+    values.frombytes(blob)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def upgrade() -> None:
+    batches = op.create_table(
+        "block_nsr_snapshot_batches",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "import_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("block_imports.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "calculated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("cu_price", sa.Float(), nullable=False),
+        sa.Column("au_price", sa.Float(), nullable=False),
+        sa.Column("ag_price", sa.Float(), nullable=False),
+        sa.Column("cutoff_cost", sa.Float(), nullable=False),
+        # Per-block results: 16-byte ids (sorted) and aligned float64 arrays
+        sa.Column("block_count", sa.Integer(), nullable=False),
+        sa.Column("block_ids", sa.LargeBinary(), nullable=False),
+        sa.Column("nsr_per_tonne", sa.LargeBinary(), nullable=False),
+        sa.Column("nsr_cu", sa.LargeBinary(), nullable=False),
+        sa.Column("nsr_au", sa.LargeBinary(), nullable=False),
+        sa.Column("nsr_ag", sa.LargeBinary(), nullable=False),
+    )
+    op.create_index(
+        "ix_block_nsr_snapshot_batches_import_calc",
+        "block_nsr_snapshot_batches",
+        ["import_id", "calculated_at"],
+    )
+
+    # ── Fold existing per-block rows into batches ─────────────
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        """
+        SELECT b.import_id, s.calculated_at, s.cu_price, s.au_price,
+               s.ag_price, s.cutoff_cost, s.block_id,
+               s.nsr_per_tonne, s.nsr_cu, s.nsr_au, s.nsr_ag
+        FROM block_nsr_snapshots s
+        JOIN blocks b ON b.id = s.block_id
+        ORDER BY b.import_id, s.calculated_at, s.block_id
+        """
+    ).columns(
+        import_id=UUID(as_uuid=True),
+        calculated_at=sa.DateTime(timezone=True),
+        block_id=UUID(as_uuid=True),
+    ))
+
+    def flush(key, header, results):
+        ids = sorted(results)
+        columns = list(zip(*(results[i] for i in ids), strict=True))
+        bind.execute(batches.insert().values(
+            id=uuid.uuid4(),
+            import_id=key[0],
+            calculated_at=key[1],
+            cu_price=header[0],
+            au_price=header[1],
+            ag_price=header[2],
+            cutoff_cost=header[3],
+            block_count=len(ids),
+            block_ids=b"".join(i.bytes for i in ids),
+            nsr_per_tonne=_pack(columns[0]),
+            nsr_cu=_pack(columns[1]),
+            nsr_au=_pack(columns[2]),
+            nsr_ag=_pack(columns[3]),
+        ))
+
+    key = header = None
+    results = {}
+    for row in rows:
+        row_key = (row.import_id, row.calculated_at)
+        if row_key != key:
+            if results:
+                flush(key, header, results)
+            key = row_key
+            header = (row.cu_price, row.au_price, row.ag_price, row.cutoff_cost)
+            results = {}
+        results[row.block_id] = (row.nsr_per_tonne, row.nsr_cu, row.nsr_au, row.nsr_ag)
+    if results:
+        flush(key, header, results)
+
+    op.drop_table("block_nsr_snapshots")
+
+
+def downgrade() -> None:
+    snapshots = op.create_table(
+        "block_nsr_snapshots",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "block_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("blocks.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "calculated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("nsr_per_tonne", sa.Float(), nullable=False),
+        sa.Column("nsr_cu", sa.Float(), nullable=False),
+        sa.Column("nsr_au", sa.Float(), nullable=False),
+        sa.Column("nsr_ag", sa.Float(), nullable=False),
+        sa.Column("cu_price", sa.Float(), nullable=False),
+        sa.Column("au_price", sa.Float(), nullable=False),
+        sa.Column("ag_price", sa.Float(), nullable=False),
+        sa.Column("cutoff_cost", sa.Float(), nullable=False),
+        sa.Column("is_viable", sa.Boolean(), nullable=False),
+        sa.Column("margin", sa.Float(), nullable=False),
+    )
+    op.create_index(
+        "ix_block_nsr_snapshots_block_calc",
+        "block_nsr_snapshots",
+        ["block_id", "calculated_at"],
+    )
+    op.create_index(
+        "ix_block_nsr_snapshots_calc",
+        "block_nsr_snapshots",
+        ["calculated_at"],
+    )
+
+    # ── Expand batches back into per-block rows ───────────────
+    bind = op.get_bind()
+    batches = bind.execute(sa.text(
+        """
+        SELECT calculated_at, cu_price, au_price, ag_price, cutoff_cost,
+               block_count, block_ids, nsr_per_tonne, nsr_cu, nsr_au, nsr_ag
+        FROM block_nsr_snapshot_batches
+        """
+    ).columns(calculated_at=sa.DateTime(timezone=True)))
+    for batch in batches:
+        ids = bytes(batch.block_ids)
+        nsr, cu, au, ag = (
+            _unpack(bytes(blob))
+            for blob in (batch.nsr_per_tonne, batch.nsr_cu, batch.nsr_au, batch.nsr_ag)
+        )
+        bind.execute(snapshots.insert(), [
+            {
+                "id": uuid.uuid4(),
+                "block_id": uuid.UUID(bytes=ids[16 * i:16 * i + 16]),
+                "calculated_at": batch.calculated_at,
+                "nsr_per_tonne": nsr[i],
+                "nsr_cu": cu[i],
+                "nsr_au": au[i],
+                "nsr_ag": ag[i],
+                "cu_price": batch.cu_price,
+                "au_price": batch.au_price,
+                "ag_price": batch.ag_price,
+                "cutoff_cost": batch.cutoff_cost,
+                "is_viable": nsr[i] >= batch.cutoff_cost,
+                "margin": nsr[i] - batch.cutoff_cost,
+            }
+            for i in range(batch.block_count)
+        ])
+
+    op.drop_index(
+        "ix_block_nsr_snapshot_batches_import_calc",
+        table_name="block_nsr_snapshot_batches",
+    )
+    op.drop_table("block_nsr_snapshot_batches")
@@ -0,0 +1,32 @@
+"""Replace the blocks (import_id, z) B-tree with a BRIN index
+
+Revision ID: 007_blocks_z_brin
+Revises: 006_snapshot_batches
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007_blocks_z_brin"
+down_revision: Union[str, None] = "006_snapshot_batches"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_blocks_import_z", table_name="blocks")
+    op.create_index(
+        "ix_blocks_import_z_brin",
+        "blocks",
+        ["import_id", "z"],
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_blocks_import_z_brin", table_name="blocks")
+    op.create_index("ix_blocks_import_z", "blocks", ["import_id", "z"])
@@ -0,0 +1,26 @@
+"""Drop the redundant blocks.import_id index
+
+ix_blocks_morton (import_id, morton) already answers import_id lookups.
+
+Revision ID: 008_drop_blocks_import_idx
+Revises: 007_blocks_z_brin
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "008_drop_blocks_import_idx"
+down_revision: Union[str, None] = "007_blocks_z_brin"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_blocks_import_id", table_name="blocks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_blocks_import_id", "blocks", ["import_id"])
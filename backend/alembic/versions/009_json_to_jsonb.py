@@ -0,0 +1,47 @@
+"""Store JSON columns as jsonb
+
+Revision ID: 009_jsonb
+Revises: 008_drop_blocks_import_idx
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "009_jsonb"
+down_revision: Union[str, None] = "008_drop_blocks_import_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [
+    ("mines", "recovery_params"),
+    ("mines", "commercial_terms"),
+    ("goal_seek_scenarios", "base_inputs"),
+    ("nsr_snapshots", "metadata_extra"),
+    ("block_imports", "column_mapping"),
+    ("blocks", "extra_attributes"),
+]
+
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            postgresql_using=f"{column}::jsonb",
+        )
+
+
+def downgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSON(astext_type=sa.Text()),
+            postgresql_using=f"{column}::json",
+        )
@@ -0,0 +1,35 @@
+"""Cover the snapshot id in the nsr_snapshots (scenario_id, timestamp) index
+
+Revision ID: 010_nsr_snapshots_inc
+Revises: 009_jsonb
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "010_nsr_snapshots_inc"
+down_revision: Union[str, None] = "009_jsonb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_nsr_snapshots_scenario_ts_inc",
+        "nsr_snapshots",
+        ["scenario_id", "timestamp"],
+        postgresql_include=["id"],
+    )
+    op.drop_index("ix_nsr_snapshots_scenario_timestamp", table_name="nsr_snapshots")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_nsr_snapshots_scenario_timestamp",
+        "nsr_snapshots",
+        ["scenario_id", "timestamp"],
+    )
+    op.drop_index("ix_nsr_snapshots_scenario_ts_inc", table_name="nsr_snapshots")
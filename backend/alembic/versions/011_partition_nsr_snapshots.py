@@ -0,0 +1,132 @@
+"""Partition nsr_snapshots by month on timestamp
+
+The table is rebuilt as PARTITION BY RANGE (timestamp) with one partition
+per UTC month that has data, plus the current and next month. Later
+months are created by the alert checker before it writes.
+
+Revision ID: 011_nsr_snapshots_partitioned
+Revises: 010_nsr_snapshots_inc
+Create Date: 2026-10-15
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "011_nsr_snapshots_partitioned"
+down_revision: Union[str, None] = "010_nsr_snapshots_inc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, scenario_id, timestamp, nsr_per_tonne, nsr_cu, nsr_au, nsr_ag, "
+    "cu_price, au_price, ag_price, cu_tc, cu_rc, cu_freight, is_viable, metadata_extra"
+)
+
+
+def _columns():
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "scenario_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("goal_seek_scenarios.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("nsr_per_tonne", sa.Float(), nullable=False),
+        sa.Column("nsr_cu", sa.Float(), nullable=False),
+        sa.Column("nsr_au", sa.Float(), nullable=False),
+        sa.Column("nsr_ag", sa.Float(), nullable=False),
+        sa.Column("cu_price", sa.Float(), nullable=False),
+        sa.Column("au_price", sa.Float(), nullable=False),
+        sa.Column("ag_price", sa.Float(), nullable=False),
+        sa.Column("cu_tc", sa.Float(), nullable=False),
+        sa.Column("cu_rc", sa.Float(), nullable=False),
+        sa.Column("cu_freight", sa.Float(), nullable=False),
+        sa.Column("is_viable", sa.Boolean(), nullable=False),
+        sa.Column("metadata_extra", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    ]
+
+
+def _next_month(start: datetime) -> datetime:
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def upgrade() -> None:
+    op.rename_table("nsr_snapshots", "nsr_snapshots_unpartitioned")
+    op.execute(
+        "ALTER TABLE nsr_snapshots_unpartitioned "
+        "RENAME CONSTRAINT nsr_snapshots_pkey TO nsr_snapshots_unpartitioned_pkey"
+    )
+    op.drop_index("ix_nsr_snapshots_scenario_ts_inc", table_name="nsr_snapshots_unpartitioned")
+
+    op.create_table(
+        "nsr_snapshots",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "timestamp", name="nsr_snapshots_pkey"),
+        postgresql_partition_by='RANGE ("timestamp")',
+    )
+    op.create_index(
+        "ix_nsr_snapshots_scenario_ts_inc",
+        "nsr_snapshots",
+        ["scenario_id", "timestamp"],
+        postgresql_include=["id"],
+    )
+
+    # One partition per month with data, through next month
+    bind = op.get_bind()
+    months = {
+        row[0] for row in bind.execute(sa.text(
+            """SELECT DISTINCT date_trunc('month', "timestamp" AT TIME ZONE 'UTC') """
+            "FROM nsr_snapshots_unpartitioned"
+        ))
+    }
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    current = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    months |= {current, _next_month(current)}
+    for start in sorted(months):
+        end = _next_month(start)
+        op.execute(
+            f"CREATE TABLE nsr_snapshots_y{start.year:04d}m{start.month:02d} "
+            f"PARTITION OF nsr_snapshots "
+            f"FOR VALUES FROM ('{start.isoformat()}+00:00') TO ('{end.isoformat()}+00:00')"
+        )
+
+    op.execute(
+        f"INSERT INTO nsr_snapshots ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM nsr_snapshots_unpartitioned"
+    )
+    op.drop_table("nsr_snapshots_unpartitioned")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "nsr_snapshots_unpartitioned",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", name="nsr_snapshots_unpartitioned_pkey"),
+    )
+    op.execute(
+        f"INSERT INTO nsr_snapshots_unpartitioned ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM nsr_snapshots"
+    )
+    # Drops every partition with it
+    op.drop_table("nsr_snapshots")
+
+    op.rename_table("nsr_snapshots_unpartitioned", "nsr_snapshots")
+    op.execute(
+        "ALTER TABLE nsr_snapshots "
+        "RENAME CONSTRAINT nsr_snapshots_unpartitioned_pkey TO nsr_snapshots_pkey"
+    )
+    op.create_index(
+        "ix_nsr_snapshots_scenario_ts_inc",
+        "nsr_snapshots",
+        ["scenario_id", "timestamp"],
+        postgresql_include=["id"],
+    )
@@ -0,0 +1,56 @@
+"""Key nsr_snapshots by (scenario_id, timestamp) and drop the surrogate id
+
+Revision ID: 012_nsr_snapshots_natural_key
+Revises: 011_nsr_snapshots_partitioned
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "012_nsr_snapshots_natural_key"
+down_revision: Union[str, None] = "011_nsr_snapshots_partitioned"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The new key needs one row per scenario and instant: drop exact-time duplicates
+    op.execute(
+        """
+        DELETE FROM nsr_snapshots a
+        USING nsr_snapshots b
+        WHERE a.scenario_id = b.scenario_id
+          AND a."timestamp" = b."timestamp"
+          AND a.id < b.id
+        """
+    )
+    op.drop_constraint("nsr_snapshots_pkey", "nsr_snapshots", type_="primary")
+    op.drop_index("ix_nsr_snapshots_scenario_ts_inc", table_name="nsr_snapshots")
+    op.drop_column("nsr_snapshots", "id")
+    op.create_primary_key("nsr_snapshots_pkey", "nsr_snapshots", ["scenario_id", "timestamp"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("nsr_snapshots_pkey", "nsr_snapshots", type_="primary")
+    op.add_column(
+        "nsr_snapshots",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+    )
+    op.alter_column("nsr_snapshots", "id", server_default=None)
+    op.create_primary_key("nsr_snapshots_pkey", "nsr_snapshots", ["id", "timestamp"])
+    op.create_index(
+        "ix_nsr_snapshots_scenario_ts_inc",
+        "nsr_snapshots",
+        ["scenario_id", "timestamp"],
+        postgresql_include=["id"],
+    )
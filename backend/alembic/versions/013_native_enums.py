@@ -0,0 +1,65 @@
+"""Store low-cardinality string columns as native enums
+
+Revision ID: 013_native_enums
+Revises: 012_nsr_snapshots_natural_key
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "013_native_enums"
+down_revision: Union[str, None] = "012_nsr_snapshots_natural_key"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, enum name, values, previous length, default)
+ENUM_COLUMNS = [
+    ("mines", "primary_metal", "metal_enum", ("Cu", "Au", "Zn", "Ni", "Fe"), 10, None),
+    ("mines", "mining_method", "mining_method_enum", ("UG", "OP"), 20, None),
+    ("user_mines", "role", "user_role_enum", ("admin", "editor", "viewer"), 50, None),
+    (
+        "goal_seek_scenarios",
+        "alert_frequency",
+        "alert_frequency_enum",
+        ("hourly", "daily", "weekly"),
+        20,
+        "'daily'",
+    ),
+]
+
+
+def upgrade() -> None:
+    for table, column, name, values, _, default in ENUM_COLUMNS:
+        enum = postgresql.ENUM(*values, name=name)
+        enum.create(op.get_bind())
+        # The old default is a varchar expression and would block the cast
+        if default:
+            op.alter_column(table, column, server_default=None)
+        op.alter_column(
+            table,
+            column,
+            type_=enum,
+            postgresql_using=f"{column}::text::{name}",
+        )
+        if default:
+            op.alter_column(table, column, server_default=sa.text(f"{default}::{name}"))
+
+
+def downgrade() -> None:
+    for table, column, name, _values, length, default in ENUM_COLUMNS:
+        if default:
+            op.alter_column(table, column, server_default=None)
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(length),
+            postgresql_using=f"{column}::text",
+        )
+        if default:
+            op.alter_column(table, column, server_default=sa.text(default))
+        postgresql.ENUM(name=name).drop(op.get_bind())
@@ -9,11 +9,11 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func, distinct, cast, Date
+from sqlalchemy import select, delete, func, distinct, cast, Date, or_
 from starlette.responses import StreamingResponse
 
 from app.db.session import get_db
-from app.models.block_model import Block, BlockImport, BlockNsrSnapshot
+from app.models.block_model import Block, BlockImport, BlockNsr, BlockNsrSnapshotBatch
 from app.models.mine import Mine
 from app.models.user import User
 from app.auth.dependencies import get_current_user
@@ -26,6 +26,7 @@ from app.services.block_import import (
     KNOWN_FIELDS,
 )
 from app.services.block_nsr import calculate_nsr_for_import
+from app.services.morton import MortonGrid
 
 router = APIRouter(prefix="/blocks", tags=["Blocks"])
 
@@ -35,6 +36,21 @@ def _parse_snapshot_date(snapshot: str) -> date:
     return datetime.fromisoformat(snapshot).date() if "T" in snapshot else date.fromisoformat(snapshot)
 
 
+async def _latest_batch(
+    db: AsyncSession, import_id: uuid.UUID, snapshot: Optional[str] = None
+) -> Optional[BlockNsrSnapshotBatch]:
+    """Latest NSR snapshot batch of an import, optionally on a given date."""
+    query = select(BlockNsrSnapshotBatch).where(
+        BlockNsrSnapshotBatch.import_id == import_id
+    )
+    if snapshot:
+        query = query.where(
+            cast(BlockNsrSnapshotBatch.calculated_at, Date) == _parse_snapshot_date(snapshot)
+        )
+    query = query.order_by(BlockNsrSnapshotBatch.calculated_at.desc()).limit(1)
+    return (await db.execute(query)).scalar_one_or_none()
+
+
 # ──────────────────────────────────────────────────────────
 # Request / Response schemas
 # ──────────────────────────────────────────────────────────
@@ -360,6 +376,12 @@ async def list_blocks(
     rock_type: Optional[str] = Query(default=None),
     cu_min: Optional[float] = Query(default=None),
     cu_max: Optional[float] = Query(default=None),
+    x_min: Optional[float] = Query(default=None),
+    x_max: Optional[float] = Query(default=None),
+    y_min: Optional[float] = Query(default=None),
+    y_max: Optional[float] = Query(default=None),
+    z_min: Optional[float] = Query(default=None),
+    z_max: Optional[float] = Query(default=None),
     viable_only: Optional[bool] = Query(default=None),
     snapshot_date: Optional[str] = Query(default=None),
     page: int = Query(default=1, ge=1),
@@ -379,6 +401,34 @@ async def list_blocks(
     if cu_max is not None:
         query = query.where(Block.cu_grade <= cu_max)
 
+    # Spatial box: exact coordinate bounds, narrowed by Morton code ranges
+    lower = (x_min, y_min, z_min)
+    upper = (x_max, y_max, z_max)
+    if any(v is not None for v in lower + upper):
+        for axis, lo, hi in zip("xyz", lower, upper, strict=True):
+            if lo is not None and hi is not None and lo > hi:
+                raise HTTPException(422, f"{axis}_min must not exceed {axis}_max")
+        for column, lo, hi in zip((Block.x, Block.y, Block.z), lower, upper, strict=True):
+            if lo is not None:
+                query = query.where(column >= lo)
+            if hi is not None:
+                query = query.where(column <= hi)
+
+        grid_row = (await db.execute(
+            select(
+                BlockImport.morton_origin_x,
+                BlockImport.morton_origin_y,
+                BlockImport.morton_origin_z,
+                BlockImport.morton_cell_size,
+            ).where(BlockImport.id == import_id)
+        )).one_or_none()
+        if grid_row is not None and grid_row.morton_cell_size is not None:
+            grid = MortonGrid(*grid_row)
+            query = query.where(or_(*(
+                Block.morton.between(start, end)
+                for start, end in grid.ranges(lower, upper)
+            )))
+
     # Count total
     count_q = select(func.count()).select_from(query.subquery())
     total = (await db.execute(count_q)).scalar() or 0
@@ -390,21 +440,11 @@ async def list_blocks(
     blocks = result.scalars().all()
 
     # Always load latest snapshot data for each block
-    snapshot_data: Dict[uuid.UUID, BlockNsrSnapshot] = {}
+    snapshot_data: Dict[uuid.UUID, BlockNsr] = {}
     if blocks:
-        block_ids = [b.id for b in blocks]
-        snap_q = select(BlockNsrSnapshot).where(
-            BlockNsrSnapshot.block_id.in_(block_ids)
-        )
-        if snapshot_date:
-            snap_q = snap_q.where(
-                cast(BlockNsrSnapshot.calculated_at, Date) == _parse_snapshot_date(snapshot_date)
-            )
-        snap_q = snap_q.order_by(BlockNsrSnapshot.calculated_at.desc())
-        snap_result = await db.execute(snap_q)
-        for snap in snap_result.scalars().all():
-            if snap.block_id not in snapshot_data:
-                snapshot_data[snap.block_id] = snap
+        batch = await _latest_batch(db, import_id, snapshot_date)
+        if batch is not None:
+            snapshot_data = batch.lookup(b.id for b in blocks)
 
     items = []
     for b in blocks:
@@ -508,12 +548,10 @@ async def list_snapshots(
     db: AsyncSession = Depends(get_db),
 ):
     """List available snapshot dates for an import."""
-    # Get distinct calculated_at dates via blocks
     result = await db.execute(
-        select(distinct(func.date(BlockNsrSnapshot.calculated_at)))
-        .join(Block, Block.id == BlockNsrSnapshot.block_id)
-        .where(Block.import_id == import_id)
-        .order_by(func.date(BlockNsrSnapshot.calculated_at).desc())
+        select(distinct(func.date(BlockNsrSnapshotBatch.calculated_at)))
+        .where(BlockNsrSnapshotBatch.import_id == import_id)
+        .order_by(func.date(BlockNsrSnapshotBatch.calculated_at).desc())
     )
     dates = [row[0].isoformat() if hasattr(row[0], "isoformat") else str(row[0]) for row in result.fetchall()]
     return {"snapshots": dates, "count": len(dates)}
@@ -541,29 +579,16 @@ async def get_heatmap(
     if not blocks:
         raise HTTPException(404, f"No blocks at z={z}")
 
-    block_ids = [b.id for b in blocks]
-
     # Get latest snapshot for each block
-    snap_q = (
-        select(BlockNsrSnapshot)
-        .where(BlockNsrSnapshot.block_id.in_(block_ids))
-    )
-    if snapshot:
-        snap_q = snap_q.where(
-            cast(BlockNsrSnapshot.calculated_at, Date) == _parse_snapshot_date(snapshot)
-        )
-    snap_q = snap_q.order_by(BlockNsrSnapshot.calculated_at.desc())
-
-    snap_result = await db.execute(snap_q)
-    snap_map: Dict[uuid.UUID, BlockNsrSnapshot] = {}
+    batch = await _latest_batch(db, import_id, snapshot)
+    snap_map: Dict[uuid.UUID, BlockNsr] = {}
     cutoff = 0.0
     snap_date = ""
-    for s in snap_result.scalars().all():
-        if s.block_id not in snap_map:
-            snap_map[s.block_id] = s
-            cutoff = s.cutoff_cost
-            if not snap_date:
-                snap_date = s.calculated_at.strftime("%Y-%m-%d")
+    if batch is not None:
+        snap_map = batch.lookup(b.id for b in blocks)
+        if snap_map:
+            cutoff = batch.cutoff_cost
+            snap_date = batch.calculated_at.strftime("%Y-%m-%d")
 
     heatmap_blocks = []
     for b in blocks:
@@ -614,24 +639,16 @@ async def get_stats(
     if not blocks:
         raise HTTPException(404, "No blocks found.")
 
-    block_ids = [b.id for b in blocks]
     tonnage_map = {b.id: b.tonnage or 0.0 for b in blocks}
 
     # Get snapshots
-    snap_q = select(BlockNsrSnapshot).where(
-        BlockNsrSnapshot.block_id.in_(block_ids)
-    )
-    if snapshot:
-        snap_q = snap_q.where(
-            cast(BlockNsrSnapshot.calculated_at, Date) == _parse_snapshot_date(snapshot)
-        )
-    snap_q = snap_q.order_by(BlockNsrSnapshot.calculated_at.desc())
-
-    snap_result = await db.execute(snap_q)
-    snap_map: Dict[uuid.UUID, BlockNsrSnapshot] = {}
-    for s in snap_result.scalars().all():
-        if s.block_id not in snap_map:
-            snap_map[s.block_id] = s
+    batch = await _latest_batch(db, import_id, snapshot)
+    snap_map: Dict[uuid.UUID, BlockNsr] = {}
+    if batch is not None:
+        snap_map = {
+            block_id: s for block_id, s in batch.results().items()
+            if block_id in tonnage_map
+        }
 
     if not snap_map:
         return StatsResponse(
@@ -650,14 +667,14 @@ async def get_stats(
             cutoff_cost=0.0,
         )
 
-    cutoff = list(snap_map.values())[0].cutoff_cost
+    cutoff = batch.cutoff_cost
     marginal_upper = cutoff * 1.10  # 10%
     viable = marginal = inviable = 0
     viable_t = marginal_t = inviable_t = total_t = 0.0
     nsr_sum = 0.0
     min_nsr = float("inf")
     max_nsr = float("-inf")
-    snap_date = ""
+    snap_date = batch.calculated_at.strftime("%Y-%m-%d")
 
     for block_id, s in snap_map.items():
         t = tonnage_map.get(block_id, 0.0)
@@ -665,8 +682,6 @@ async def get_stats(
         nsr_sum += s.nsr_per_tonne
         min_nsr = min(min_nsr, s.nsr_per_tonne)
         max_nsr = max(max_nsr, s.nsr_per_tonne)
-        if not snap_date:
-            snap_date = s.calculated_at.strftime("%Y-%m-%d")
 
         if s.is_viable:
             if s.nsr_per_tonne <= marginal_upper:
@@ -713,52 +728,55 @@ async def viability_timeline(
     if not block_rows:
         return ViabilityTimelineResponse(import_id=str(import_id), points=[])
 
-    block_ids = [r[0] for r in block_rows]
     tonnage_map = {r[0]: r[1] or 0.0 for r in block_rows}
 
-    # Get all snapshots grouped by date
-    snap_result = await db.execute(
-        select(BlockNsrSnapshot)
-        .where(BlockNsrSnapshot.block_id.in_(block_ids))
-        .order_by(BlockNsrSnapshot.calculated_at)
+    # Get all snapshot batches grouped by date
+    batch_result = await db.execute(
+        select(BlockNsrSnapshotBatch)
+        .where(BlockNsrSnapshotBatch.import_id == import_id)
+        .order_by(BlockNsrSnapshotBatch.calculated_at)
     )
-    snapshots = list(snap_result.scalars().all())
+    batches = list(batch_result.scalars().all())
 
     # Group by date
     from collections import defaultdict
 
-    by_date: Dict[str, List[BlockNsrSnapshot]] = defaultdict(list)
-    for s in snapshots:
-        date_key = s.calculated_at.strftime("%Y-%m-%d %H:%M")
-        by_date[date_key].append(s)
+    by_date: Dict[str, List[BlockNsrSnapshotBatch]] = defaultdict(list)
+    for batch in batches:
+        date_key = batch.calculated_at.strftime("%Y-%m-%d %H:%M")
+        by_date[date_key].append(batch)
 
     points: List[ViabilityTimelinePoint] = []
     for date_key in sorted(by_date.keys()):
-        snaps = by_date[date_key]
-        cutoff = snaps[0].cutoff_cost
+        group = by_date[date_key]
+        cutoff = group[0].cutoff_cost
         marginal_upper = cutoff * 1.10
         viable = marginal = inv = 0
         viable_t = marginal_t = inv_t = 0.0
         nsr_sum = 0.0
-        cu_price = snaps[0].cu_price
-        au_price = snaps[0].au_price
-        ag_price = snaps[0].ag_price
-
-        for s in snaps:
-            t = tonnage_map.get(s.block_id, 0.0)
-            nsr_sum += s.nsr_per_tonne
-            if s.is_viable:
-                if s.nsr_per_tonne <= marginal_upper:
-                    marginal += 1
-                    marginal_t += t
+        n = 0
+        cu_price = group[0].cu_price
+        au_price = group[0].au_price
+        ag_price = group[0].ag_price
+
+        for batch in group:
+            for block_id, s in batch.results().items():
+                if block_id not in tonnage_map:
+                    continue
+                n += 1
+                t = tonnage_map[block_id]
+                nsr_sum += s.nsr_per_tonne
+                if s.is_viable:
+                    if s.nsr_per_tonne <= marginal_upper:
+                        marginal += 1
+                        marginal_t += t
+                    else:
+                        viable += 1
+                        viable_t += t
                 else:
-                    viable += 1
-                    viable_t += t
-            else:
-                inv += 1
-                inv_t += t
+                    inv += 1
+                    inv_t += t
 
-        n = len(snaps)
         points.append(
             ViabilityTimelinePoint(
                 snapshot_date=date_key,
@@ -806,20 +824,9 @@ async def export_csv(
     blocks = list(blocks_result.scalars().all())
 
     # Load snapshots
-    block_ids = [b.id for b in blocks]
-    snap_q = select(BlockNsrSnapshot).where(
-        BlockNsrSnapshot.block_id.in_(block_ids)
-    )
-    if snapshot:
-        snap_q = snap_q.where(
-            cast(BlockNsrSnapshot.calculated_at, Date) == _parse_snapshot_date(snapshot)
-        )
-    snap_q = snap_q.order_by(BlockNsrSnapshot.calculated_at.desc())
-    snap_result = await db.execute(snap_q)
-    snap_map: Dict[uuid.UUID, BlockNsrSnapshot] = {}
-    for s in snap_result.scalars().all():
-        if s.block_id not in snap_map:
-            snap_map[s.block_id] = s
+    batch = await _latest_batch(db, import_id, snapshot)
+    snap_map: Dict[uuid.UUID, BlockNsr] = batch.results() if batch is not None else {}
+    calculated_at = batch.calculated_at.isoformat() if batch is not None else ""
 
     # Build inverse mapping: internal_field -> csv_header
     inv_mapping = {v: k for k, v in bi.column_mapping.items()}
@@ -878,9 +885,9 @@ async def export_csv(
                 s.nsr_au,
                 s.nsr_ag,
                 s.is_viable,
-                s.cutoff_cost,
+                batch.cutoff_cost,
                 s.margin,
-                s.calculated_at.isoformat() if s.calculated_at else "",
+                calculated_at,
             ])
         else:
             row.extend([""] * len(nsr_headers))
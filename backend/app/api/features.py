@@ -13,6 +13,7 @@ from app.db.session import get_db
 from app.models.mine_feature import MineFeature
 from app.models.user import User
 from app.auth.dependencies import get_current_user, require_admin
+from app.auth.feature_guard import invalidate_feature_cache
 from app.features import FEATURE_CATALOG
 
 router = APIRouter(tags=["Features"])
@@ -169,7 +170,10 @@ async def update_mine_feature(
         )
         db.add(record)
 
-    await db.flush()
+    # Commit before evicting: get_db commits only after the response, and a
+    # guarded request in between would re-cache the old row
+    await db.commit()
+    invalidate_feature_cache(mine_id, feature_key)
 
     return FeatureUpdateResponse(
         feature_key=feature_key,
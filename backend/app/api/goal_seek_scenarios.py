@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 
+from app.db.enums import ALERT_FREQUENCIES
 from app.db.session import get_db
 from app.models.user import User
 from app.models.goal_seek import GoalSeekScenario, NsrSnapshot
@@ -104,7 +105,7 @@ class SnapshotHistoryResponse(BaseModel):
 # Helpers
 # ──────────────────────────────────────────────────────────
 
-VALID_FREQUENCIES = {"hourly", "daily", "weekly"}
+VALID_FREQUENCIES = set(ALERT_FREQUENCIES)
 
 
 def _scenario_to_response(s: GoalSeekScenario) -> ScenarioResponse:
@@ -1,29 +1,36 @@
 """Mine CRUD endpoints."""
 
+import logging
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer_group
 
+from app.db.enums import METALS, MINING_METHODS, USER_ROLES
 from app.db.session import get_db
-from app.models.mine import Mine
+from app.models.mine import MINE_CONFIG, Mine
 from app.models.region import Region
 from app.models.user import User
 from app.models.user_mine import UserMine
 from app.models.mine_feature import MineFeature
 from app.auth.dependencies import get_current_user, require_admin
-from app.auth.permissions import get_accessible_mine_ids, check_mine_access
+from app.auth.permissions import check_mine_access, get_user_role_for_mine
 from app.features import FEATURE_CATALOG
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/mines", tags=["mines"])
 
 
-# Supported primary metals
-SUPPORTED_METALS = ["Cu", "Au", "Zn", "Ni", "Fe"]
+# Supported primary metals and mining methods
+SUPPORTED_METALS = list(METALS)
+SUPPORTED_METHODS = list(MINING_METHODS)
 
 
 class MineCreate(BaseModel):
@@ -84,34 +91,32 @@ async def list_mines(
     List mines accessible to the current user.
     
     Admins see all mines. Regular users see only mines they have access to.
+    The JSON body is streamed one mine at a time so memory stays bounded
+    for tenants with thousands of mines.
     """
-    # Get accessible mine IDs
-    if current_user.is_admin:
-        query = select(Mine).options(selectinload(Mine.region))
-        if region_id:
-            query = query.where(Mine.region_id == region_id)
-    else:
-        accessible_ids = await get_accessible_mine_ids(db, current_user)
-        query = (
-            select(Mine)
-            .options(selectinload(Mine.region))
-            .where(Mine.id.in_(accessible_ids))
+    # Resolve the user's roles up front (one query instead of one per mine)
+    conditions = []
+    roles: Dict[uuid.UUID, str] = {}
+    if not current_user.is_admin:
+        role_result = await db.execute(
+            select(UserMine.mine_id, UserMine.role).where(
+                UserMine.user_id == current_user.id
+            )
         )
-        if region_id:
-            query = query.where(Mine.region_id == region_id)
+        roles = dict(role_result.all())
+        conditions.append(Mine.id.in_(list(roles)))
+    if region_id:
+        conditions.append(Mine.region_id == region_id)
     
-    query = query.order_by(Mine.name)
-    result = await db.execute(query)
-    mines = result.scalars().all()
-    
-    # Pre-load feature toggles for all mines
-    mine_ids = [m.id for m in mines]
+    # Pre-load feature toggles for all listed mines
     feat_result = await db.execute(
-        select(MineFeature).where(MineFeature.mine_id.in_(mine_ids))
+        select(
+            MineFeature.mine_id, MineFeature.feature_key, MineFeature.enabled
+        ).where(MineFeature.mine_id.in_(select(Mine.id).where(*conditions)))
     )
     feat_by_mine: Dict[uuid.UUID, Dict[str, bool]] = {}
-    for feat in feat_result.scalars().all():
-        feat_by_mine.setdefault(feat.mine_id, {})[feat.feature_key] = feat.enabled
+    for feat_mine_id, feature_key, enabled in feat_result.all():
+        feat_by_mine.setdefault(feat_mine_id, {})[feature_key] = enabled
 
     def _enabled_features(mine_id: uuid.UUID) -> List[str]:
         explicit = feat_by_mine.get(mine_id, {})
@@ -124,39 +129,47 @@ async def list_mines(
                 enabled.append(key)
         return enabled
 
-    # Get user roles for each mine
-    response_mines = []
-    for mine in mines:
-        role = None
-        if current_user.is_admin:
-            role = "admin"
-        else:
-            role_result = await db.execute(
-                select(UserMine.role).where(
-                    UserMine.user_id == current_user.id,
-                    UserMine.mine_id == mine.id
-                )
-            )
-            role = role_result.scalar_one_or_none()
-        
-        response_mines.append(MineResponse(
-            id=str(mine.id),
-            name=mine.name,
-            region_id=str(mine.region_id),
-            region_name=mine.region.name,
-            primary_metal=mine.primary_metal,
-            mining_method=mine.mining_method,
-            recovery_params=mine.recovery_params,
-            commercial_terms=mine.commercial_terms,
-            user_role=role,
-            enabled_features=_enabled_features(mine.id),
-        ))
-    
-    return MineListResponse(
-        mines=response_mines,
-        total=len(response_mines),
+    # Only the region name is needed, so join it in rather than eager-loading
+    # whole Region rows with a second query.
+    query = (
+        select(Mine, Region.name)
+        .options(undefer_group(MINE_CONFIG))
+        .join(Region, Mine.region_id == Region.id)
+        .where(*conditions)
+        .order_by(Mine.name)
     )
 
+    async def _stream_mines() -> AsyncIterator[bytes]:
+        total = 0
+        yield b'{"mines":['
+        # get_db closes the request session only after the body is sent
+        # (FastAPI >= 0.118)
+        try:
+            result = await db.stream(query)
+            async for mine, region_name in result:
+                row = {
+                    "id": str(mine.id),
+                    "name": mine.name,
+                    "region_id": str(mine.region_id),
+                    "region_name": region_name,
+                    "primary_metal": mine.primary_metal,
+                    "mining_method": mine.mining_method,
+                    "recovery_params": mine.recovery_params,
+                    "commercial_terms": mine.commercial_terms,
+                    "user_role": "admin" if current_user.is_admin else roles.get(mine.id),
+                    "enabled_features": _enabled_features(mine.id),
+                }
+                yield (b"," if total else b"") + orjson.dumps(row)
+                total += 1
+        except Exception:
+            # The 200 status is already sent: log, and end the body without
+            # its closing bracket so clients can't take it as the full list
+            logger.exception(f"Mine list stream failed after {total} mines")
+            return
+        yield b'],"total":%d}' % total
+
+    return StreamingResponse(_stream_mines(), media_type="application/json")
+
 
 @router.get("/metals")
 async def list_supported_metals():
@@ -174,6 +187,17 @@ async def list_supported_metals():
     }
 
 
+async def _load_mine(db: AsyncSession, mine_id: uuid.UUID) -> Optional[Mine]:
+    """Load a mine with its region and JSON configuration (fresh from the DB)."""
+    result = await db.execute(
+        select(Mine)
+        .options(selectinload(Mine.region), undefer_group(MINE_CONFIG))
+        .where(Mine.id == mine_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
 @router.get("/{mine_id}", response_model=MineResponse)
 async def get_mine(
     mine_id: uuid.UUID,
@@ -185,20 +209,15 @@ async def get_mine(
     
     Requires access to the mine.
     """
-    # Check access
-    has_access = await check_mine_access(db, current_user, mine_id)
-    if not has_access:
+    # Check access (the role lookup doubles as the access check)
+    role = await get_user_role_for_mine(db, current_user, mine_id)
+    if role is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this mine"
         )
     
-    result = await db.execute(
-        select(Mine)
-        .options(selectinload(Mine.region))
-        .where(Mine.id == mine_id)
-    )
-    mine = result.scalar_one_or_none()
+    mine = await _load_mine(db, mine_id)
     
     if not mine:
         raise HTTPException(
@@ -206,17 +225,6 @@ async def get_mine(
             detail="Mine not found"
         )
     
-    # Get user role
-    role = "admin" if current_user.is_admin else None
-    if not current_user.is_admin:
-        role_result = await db.execute(
-            select(UserMine.role).where(
-                UserMine.user_id == current_user.id,
-                UserMine.mine_id == mine.id
-            )
-        )
-        role = role_result.scalar_one_or_none()
-    
     return MineResponse(
         id=str(mine.id),
         name=mine.name,
@@ -247,6 +255,11 @@ async def create_mine(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported metal. Supported: {SUPPORTED_METALS}"
         )
+    if data.mining_method not in SUPPORTED_METHODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported mining method. Supported: {SUPPORTED_METHODS}"
+        )
     
     # Validate region exists
     try:
@@ -280,7 +293,7 @@ async def create_mine(
     
     db.add(mine)
     await db.commit()
-    await db.refresh(mine)
+    mine = await _load_mine(db, mine.id)
     
     return MineResponse(
         id=str(mine.id),
@@ -315,12 +328,7 @@ async def update_mine(
             detail="Admin access required"
         )
     
-    result = await db.execute(
-        select(Mine)
-        .options(selectinload(Mine.region))
-        .where(Mine.id == mine_id)
-    )
-    mine = result.scalar_one_or_none()
+    mine = await _load_mine(db, mine_id)
     
     if not mine:
         raise HTTPException(
@@ -339,6 +347,11 @@ async def update_mine(
             )
         mine.primary_metal = data.primary_metal
     if data.mining_method is not None:
+        if data.mining_method not in SUPPORTED_METHODS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported mining method. Supported: {SUPPORTED_METHODS}"
+            )
         mine.mining_method = data.mining_method
     if data.recovery_params is not None:
         mine.recovery_params = data.recovery_params
@@ -346,7 +359,7 @@ async def update_mine(
         mine.commercial_terms = data.commercial_terms
     
     await db.commit()
-    await db.refresh(mine)
+    mine = await _load_mine(db, mine_id)
     
     return MineResponse(
         id=str(mine.id),
@@ -428,7 +441,7 @@ async def add_user_to_mine(
         )
     
     # Validate role
-    if data.role not in ["admin", "editor", "viewer"]:
+    if data.role not in USER_ROLES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Role must be admin, editor, or viewer"
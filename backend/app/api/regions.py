@@ -6,10 +6,11 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
 from app.db.session import get_db
+from app.models.mine import Mine
 from app.models.region import Region
 from app.models.user import User
 from app.auth.dependencies import get_current_user, require_admin
@@ -61,6 +62,18 @@ class RegionListResponse(BaseModel):
     total: int
 
 
+def _select_region_with_mine_count(region_id: uuid.UUID):
+    """Select a region together with its mine count as a scalar subquery."""
+    mine_count = (
+        select(func.count())
+        .select_from(Mine)
+        .where(Mine.region_id == region_id)
+        .scalar_subquery()
+        .label("mine_count")
+    )
+    return select(Region, mine_count).where(Region.id == region_id)
+
+
 @router.get("", response_model=RegionListResponse)
 async def list_regions(
     db: AsyncSession = Depends(get_db),
@@ -72,7 +85,9 @@ async def list_regions(
     Requires authentication.
     """
     result = await db.execute(
-        select(Region).options(selectinload(Region.mines)).order_by(Region.name)
+        select(Region)
+        .options(selectinload(Region.mines).load_only(Mine.id))
+        .order_by(Region.name)
     )
     regions = result.scalars().all()
     
@@ -108,18 +123,15 @@ async def get_region(
     
     Requires authentication.
     """
-    result = await db.execute(
-        select(Region)
-        .options(selectinload(Region.mines))
-        .where(Region.id == region_id)
-    )
-    region = result.scalar_one_or_none()
+    result = await db.execute(_select_region_with_mine_count(region_id))
+    row = result.one_or_none()
     
-    if not region:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Region not found"
         )
+    region, mine_count = row
     
     return RegionResponse(
         id=str(region.id),
@@ -130,7 +142,7 @@ async def get_region(
         latitude=region.latitude,
         longitude=region.longitude,
         description=region.description,
-        mine_count=len(region.mines),
+        mine_count=mine_count,
     )
 
 
@@ -195,18 +207,15 @@ async def update_region(
     
     Requires admin privileges.
     """
-    result = await db.execute(
-        select(Region)
-        .options(selectinload(Region.mines))
-        .where(Region.id == region_id)
-    )
-    region = result.scalar_one_or_none()
+    result = await db.execute(_select_region_with_mine_count(region_id))
+    row = result.one_or_none()
     
-    if not region:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Region not found"
         )
+    region, mine_count = row
     
     # Check for duplicate name
     if data.name and data.name != region.name:
@@ -247,7 +256,7 @@ async def update_region(
         latitude=region.latitude,
         longitude=region.longitude,
         description=region.description,
-        mine_count=len(region.mines),
+        mine_count=mine_count,
     )
 
 
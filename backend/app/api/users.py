@@ -3,23 +3,23 @@
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field, EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from passlib.context import CryptContext
+from sqlalchemy import Text, cast, delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
+from app.db.enums import USER_ROLES
 from app.db.session import get_db
 from app.models.user import User
+from app.models.mine import Mine
 from app.models.user_mine import UserMine
-from app.auth.dependencies import require_admin
+from app.auth.dependencies import invalidate_user_cache, require_admin
+from app.auth.passwords import hash_password, invalidate_password_cache
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class UserCreate(BaseModel):
     """Request to create a new local user."""
@@ -37,6 +37,22 @@ class UserUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class UserStatusUpdate(BaseModel):
+    """Request to change a user's admin or active flag."""
+    is_admin: Optional[bool] = None
+    is_active: Optional[bool] = None
+
+
+class UserPasswordUpdate(BaseModel):
+    """Request to set a user's password."""
+    password: str = Field(..., min_length=6, max_length=100)
+
+
+class UserProfileUpdate(BaseModel):
+    """Request to change a user's profile fields."""
+    name: str = Field(..., min_length=1, max_length=255)
+
+
 class UserMineInfo(BaseModel):
     """Mine access info for a user."""
     mine_id: str
@@ -60,9 +76,10 @@ class UserResponse(BaseModel):
 
 
 class UserListResponse(BaseModel):
-    """List of users response."""
+    """One page of users, ordered by email."""
     users: List[UserResponse]
-    total: int
+    next: Optional[str] = None
+    total: Optional[int] = None
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -76,34 +93,32 @@ async def create_user(
     
     Requires admin privileges.
     """
-    # Check if email already exists
+    password_hash = await hash_password(data.password)
+    
+    # Insert unless the email is taken; one statement, no check-then-insert race
     result = await db.execute(
-        select(User).where(User.email == data.email)
+        pg_insert(User)
+        .values(
+            email=data.email,
+            name=data.name,
+            auth_provider="local",
+            auth_provider_id=f"local-{data.email}",
+            password_hash=password_hash,
+            is_admin=data.is_admin,
+            is_active=True,
+        )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
     )
-    existing_user = result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
     
-    if existing_user:
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user with hashed password
-    password_hash = pwd_context.hash(data.password)
-    
-    user = User(
-        email=data.email,
-        name=data.name,
-        auth_provider="local",
-        auth_provider_id=f"local-{data.email}",
-        password_hash=password_hash,
-        is_admin=data.is_admin,
-        is_active=True,
-    )
-    
-    db.add(user)
     await db.commit()
-    await db.refresh(user)
     
     return UserResponse(
         id=str(user.id),
@@ -119,25 +134,49 @@ async def create_user(
 
 @router.get("", response_model=UserListResponse)
 async def list_users(
+    limit: int = Query(default=50, ge=1, le=500),
+    after: Optional[str] = Query(default=None, description="Email of the last user on the previous page"),
+    include_total: bool = Query(default=False),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """
-    List all users.
+    List users a page at a time.
+    
+    Uses keyset pagination on email: pass the returned ``next`` value as
+    ``after`` to fetch the following page. ``next`` is None on the last page.
     
     Requires admin privileges.
     """
-    result = await db.execute(
+    # Users, their access rows and mine names in one joined query; the
+    # LIMIT applies to users, not to joined rows. Only the columns shown
+    # are loaded, so the mines' JSON config never leaves the database
+    query = (
         select(User)
-        .options(selectinload(User.mine_access).selectinload(UserMine.mine))
+        .options(
+            joinedload(User.mine_access)
+            .load_only(UserMine.mine_id, UserMine.role)
+            .joinedload(UserMine.mine)
+            .load_only(Mine.name)
+        )
         .order_by(User.email)
+        .limit(limit)
     )
-    users = result.scalars().all()
+    if after is not None:
+        query = query.where(User.email > after)
     
+    result = await db.execute(query)
+    users = result.unique().scalars().all()
+    
+    total = None
+    if include_total:
+        total = (await db.execute(select(func.count()).select_from(User))).scalar_one()
+    
+    # Outbound models are built from trusted ORM rows, so skip validation
     response_users = []
     for user in users:
         mine_access = [
-            UserMineInfo(
+            UserMineInfo.model_construct(
                 mine_id=str(um.mine_id),
                 mine_name=um.mine.name if um.mine else "Unknown",
                 role=um.role,
@@ -145,7 +184,7 @@ async def list_users(
             for um in user.mine_access
         ]
         
-        response_users.append(UserResponse(
+        response_users.append(UserResponse.model_construct(
             id=str(user.id),
             email=user.email,
             name=user.name,
@@ -156,9 +195,10 @@ async def list_users(
             mine_access=mine_access,
         ))
     
-    return UserListResponse(
+    return UserListResponse.model_construct(
         users=response_users,
-        total=len(response_users),
+        next=users[-1].email if len(users) == limit else None,
+        total=total,
     )
 
 
@@ -175,7 +215,12 @@ async def get_user(
     """
     result = await db.execute(
         select(User)
-        .options(selectinload(User.mine_access).selectinload(UserMine.mine))
+        .options(
+            selectinload(User.mine_access)
+            .load_only(UserMine.mine_id, UserMine.role)
+            .selectinload(UserMine.mine)
+            .load_only(Mine.name)
+        )
         .where(User.id == user_id)
     )
     user = result.scalar_one_or_none()
@@ -186,8 +231,9 @@ async def get_user(
             detail="User not found"
         )
     
+    # Outbound models are built from trusted ORM rows, so skip validation
     mine_access = [
-        UserMineInfo(
+        UserMineInfo.model_construct(
             mine_id=str(um.mine_id),
             mine_name=um.mine.name if um.mine else "Unknown",
             role=um.role,
@@ -195,7 +241,7 @@ async def get_user(
         for um in user.mine_access
     ]
     
-    return UserResponse(
+    return UserResponse.model_construct(
         id=str(user.id),
         email=user.email,
         name=user.name,
@@ -207,24 +253,36 @@ async def get_user(
     )
 
 
-@router.put("/{user_id}", response_model=UserResponse)
-async def update_user(
-    user_id: uuid.UUID,
-    data: UserUpdate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_admin)
-):
+async def _password_values(password: str) -> dict:
+    """Column values for a password change (hashed off the event loop)."""
+    return {
+        "password_hash": await hash_password(password),
+        # Setting a password makes the account a local one
+        "auth_provider": "local",
+        "auth_provider_id": "local-" + User.email,
+    }
+
+
+async def _apply_user_update(db: AsyncSession, user_id: uuid.UUID, values: dict) -> User:
     """
-    Update a user.
+    Apply column changes with a single UPDATE ... RETURNING and commit.
     
-    Requires admin privileges.
-    Cannot modify own admin status.
+    Raises:
+        HTTPException: 404 if the user does not exist
     """
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.mine_access).selectinload(UserMine.mine))
-        .where(User.id == user_id)
-    )
+    if values:
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**values)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+    else:
+        stmt = select(User).where(User.id == user_id)
+    # Only User columns are used here; any relationship access is a bug
+    stmt = stmt.options(raiseload("*"))
+    result = await db.execute(stmt)
     user = result.scalar_one_or_none()
     
     if not user:
@@ -233,39 +291,14 @@ async def update_user(
             detail="User not found"
         )
     
-    # Prevent self-modification of admin status
-    if user.id == current_user.id and data.is_admin is not None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot modify your own admin status"
-        )
-    
-    # Update fields
-    if data.name is not None:
-        user.name = data.name
-    if data.password is not None:
-        user.password_hash = pwd_context.hash(data.password)
-        # Set auth_provider to local if changing password
-        if user.auth_provider != "local":
-            user.auth_provider = "local"
-            user.auth_provider_id = f"local-{user.email}"
-    if data.is_admin is not None:
-        user.is_admin = data.is_admin
-    if data.is_active is not None:
-        user.is_active = data.is_active
-    
     await db.commit()
-    await db.refresh(user)
-    
-    mine_access = [
-        UserMineInfo(
-            mine_id=str(um.mine_id),
-            mine_name=um.mine.name if um.mine else "Unknown",
-            role=um.role,
-        )
-        for um in user.mine_access
-    ]
-    
+    invalidate_user_cache(user.id)
+    if "password_hash" in values:
+        invalidate_password_cache(user.id)
+    return user
+
+
+def _user_response(user: User, mine_access: Optional[List[UserMineInfo]] = None) -> UserResponse:
     return UserResponse(
         id=str(user.id),
         email=user.email,
@@ -274,10 +307,116 @@ async def update_user(
         auth_provider=user.auth_provider,
         is_admin=user.is_admin,
         is_active=user.is_active,
-        mine_access=mine_access,
+        mine_access=mine_access or [],
     )
 
 
+def _check_self_admin_change(user_id: uuid.UUID, current_user: User, is_admin: Optional[bool]) -> None:
+    """Prevent admins from changing their own admin status."""
+    if user_id == current_user.id and is_admin is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot modify your own admin status"
+        )
+
+
+@router.put("/{user_id}", response_model=UserResponse)
+async def update_user(
+    user_id: uuid.UUID,
+    data: UserUpdate,
+    include_mine_access: bool = Query(default=True),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Update any combination of a user's fields.
+    
+    Prefer the PATCH /status, /password and /profile endpoints for single
+    changes. Pass ``include_mine_access=false`` to skip loading the user's
+    mine access; the response then has an empty ``mine_access`` list.
+    
+    Requires admin privileges.
+    Cannot modify own admin status.
+    """
+    _check_self_admin_change(user_id, current_user, data.is_admin)
+    
+    values = data.model_dump(exclude_none=True, exclude={"password"})
+    if data.password is not None:
+        values.update(await _password_values(data.password))
+    
+    user = await _apply_user_update(db, user_id, values)
+    
+    mine_access = []
+    if include_mine_access:
+        result = await db.execute(
+            select(UserMine.mine_id, Mine.name, UserMine.role)
+            .join(Mine, UserMine.mine_id == Mine.id)
+            .where(UserMine.user_id == user_id)
+        )
+        mine_access = [
+            UserMineInfo(mine_id=str(mine_id), mine_name=mine_name, role=role)
+            for mine_id, mine_name, role in result.all()
+        ]
+    
+    return _user_response(user, mine_access)
+
+
+@router.patch("/{user_id}/status", response_model=UserResponse)
+async def update_user_status(
+    user_id: uuid.UUID,
+    data: UserStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Set a user's admin and/or active flag.
+    
+    The response does not include mine access.
+    
+    Requires admin privileges.
+    Cannot modify own admin status.
+    """
+    _check_self_admin_change(user_id, current_user, data.is_admin)
+    user = await _apply_user_update(db, user_id, data.model_dump(exclude_none=True))
+    return _user_response(user)
+
+
+@router.patch("/{user_id}/password", response_model=UserResponse)
+async def update_user_password(
+    user_id: uuid.UUID,
+    data: UserPasswordUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Set a user's password, converting the account to local login.
+    
+    The response does not include mine access.
+    
+    Requires admin privileges.
+    """
+    user = await _apply_user_update(db, user_id, await _password_values(data.password))
+    return _user_response(user)
+
+
+@router.patch("/{user_id}/profile", response_model=UserResponse)
+async def update_user_profile(
+    user_id: uuid.UUID,
+    data: UserProfileUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Change a user's display name.
+    
+    The response does not include mine access.
+    
+    Requires admin privileges.
+    """
+    user = await _apply_user_update(db, user_id, {"name": data.name})
+    return _user_response(user)
+
+
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def deactivate_user(
     user_id: uuid.UUID,
@@ -296,19 +435,22 @@ async def deactivate_user(
             detail="Cannot deactivate yourself"
         )
     
+    # Single UPDATE ... RETURNING; no row back means the user doesn't exist
     result = await db.execute(
-        select(User).where(User.id == user_id)
+        update(User)
+        .where(User.id == user_id)
+        .values(is_active=False)
+        .returning(User.id)
     )
-    user = result.scalar_one_or_none()
     
-    if not user:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    user.is_active = False
     await db.commit()
+    invalidate_user_cache(user_id)
 
 
 # =============================================================================
@@ -340,51 +482,65 @@ async def set_user_mines(
     
     Requires admin privileges.
     """
-    from app.models.mine import Mine
-    
     # Verify user exists
     result = await db.execute(
-        select(User).where(User.id == user_id)
+        select(User.id).where(User.id == user_id)
     )
-    user = result.scalar_one_or_none()
     
-    if not user:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    # Delete existing access
-    await db.execute(
-        UserMine.__table__.delete().where(UserMine.user_id == user_id)
+    invalid_roles = {access.role for access in mine_access} - set(USER_ROLES)
+    if invalid_roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Role must be admin, editor, or viewer"
+        )
+    
+    # Verify all requested mines exist in one query
+    mine_ids = [uuid.UUID(access.mine_id) for access in mine_access]
+    result = await db.execute(
+        select(Mine.id, Mine.name).where(Mine.id.in_(mine_ids))
     )
+    mine_names = dict(result.all())
     
-    # Add new access
-    response = []
-    for access in mine_access:
-        mine_uuid = uuid.UUID(access.mine_id)
-        
-        # Verify mine exists
-        result = await db.execute(
-            select(Mine).where(Mine.id == mine_uuid)
+    # Skip invalid mines; a repeated mine keeps its last role
+    roles = {
+        mine_uuid: access.role
+        for access, mine_uuid in zip(mine_access, mine_ids, strict=True)
+        if mine_uuid in mine_names
+    }
+    
+    # Drop access that is no longer granted, then upsert the rest in one statement
+    await db.execute(
+        delete(UserMine).where(
+            UserMine.user_id == user_id,
+            UserMine.mine_id.notin_(list(roles)),
         )
-        mine = result.scalar_one_or_none()
-        
-        if not mine:
-            continue  # Skip invalid mines
-        
-        user_mine = UserMine(
-            user_id=user_id,
-            mine_id=mine_uuid,
-            role=access.role,
+    )
+    if roles:
+        stmt = pg_insert(UserMine).values([
+            {"user_id": user_id, "mine_id": mine_uuid, "role": role}
+            for mine_uuid, role in roles.items()
+        ])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserMine.user_id, UserMine.mine_id],
+                set_={"role": stmt.excluded.role},
+            )
         )
-        db.add(user_mine)
-        
-        response.append(UserMineAccessResponse(
-            mine_id=str(mine.id),
-            mine_name=mine.name,
-            role=access.role,
-        ))
+    
+    response = [
+        UserMineAccessResponse(
+            mine_id=str(mine_uuid),
+            mine_name=mine_names[mine_uuid],
+            role=role,
+        )
+        for mine_uuid, role in roles.items()
+    ]
     
     await db.commit()
     return response
@@ -401,20 +557,32 @@ async def get_user_mines(
     
     Requires admin privileges.
     """
-    from app.models.mine import Mine
+    if db.bind.dialect.name == "postgresql":
+        # Postgres builds the JSON array itself; the text is returned as-is
+        access = func.json_build_object(
+            "mine_id", cast(UserMine.mine_id, Text),
+            "mine_name", Mine.name,
+            "role", UserMine.role,
+        )
+        payload = await db.scalar(
+            select(cast(func.coalesce(func.json_agg(access), literal_column("'[]'::json")), Text))
+            .select_from(UserMine)
+            .join(Mine, UserMine.mine_id == Mine.id)
+            .where(UserMine.user_id == user_id)
+        )
+        return Response(content=payload, media_type="application/json")
     
     result = await db.execute(
-        select(UserMine, Mine)
+        select(UserMine.mine_id, Mine.name, UserMine.role)
         .join(Mine, UserMine.mine_id == Mine.id)
         .where(UserMine.user_id == user_id)
     )
-    rows = result.all()
     
     return [
         UserMineAccessResponse(
-            mine_id=str(um.mine_id),
-            mine_name=mine.name,
-            role=um.role,
+            mine_id=str(mine_id),
+            mine_name=mine_name,
+            role=role,
         )
-        for um, mine in rows
+        for mine_id, mine_name, role in result.all()
     ]
@@ -1,15 +1,19 @@
 """Authentication module."""
 
-from app.auth.jwt import create_access_token, create_refresh_token, verify_token
+from app.auth.jwt import create_access_token, create_refresh_token, issue_token_pair, verify_token
 from app.auth.dependencies import get_current_user, require_admin, get_optional_user
 from app.auth.permissions import check_mine_access
+from app.auth.passwords import hash_password, verify_password
 
 __all__ = [
     "create_access_token",
     "create_refresh_token", 
+    "issue_token_pair",
     "verify_token",
     "get_current_user",
     "require_admin",
     "get_optional_user",
     "check_mine_access",
+    "hash_password",
+    "verify_password",
 ]
@@ -1,12 +1,15 @@
 """Authentication dependencies for FastAPI."""
 
+from functools import lru_cache
 from typing import Optional
 import uuid
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
 
 from app.db.session import get_db
 from app.models.user import User
@@ -15,42 +18,113 @@ from app.auth.jwt import verify_token
 # HTTP Bearer scheme for JWT
 security = HTTPBearer(auto_error=False)
 
+# Active users by id, detached from their session. Entries are per worker:
+# writes through this worker evict them on commit, other workers see
+# deactivation or role changes within the TTL.
+_user_cache: TTLCache = TTLCache(maxsize=5000, ttl=60)
 
-async def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: AsyncSession = Depends(get_db)
+# session.info key for users flushed in the current transaction. UPDATE
+# statements don't pass through the unit of work; callers issuing them
+# evict with invalidate_user_cache() after commit.
+_STALE_USERS = "stale_user_ids"
+
+
+def invalidate_user_cache(user_id: uuid.UUID) -> None:
+    """Forget the cached user so the next request reloads it."""
+    _user_cache.pop(user_id, None)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_written(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_STALE_USERS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_written_users(session: Session) -> None:
+    # After commit, so a concurrent request cannot re-cache the old row
+    for user_id in session.info.pop(_STALE_USERS, ()):
+        invalidate_user_cache(user_id)
+
+
+def _credentials_exception() -> HTTPException:
+    """
+    The 401 raised whenever credentials are missing or invalid.
+
+    Built per raise: a shared instance would collect every failed request's
+    frames in its traceback.
+    """
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+@lru_cache(maxsize=4096)
+def _parse_uuid(value: str) -> Optional[uuid.UUID]:
+    """Parse a token subject into a UUID, or None if it is malformed."""
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        return None
+
+
+async def _resolve_user(
+    credentials: Optional[HTTPAuthorizationCredentials],
+    db: AsyncSession,
 ) -> Optional[User]:
     """
-    Get current user if authenticated, None otherwise.
+    Resolve bearer credentials to an active user.
     
-    Use this for endpoints that work with or without authentication.
+    Returns:
+        The user, or None if the token is missing, invalid or refers to an
+        unknown or inactive user.
     """
     if not credentials:
         return None
     
-    token = credentials.credentials
-    payload = verify_token(token, "access")
-    
+    payload = verify_token(credentials.credentials, "access")
     if not payload:
         return None
     
     user_id = payload.get("sub")
-    if not user_id:
+    if not isinstance(user_id, str):
         return None
     
-    try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError:
+    user_uuid = _parse_uuid(user_id)
+    if user_uuid is None:
         return None
     
+    user = _user_cache.get(user_uuid)
+    if user is not None:
+        return user
+    
     result = await db.execute(
         select(User).where(User.id == user_uuid, User.is_active == True)
     )
     user = result.scalar_one_or_none()
-    
+    if user is not None:
+        # Detach so the cached instance is never tied to a request's session
+        db.expunge(user)
+        _user_cache[user_uuid] = user
     return user
 
 
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> Optional[User]:
+    """
+    Get current user if authenticated, None otherwise.
+    
+    Use this for endpoints that work with or without authentication.
+    """
+    return await _resolve_user(credentials, db)
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db)
@@ -60,37 +134,9 @@ async def get_current_user(
     
     Raises HTTPException 401 if not authenticated.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    if not credentials:
-        raise credentials_exception
-    
-    token = credentials.credentials
-    payload = verify_token(token, "access")
-    
-    if not payload:
-        raise credentials_exception
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise credentials_exception
-    
-    try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError:
-        raise credentials_exception
-    
-    result = await db.execute(
-        select(User).where(User.id == user_uuid, User.is_active == True)
-    )
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise credentials_exception
+    user = await _resolve_user(credentials, db)
+    if user is None:
+        raise _credentials_exception()
     
     return user
 
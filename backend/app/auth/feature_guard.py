@@ -8,8 +8,9 @@ Usage::
 """
 
 import uuid
-from typing import Callable
+from typing import Callable, Optional, Tuple
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -18,6 +19,36 @@ from app.db.session import get_db
 from app.models.mine_feature import MineFeature
 from app.features import FEATURE_CATALOG
 
+# (mine_id, feature_key) -> explicit enabled flag, or None when the mine has no
+# override. Entries are per worker; toggles in this process evict them
+# immediately, other workers pick them up when the TTL expires.
+_feature_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+
+def invalidate_feature_cache(mine_id: uuid.UUID, feature_key: str) -> None:
+    """Forget the cached toggle state for a mine's feature."""
+    _feature_cache.pop((mine_id, feature_key), None)
+
+
+async def _get_feature_override(
+    db: AsyncSession, mine_id: uuid.UUID, feature_key: str
+) -> Optional[bool]:
+    key: Tuple[uuid.UUID, str] = (mine_id, feature_key)
+    try:
+        return _feature_cache[key]
+    except KeyError:
+        pass
+
+    result = await db.execute(
+        select(MineFeature.enabled).where(
+            MineFeature.mine_id == mine_id,
+            MineFeature.feature_key == feature_key,
+        )
+    )
+    enabled = result.scalar_one_or_none()
+    _feature_cache[key] = enabled
+    return enabled
+
 
 def require_feature(feature_key: str) -> Callable:
     """Return a FastAPI dependency that enforces *feature_key* is enabled for a mine.
@@ -36,15 +67,9 @@ def require_feature(feature_key: str) -> Callable:
                 detail=f"Unknown feature: {feature_key}",
             )
 
-        result = await db.execute(
-            select(MineFeature).where(
-                MineFeature.mine_id == mine_id,
-                MineFeature.feature_key == feature_key,
-            )
-        )
-        record = result.scalar_one_or_none()
+        enabled = await _get_feature_override(db, mine_id, feature_key)
 
-        if record is None:
+        if enabled is None:
             # No explicit record — fall back to catalog default
             if not catalog_entry["default_enabled"]:
                 raise HTTPException(
@@ -57,7 +82,7 @@ def require_feature(feature_key: str) -> Callable:
             # default_enabled=True and no override → allow
             return
 
-        if not record.enabled:
+        if not enabled:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=(
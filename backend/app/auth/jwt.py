@@ -1,15 +1,65 @@
 """JWT token management."""
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import hashlib
+import time
 import uuid
 
-from jose import jwt, JWTError
+from cachetools import TTLCache
+import orjson
+from jose import jws, JWSError
 
 from app.config import get_settings
 
 settings = get_settings()
 
+# Decoded payloads of recently verified tokens, keyed by a keyed BLAKE2b
+# digest so raw tokens are never held in memory.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_token_cache_key = settings.secret_key.encode("utf-8")[:64]
+
+# Signing parameters, read once from settings. Claims are serialized with
+# orjson and signed/verified through python-jose's JWS layer.
+_signing_secret = settings.secret_key
+_algorithm = settings.jwt_algorithm
+_access_token_lifetime = timedelta(minutes=settings.access_token_expire_minutes)
+_refresh_token_lifetime = timedelta(days=settings.refresh_token_expire_days)
+
+
+def _encode(
+    claims: Dict[str, Any],
+    token_type: str,
+    expires_delta: timedelta,
+    now: datetime,
+) -> str:
+    """Add the standard claims to a copy of *claims* and sign it."""
+    to_encode = dict(claims)
+    to_encode.update({
+        "exp": int((now + expires_delta).timestamp()),
+        "iat": int(now.timestamp()),
+        "type": token_type,
+        "jti": str(uuid.uuid4()),
+    })
+    return jws.sign(orjson.dumps(to_encode), _signing_secret, algorithm=_algorithm)
+
+
+def _decode(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a token's signature and expiry and return its claims."""
+    try:
+        claims = orjson.loads(jws.verify(token, _signing_secret, [_algorithm]))
+    except (JWSError, orjson.JSONDecodeError):
+        return None
+    
+    if not isinstance(claims, dict):
+        return None
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)) or exp <= time.time():
+        return None
+    if "sub" in claims and not isinstance(claims["sub"], str):
+        return None
+    return claims
+
 
 def create_access_token(
     data: Dict[str, Any],
@@ -25,29 +75,9 @@ def create_access_token(
     Returns:
         Encoded JWT token
     """
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
-    
-    to_encode.update({
-        "exp": expire,
-        "iat": datetime.now(timezone.utc),
-        "type": "access",
-        "jti": str(uuid.uuid4()),
-    })
-    
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.secret_key,
-        algorithm=settings.jwt_algorithm
+    return _encode(
+        data, "access", expires_delta or _access_token_lifetime, datetime.now(timezone.utc)
     )
-    
-    return encoded_jwt
 
 
 def create_refresh_token(
@@ -64,29 +94,37 @@ def create_refresh_token(
     Returns:
         Encoded JWT refresh token
     """
-    to_encode = data.copy()
+    return _encode(
+        data, "refresh", expires_delta or _refresh_token_lifetime, datetime.now(timezone.utc)
+    )
+
+
+def issue_token_pair(
+    user_id: uuid.UUID,
+    email: str,
+    now: Optional[datetime] = None,
+) -> Tuple[str, str]:
+    """
+    Create an access and refresh token for a user.
     
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            days=settings.refresh_token_expire_days
-        )
+    Both tokens share one claim set and issue time.
     
-    to_encode.update({
-        "exp": expire,
-        "iat": datetime.now(timezone.utc),
-        "type": "refresh",
-        "jti": str(uuid.uuid4()),
-    })
+    Args:
+        user_id: User ID for the 'sub' claim
+        email: User email
+        now: Issue time; pass the request's timestamp to keep 'iat'
+            consistent with other values written in the same request
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.secret_key,
-        algorithm=settings.jwt_algorithm
+    Returns:
+        (access_token, refresh_token)
+    """
+    claims = {"sub": str(user_id), "email": email}
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return (
+        _encode(claims, "access", _access_token_lifetime, now),
+        _encode(claims, "refresh", _refresh_token_lifetime, now),
     )
-    
-    return encoded_jwt
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
@@ -100,18 +138,24 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
     Returns:
         Decoded payload if valid, None otherwise
     """
-    try:
-        payload = jwt.decode(
-            token,
-            settings.secret_key,
-            algorithms=[settings.jwt_algorithm]
-        )
-        
-        # Verify token type
-        if payload.get("type") != token_type:
+    cache_key = hashlib.blake2b(
+        token.encode("utf-8"), digest_size=16, key=_token_cache_key
+    ).digest()
+    payload = _token_cache.get(cache_key)
+    
+    if payload is not None:
+        # Cached entries may outlive the token itself
+        if payload.get("exp", 0) <= time.time():
+            _token_cache.pop(cache_key, None)
             return None
-            
-        return payload
-        
-    except JWTError:
+    else:
+        payload = _decode(token)
+        if payload is None:
+            return None
+        _token_cache[cache_key] = payload
+    
+    # Verify token type
+    if payload.get("type") != token_type:
         return None
+        
+    return payload
@@ -1,5 +1,6 @@
 """OAuth2 providers."""
 
+import logging
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 
@@ -7,8 +8,43 @@ import httpx
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Shared HTTP client so OAuth round-trips reuse keep-alive connections
+# to Google instead of a fresh TCP+TLS handshake per call.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=_http2_available(),
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (installed by httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("h2 package not installed. OAuth requests will use HTTP/1.1.")
+        return False
+    return True
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 @dataclass
 class OAuthUserInfo:
@@ -65,22 +101,21 @@ class GoogleOAuthProvider:
         Returns:
             Token response or None if failed
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.TOKEN_URL,
-                data={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": self.redirect_uri,
-                },
-            )
-            
-            if response.status_code != 200:
-                return None
-            
-            return response.json()
+        response = await _get_http_client().post(
+            self.TOKEN_URL,
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": self.redirect_uri,
+            },
+        )
+        
+        if response.status_code != 200:
+            return None
+        
+        return response.json()
     
     async def get_user_info(self, access_token: str) -> Optional[OAuthUserInfo]:
         """
@@ -92,24 +127,23 @@ class GoogleOAuthProvider:
         Returns:
             OAuthUserInfo or None if failed
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.USERINFO_URL,
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-            
-            if response.status_code != 200:
-                return None
-            
-            data = response.json()
-            
-            return OAuthUserInfo(
-                provider="google",
-                provider_id=data.get("id", ""),
-                email=data.get("email", ""),
-                name=data.get("name", ""),
-                avatar_url=data.get("picture"),
-            )
+        response = await _get_http_client().get(
+            self.USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        
+        if response.status_code != 200:
+            return None
+        
+        data = response.json()
+        
+        return OAuthUserInfo(
+            provider="google",
+            provider_id=data.get("id", ""),
+            email=data.get("email", ""),
+            name=data.get("name", ""),
+            avatar_url=data.get("picture"),
+        )
 
 
 # Singleton instance
@@ -0,0 +1,110 @@
+"""OAuth state handling.
+
+States are self-describing CSRF tokens: a random nonce and issue time,
+signed with HMAC-SHA256 under the app secret. They verify without any
+storage, so every worker accepts states minted by any other. When
+REDIS_URL is configured, issued nonces are also recorded in Redis and
+consumed atomically, which additionally makes each state single use.
+"""
+
+import base64
+import hashlib
+import hmac
+import logging
+import secrets
+import struct
+import time
+from typing import Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+STATE_TTL_SECONDS = 600
+_KEY_PREFIX = "oauth:"
+
+_NONCE_BYTES = 16
+_TIMESTAMP_BYTES = 8
+_TAG_BYTES = 16
+_STATE_BYTES = _NONCE_BYTES + _TIMESTAMP_BYTES + _TAG_BYTES
+
+# Separate signing key so states can never be confused with other HMACs of the secret
+_signing_key = hashlib.sha256(b"oauth-state:" + settings.secret_key.encode("utf-8")).digest()
+
+# Lazy Redis client to avoid a hard dependency
+_redis = None
+
+
+def _get_redis():
+    global _redis
+    if _redis is None and settings.redis_url:
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            logger.warning("redis package not installed. OAuth states are not single use.")
+            return None
+        _redis = redis_asyncio.Redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_signing_key, payload, hashlib.sha256).digest()[:_TAG_BYTES]
+
+
+def mint_state(now: Optional[float] = None) -> str:
+    """Create a signed state token (nonce + timestamp + tag, base64url)."""
+    issued_at = int(time.time() if now is None else now)
+    payload = secrets.token_bytes(_NONCE_BYTES) + struct.pack(">Q", issued_at)
+    return base64.urlsafe_b64encode(payload + _sign(payload)).rstrip(b"=").decode("ascii")
+
+
+def verify_state(state: str, now: Optional[float] = None) -> bool:
+    """Check a state's signature and that it was issued within the last 10 minutes."""
+    try:
+        raw = base64.urlsafe_b64decode(state + "=" * (-len(state) % 4))
+    except (ValueError, TypeError):
+        return False
+    if len(raw) != _STATE_BYTES:
+        return False
+
+    payload, tag = raw[:-_TAG_BYTES], raw[-_TAG_BYTES:]
+    if not hmac.compare_digest(tag, _sign(payload)):
+        return False
+
+    (issued_at,) = struct.unpack(">Q", payload[_NONCE_BYTES:])
+    age = (time.time() if now is None else now) - issued_at
+    return 0 <= age <= STATE_TTL_SECONDS
+
+
+async def issue_state() -> str:
+    """Mint a state for a new login, recording it in Redis when available."""
+    state = mint_state()
+    client = _get_redis()
+    if client is not None:
+        await client.setex(f"{_KEY_PREFIX}{state}", STATE_TTL_SECONDS, "1")
+    return state
+
+
+async def consume_state(state: str) -> bool:
+    """
+    Validate a state returned by the OAuth provider.
+
+    The signature and age are always checked. With Redis the state is also
+    removed atomically, so a callback cannot be replayed.
+    """
+    if not verify_state(state):
+        return False
+
+    client = _get_redis()
+    if client is not None:
+        return await client.execute_command("GETDEL", f"{_KEY_PREFIX}{state}") is not None
+    return True
+
+
+async def close_state_store() -> None:
+    """Close the Redis connection (called on application shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -0,0 +1,139 @@
+"""Password hashing helpers.
+
+New hashes use argon2id; legacy bcrypt hashes still verify and are upgraded
+on the next successful login. Both schemes are called directly (argon2-cffi
+and bcrypt) rather than through passlib's scheme resolution. Hashing is
+deliberately slow, so it runs in a process pool instead of blocking the
+event loop.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import bcrypt
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Password hashing: argon2id (64 MiB, t=3, p=1); bcrypt only verifies legacy hashes
+_hasher = PasswordHasher(time_cost=3, memory_cost=65536, parallelism=1, type=Type.ID)
+
+# Process pool for CPU-bound hashing (created on first use)
+_pool: Optional[ProcessPoolExecutor] = None
+
+# Recently successful logins: (user_id, HMAC(password)) -> stored hash.
+# Only a keyed digest of the password is kept, never the plaintext.
+_verified_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the hashing pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _pool
+
+
+def _hash(password: str) -> str:
+    return _hasher.hash(password)
+
+
+def _verify_and_update(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    if password_hash.startswith("$argon2"):
+        try:
+            _hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False, None
+        if _hasher.check_needs_rehash(password_hash):
+            return True, _hasher.hash(password)
+        return True, None
+
+    # Legacy bcrypt hash: verify, then upgrade to argon2id
+    try:
+        valid = bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+    except ValueError:
+        return False, None
+    return valid, _hasher.hash(password) if valid else None
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return _verify_and_update(password, password_hash)[0]
+
+
+async def hash_password(password: str) -> str:
+    """Hash a plaintext password without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), _hash, password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    """Check a plaintext password against a stored hash without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), _verify, password, password_hash)
+
+
+async def verify_and_update_password(
+    password: str, password_hash: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash uses a deprecated scheme.
+
+    Returns:
+        (valid, new_hash) where new_hash is None unless the stored hash
+        should be replaced.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_pool(), _verify_and_update, password, password_hash
+    )
+
+
+def _password_fingerprint(password: str) -> bytes:
+    return hmac.new(
+        settings.secret_key.encode("utf-8"), password.encode("utf-8"), hashlib.sha256
+    ).digest()
+
+
+async def check_user_password(
+    user_id: uuid.UUID, password: str, password_hash: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a user's password, skipping the slow hash for a recent repeat.
+
+    A cached entry only counts when it was recorded against the same stored
+    hash, so a password change invalidates it even before it expires.
+
+    Returns:
+        Same as verify_and_update_password.
+    """
+    key = (user_id, _password_fingerprint(password))
+    if _verified_cache.get(key) == password_hash:
+        return True, None
+
+    valid, new_hash = await verify_and_update_password(password, password_hash)
+    if valid:
+        _verified_cache[key] = new_hash or password_hash
+    return valid, new_hash
+
+
+def invalidate_password_cache(user_id: uuid.UUID) -> None:
+    """Drop cached verifications for a user (e.g. after a password change)."""
+    for key in [k for k in _verified_cache.keys() if k[0] == user_id]:
+        _verified_cache.pop(key, None)
+
+
+def shutdown_password_pool() -> None:
+    """Shut down the hashing pool (called on application shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -4,12 +4,19 @@ import uuid
 from typing import Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 
 from app.models.user import User
 from app.models.mine import Mine
 from app.models.user_mine import UserMine
 
+# Built once: SQLAlchemy reuses the compiled form from its statement cache and
+# asyncpg keeps the server-side prepared statement per connection
+_ROLE_FOR_MINE = select(UserMine.role).where(
+    UserMine.user_id == bindparam("user_id"),
+    UserMine.mine_id == bindparam("mine_id"),
+)
+
 
 async def check_mine_access(
     db: AsyncSession,
@@ -33,20 +40,14 @@ async def check_mine_access(
     if user.is_admin:
         return True
     
-    # Check user_mines association
-    query = select(UserMine).where(
-        UserMine.user_id == user.id,
-        UserMine.mine_id == mine_id
-    )
-    
-    result = await db.execute(query)
-    user_mine = result.scalar_one_or_none()
+    # Check user_mines association (served by the uq_user_mine index)
+    role = await get_user_role_for_mine(db, user, mine_id)
     
-    if not user_mine:
+    if role is None:
         return False
     
     # Check role if required
-    if required_roles and user_mine.role not in required_roles:
+    if required_roles and role not in required_roles:
         return False
     
     return True
@@ -98,12 +99,6 @@ async def get_user_role_for_mine(
     if user.is_admin:
         return "admin"
     
-    result = await db.execute(
-        select(UserMine.role).where(
-            UserMine.user_id == user.id,
-            UserMine.mine_id == mine_id
-        )
+    return await db.scalar(
+        _ROLE_FOR_MINE, {"user_id": user.id, "mine_id": mine_id}
     )
-    
-    row = result.scalar_one_or_none()
-    return row
@@ -1,7 +1,7 @@
 """Authentication API routes."""
 
 import uuid
-import secrets
+from urllib.parse import urlencode
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -9,24 +9,41 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from passlib.context import CryptContext
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db.session import get_db
 from app.models.user import User
-from app.auth.jwt import create_access_token, create_refresh_token, verify_token
+from app.auth.jwt import issue_token_pair, verify_token
 from app.auth.oauth import google_oauth
-from app.auth.dependencies import get_current_user
+from app.auth.oauth_state import issue_state, consume_state
+from app.auth.dependencies import get_current_user, invalidate_user_cache
+from app.auth.passwords import check_user_password
 from app.config import get_settings
 
 settings = get_settings()
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Unknown email and wrong password fail identically, so logins can't probe for accounts
+_INVALID_CREDENTIALS_DETAIL = "Invalid email or password"
 
-# In-memory state storage (use Redis in production)
-_oauth_states: dict = {}
+
+def _invalid_credentials() -> HTTPException:
+    """
+    A fresh 401 for a failed login.
+
+    Not a shared instance: each raise appends to the exception's traceback,
+    which would keep every failed request's frame (password included) alive.
+    """
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=_INVALID_CREDENTIALS_DETAIL,
+    )
+
+# Frontend that receives the OAuth callback redirect
+_FRONTEND_URL = (
+    settings.cors_origins[0] if settings.cors_origins else "http://localhost:3000"
+).rstrip("/")
 
 
 class TokenResponse(BaseModel):
@@ -87,6 +104,8 @@ async def dev_login(
             detail="Dev login only available in debug mode"
         )
     
+    now = datetime.now(timezone.utc)
+    
     # Find or create user
     result = await db.execute(
         select(User).where(User.email == request.email)
@@ -96,7 +115,7 @@ async def dev_login(
     if user:
         # Update existing user
         user.name = request.name
-        user.last_login = datetime.now(timezone.utc)
+        user.last_login = now
         if request.is_admin:
             user.is_admin = True
     else:
@@ -107,7 +126,7 @@ async def dev_login(
             auth_provider="dev",
             auth_provider_id="dev-" + request.email,
             is_admin=request.is_admin,
-            last_login=datetime.now(timezone.utc),
+            last_login=now,
         )
         db.add(user)
     
@@ -115,9 +134,7 @@ async def dev_login(
     await db.refresh(user)
     
     # Create tokens
-    token_data = {"sub": str(user.id), "email": user.email}
-    access_token = create_access_token(token_data)
-    refresh_token = create_refresh_token(token_data)
+    access_token, refresh_token = issue_token_pair(user.id, user.email, now)
     
     return TokenResponse(
         access_token=access_token,
@@ -150,17 +167,18 @@ async def local_login(
     
     For users created with local authentication.
     """
-    # Find user by email
+    now = datetime.now(timezone.utc)
+    
+    # Read only the token columns; last_login is written after the password
+    # checks out, so failed logins don't lock or write the row
     result = await db.execute(
-        select(User).where(User.email == request.email)
+        select(User.id, User.email, User.password_hash, User.is_active)
+        .where(User.email == request.email)
     )
-    user = result.scalar_one_or_none()
+    user = result.one_or_none()
     
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password"
-        )
+        raise _invalid_credentials()
     
     # Check if user has a password (local auth)
     if not user.password_hash:
@@ -170,11 +188,11 @@ async def local_login(
         )
     
     # Verify password
-    if not pwd_context.verify(request.password, user.password_hash):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password"
-        )
+    valid, new_hash = await check_user_password(
+        user.id, request.password, user.password_hash
+    )
+    if not valid:
+        raise _invalid_credentials()
     
     # Check if user is active
     if not user.is_active:
@@ -183,14 +201,16 @@ async def local_login(
             detail="Account is deactivated"
         )
     
-    # Update last login
-    user.last_login = datetime.now(timezone.utc)
+    # Stamp last_login, upgrading legacy bcrypt hashes to argon2id in the
+    # same statement
+    values = {"last_login": now}
+    if new_hash:
+        values["password_hash"] = new_hash
+    await db.execute(update(User).where(User.id == user.id).values(**values))
     await db.commit()
     
     # Create tokens
-    token_data = {"sub": str(user.id), "email": user.email}
-    access_token = create_access_token(token_data)
-    refresh_token = create_refresh_token(token_data)
+    access_token, refresh_token = issue_token_pair(user.id, user.email, now)
     
     return TokenResponse(
         access_token=access_token,
@@ -216,8 +236,7 @@ async def login_google():
             detail="Google OAuth not configured"
         )
     
-    state = secrets.token_urlsafe(32)
-    _oauth_states[state] = datetime.now(timezone.utc)
+    state = await issue_state()
     
     auth_url = google_oauth.get_authorization_url(state)
     return RedirectResponse(url=auth_url)
@@ -247,13 +266,12 @@ async def callback_google(
             detail="Missing code or state"
         )
     
-    # Verify state
-    if state not in _oauth_states:
+    # Verify state (single use)
+    if not await consume_state(state):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid state"
         )
-    del _oauth_states[state]
     
     # Exchange code for tokens
     token_data = await google_oauth.exchange_code(code)
@@ -271,48 +289,38 @@ async def callback_google(
             detail="Failed to get user info"
         )
     
-    # Find or create user
+    # Find or create user in one upsert keyed on the unique email index;
+    # admin status is only decided when the user is first created
+    now = datetime.now(timezone.utc)
+    is_admin = bool(
+        settings.initial_admin_email and
+        user_info.email == settings.initial_admin_email
+    )
+    profile = {
+        "name": user_info.name,
+        "avatar_url": user_info.avatar_url,
+        "auth_provider": user_info.provider,
+        "auth_provider_id": user_info.provider_id,
+        "last_login": now,
+    }
     result = await db.execute(
-        select(User).where(User.email == user_info.email)
+        pg_insert(User)
+        .values(email=user_info.email, is_admin=is_admin, **profile)
+        .on_conflict_do_update(index_elements=[User.email], set_=profile)
+        .returning(User)
+        .execution_options(populate_existing=True)
     )
-    user = result.scalar_one_or_none()
-    
-    if user:
-        # Update existing user
-        user.name = user_info.name
-        user.avatar_url = user_info.avatar_url
-        user.auth_provider = user_info.provider
-        user.auth_provider_id = user_info.provider_id
-        user.last_login = datetime.now(timezone.utc)
-    else:
-        # Create new user
-        is_admin = (
-            settings.initial_admin_email and 
-            user_info.email == settings.initial_admin_email
-        )
-        
-        user = User(
-            email=user_info.email,
-            name=user_info.name,
-            avatar_url=user_info.avatar_url,
-            auth_provider=user_info.provider,
-            auth_provider_id=user_info.provider_id,
-            is_admin=is_admin,
-            last_login=datetime.now(timezone.utc),
-        )
-        db.add(user)
-    
+    user = result.scalar_one()
     await db.commit()
-    await db.refresh(user)
+    # Core upserts skip the ORM eviction hook
+    invalidate_user_cache(user.id)
     
     # Create tokens
-    token_data = {"sub": str(user.id), "email": user.email}
-    access_token = create_access_token(token_data)
-    refresh_token = create_refresh_token(token_data)
+    access_token, refresh_token = issue_token_pair(user.id, user.email, now)
     
     # Redirect to frontend with tokens
-    frontend_url = settings.cors_origins[0] if settings.cors_origins else "http://localhost:3000"
-    redirect_url = f"{frontend_url}/auth/callback?access_token={access_token}&refresh_token={refresh_token}"
+    query = urlencode({"access_token": access_token, "refresh_token": refresh_token})
+    redirect_url = f"{_FRONTEND_URL}/auth/callback?{query}"
     
     return RedirectResponse(url=redirect_url)
 
@@ -333,18 +341,19 @@ async def refresh_tokens(
             detail="Invalid refresh token"
         )
     
-    user_id = payload.get("sub")
-    if not user_id:
+    try:
+        user_uuid = uuid.UUID(payload.get("sub"))
+    except (ValueError, TypeError, AttributeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload"
-        )
+        ) from None
     
     # Verify user still exists and is active
     result = await db.execute(
-        select(User).where(User.id == uuid.UUID(user_id), User.is_active == True)
+        select(User.id, User.email).where(User.id == user_uuid, User.is_active == True)
     )
-    user = result.scalar_one_or_none()
+    user = result.one_or_none()
     
     if not user:
         raise HTTPException(
@@ -353,9 +362,7 @@ async def refresh_tokens(
         )
     
     # Create new tokens
-    token_data = {"sub": str(user.id), "email": user.email}
-    access_token = create_access_token(token_data)
-    new_refresh_token = create_refresh_token(token_data)
+    access_token, new_refresh_token = issue_token_pair(user.id, user.email)
     
     return TokenResponse(
         access_token=access_token,
@@ -386,4 +393,5 @@ async def logout(current_user: User = Depends(get_current_user)):
     Note: JWT tokens are stateless, so this just returns success.
     In production, implement token blacklisting with Redis.
     """
+    invalidate_user_cache(current_user.id)
     return {"message": "Logged out successfully"}
@@ -1,10 +1,13 @@
 """Application configuration."""
 
+import re
 from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 from functools import lru_cache
 
+_SSLMODE_RE = re.compile(r'[?&]sslmode=[^&]*')
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -33,12 +36,17 @@ class Settings(BaseSettings):
             v = v.replace("postgres://", "postgresql://", 1)
         # Remove sslmode parameter if present (asyncpg doesn't support it in URL)
         if "sslmode=" in v:
-            import re
-            v = re.sub(r'[?&]sslmode=[^&]*', '', v)
+            v = _SSLMODE_RE.sub('', v)
             # Clean up double && or trailing ?
             v = v.replace('&&', '&').rstrip('?').rstrip('&')
         return v
 
+    # Connection pool (ignored for SQLite)
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+
     # Security
     secret_key: str = "dev-secret-key-change-in-production"
     
@@ -50,6 +58,9 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: List[str] = ["http://localhost:3000"]
 
+    # Redis (optional; shares OAuth state across workers)
+    redis_url: Optional[str] = None
+
     # Google OAuth2
     google_client_id: str = ""
     google_client_secret: str = ""
@@ -0,0 +1,18 @@
+"""Enumerated column types.
+
+Low-cardinality string columns are stored as native PostgreSQL enums:
+4 bytes per value, validated by the database. Values stay plain strings on
+the Python side. Other dialects get a VARCHAR.
+"""
+
+from sqlalchemy import Enum
+
+METALS = ("Cu", "Au", "Zn", "Ni", "Fe")
+MINING_METHODS = ("UG", "OP")  # underground, open pit
+USER_ROLES = ("admin", "editor", "viewer")
+ALERT_FREQUENCIES = ("hourly", "daily", "weekly")
+
+MetalEnum = Enum(*METALS, name="metal_enum")
+MiningMethodEnum = Enum(*MINING_METHODS, name="mining_method_enum")
+UserRoleEnum = Enum(*USER_ROLES, name="user_role_enum")
+AlertFrequencyEnum = Enum(*ALERT_FREQUENCIES, name="alert_frequency_enum")
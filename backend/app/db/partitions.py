@@ -0,0 +1,56 @@
+"""Monthly range partitions for time-series tables (PostgreSQL).
+
+Partitions are named ``<table>_yYYYYmMM`` and cover one UTC calendar
+month each. Writers call ensure_monthly_partitions() for the months they
+are about to insert into; creating a partition that exists is a no-op.
+"""
+
+from datetime import datetime, timezone
+from typing import Iterator, Tuple
+
+from sqlalchemy import text
+
+
+def month_start(ts: datetime) -> datetime:
+    """First instant (UTC) of the month containing ts."""
+    ts = ts.astimezone(timezone.utc) if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(start: datetime) -> datetime:
+    """First instant of the month after a month start."""
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def months_between(first: datetime, last: datetime) -> Iterator[Tuple[datetime, datetime]]:
+    """(start, end) bounds of every month from first's through last's."""
+    start, stop = month_start(first), month_start(last)
+    while start <= stop:
+        end = next_month(start)
+        yield start, end
+        start = end
+
+
+def partition_ddl(table: str, start: datetime, end: datetime) -> str:
+    """CREATE statement for one monthly partition of a table."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table}_y{start.year:04d}m{start.month:02d} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def ensure_monthly_partitions(conn, table: str, first: datetime, last: datetime) -> None:
+    """
+    Create the monthly partitions of table covering first..last.
+
+    Args:
+        conn: Synchronous Connection or Session on a PostgreSQL database
+        table: Parent table, declared PARTITION BY RANGE on a timestamp
+        first: Earliest timestamp that will be inserted
+        last: Latest timestamp that will be inserted
+    """
+    for start, end in months_between(first, last):
+        conn.execute(text(partition_ddl(table, start, end)))
@@ -9,12 +9,34 @@ from app.config import get_settings
 
 settings = get_settings()
 
+# Async driver for each plain URL scheme; URLs that already name a
+# driver (e.g. postgresql+asyncpg://) are left untouched
+_ASYNC_SCHEMES = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Convert a sync database URL to its async driver equivalent."""
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_SCHEMES.get(scheme, scheme) + sep + rest
+
+
 # Convert sync URL to async URL
-DATABASE_URL = settings.database_url
-if DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
-elif DATABASE_URL.startswith("sqlite://"):
-    DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+DATABASE_URL = to_async_url(settings.database_url)
+
+# Pool sizing for Postgres: bounded overflow and a wait timeout so bursts
+# queue instead of piling up; pre-ping and recycle drop stale connections
+pool_kwargs = {}
+if DATABASE_URL.startswith("postgresql"):
+    pool_kwargs = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": True,
+    }
 
 # Create async engine
 # For Railway internal connections, disable SSL
@@ -23,6 +45,7 @@ engine = create_async_engine(
     echo=settings.debug,
     future=True,
     connect_args={"ssl": False} if "railway.internal" in DATABASE_URL else {},
+    **pool_kwargs,
 )
 
 # Create async session factory
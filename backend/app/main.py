@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import configure_mappers
 
 from app.config import get_settings
 from app.api import health, compute, prices, export
@@ -16,8 +17,12 @@ from app.api.blocks import router as blocks_router
 from app.api.features import router as features_router
 from app.api.errors import setup_error_handlers
 from app.auth.router import router as auth_router
+from app.auth.passwords import shutdown_password_pool
+from app.auth.oauth import close_http_client
+from app.auth.oauth_state import close_state_store
 from app.middleware.security import SecurityHeadersMiddleware
 from app.middleware.rate_limit import setup_rate_limiting
+from app.nsr_engine._kernels import get_nsr_kernel
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -27,6 +32,12 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Application lifespan: start/stop background services."""
     # Startup
+    # Resolve all ORM relationships now rather than on the first query
+    configure_mappers()
+    # Compile the batch NSR kernel now (or load it from Numba's disk cache)
+    # so the first large block calculation doesn't pay for it
+    get_nsr_kernel()
+
     try:
         from app.services.alert_checker import start_scheduler, stop_scheduler
 
@@ -44,6 +55,10 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass
 
+    shutdown_password_pool()
+    await close_http_client()
+    await close_state_store()
+
 
 app = FastAPI(
     title=settings.app_name,
@@ -5,7 +5,7 @@ from app.models.region import Region
 from app.models.mine import Mine
 from app.models.user_mine import UserMine
 from app.models.goal_seek import GoalSeekScenario, NsrSnapshot
-from app.models.block_model import BlockImport, Block, BlockNsrSnapshot
+from app.models.block_model import BlockImport, Block, BlockNsrSnapshotBatch
 from app.models.mine_feature import MineFeature
 
 __all__ = [
@@ -17,6 +17,6 @@ __all__ = [
     "NsrSnapshot",
     "BlockImport",
     "Block",
-    "BlockNsrSnapshot",
+    "BlockNsrSnapshotBatch",
     "MineFeature",
 ]
@@ -1,17 +1,21 @@
 """Block model data models for Deswik integration."""
 
+import struct
+import sys
 import uuid
+from array import array
 from datetime import datetime
-from typing import Optional, Any, Dict, List, TYPE_CHECKING
+from typing import Optional, Any, Dict, Iterable, List, NamedTuple, Tuple, TYPE_CHECKING
 
 from sqlalchemy import (
-    String, Float, Integer, Boolean, DateTime, Text,
-    ForeignKey, func, JSON, Index, UniqueConstraint,
+    String, Float, Integer, BigInteger, DateTime, Text,
+    ForeignKey, func, Index, LargeBinary, UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
+from app.db.uuid7 import uuid7
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -26,7 +30,7 @@ class BlockImport(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
     mine_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -41,12 +45,18 @@ class BlockImport(Base):
         String(500), nullable=False
     )
     column_mapping: Mapped[Dict[str, Any]] = mapped_column(
-        JSON, nullable=False
+        JSONB, nullable=False
     )  # {"XCENTRE": "x", "CU_PCT": "cu_grade", ...}
     block_count: Mapped[int] = mapped_column(
         Integer, nullable=False, default=0
     )
 
+    # Morton grid the blocks' codes were computed on (NULL for older imports)
+    morton_origin_x: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    morton_origin_y: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    morton_origin_z: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    morton_cell_size: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
     # Audit
     created_by: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
@@ -67,6 +77,14 @@ class BlockImport(Base):
         back_populates="block_import",
         cascade="all, delete-orphan",
     )
+    # Each batch carries every block's results, so never load the history
+    # implicitly: query the batches needed (e.g. the latest) explicitly
+    snapshot_batches: Mapped[List["BlockNsrSnapshotBatch"]] = relationship(
+        "BlockNsrSnapshotBatch",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+    )
 
     def __repr__(self) -> str:
         return f"<BlockImport {self.name} ({self.block_count} blocks)>"
@@ -80,7 +98,7 @@ class Block(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
     import_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -95,6 +113,8 @@ class Block(Base):
     dx: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     dy: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     dz: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Z-order code of the quantized centroid, for spatial range scans
+    morton: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
 
     # Geology (from Deswik)
     cu_grade: Mapped[float] = mapped_column(Float, nullable=False)  # %
@@ -112,73 +132,171 @@ class Block(Base):
 
     # Extra CSV columns not mapped to specific fields
     extra_attributes: Mapped[Optional[Dict[str, Any]]] = mapped_column(
-        JSON, nullable=True
+        JSONB, nullable=True
     )
 
     # Relationships
     block_import: Mapped["BlockImport"] = relationship(
         "BlockImport", back_populates="blocks"
     )
-    nsr_snapshots: Mapped[List["BlockNsrSnapshot"]] = relationship(
-        "BlockNsrSnapshot",
-        back_populates="block",
-        cascade="all, delete-orphan",
-        order_by="BlockNsrSnapshot.calculated_at.desc()",
-    )
 
     __table_args__ = (
-        Index("ix_blocks_import_z", "import_id", "z"),
-        Index("ix_blocks_import_id", "import_id"),
+        # Blocks are written in Morton order, so z is physically clustered
+        # within an import and a BRIN summary per 32 pages is enough
+        Index(
+            "ix_blocks_import_z_brin",
+            "import_id",
+            "z",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        # Also serves plain import_id lookups (leading column)
+        Index("ix_blocks_morton", "import_id", "morton"),
     )
 
     def __repr__(self) -> str:
         return f"<Block ({self.x}, {self.y}, {self.z}) Cu={self.cu_grade}%>"
 
 
-class BlockNsrSnapshot(Base):
-    """NSR calculation result for a block at a point in time."""
+class BlockNsr(NamedTuple):
+    """NSR result for one block, as read back from a snapshot batch."""
+
+    nsr_per_tonne: float
+    nsr_cu: float
+    nsr_au: float
+    nsr_ag: float
+    is_viable: bool
+    margin: float  # nsr - cutoff
+
+
+# One value of a pack_floats column
+_FLOAT64 = struct.Struct("<d")
+
+
+def pack_floats(values: Iterable[float]) -> bytes:
+    """Pack floats as little-endian float64."""
+    packed = array("d", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
 
-    __tablename__ = "block_nsr_snapshots"
+def unpack_floats(blob: bytes) -> array:
+    """Inverse of pack_floats."""
+    values = array("d")
+    values.frombytes(blob)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class BlockNsrSnapshotBatch(Base):
+    """NSR results for every block of an import from one calculation run.
+
+    One row per run instead of one row per block: the per-block results are
+    stored column-wise as packed float64 arrays, aligned with ``block_ids``
+    (16-byte UUIDs sorted ascending, so single blocks can be found by binary
+    search). Viability and margin are derived from ``cutoff_cost``.
+    """
+
+    __tablename__ = "block_nsr_snapshot_batches"
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
-    block_id: Mapped[uuid.UUID] = mapped_column(
+    import_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("blocks.id", ondelete="CASCADE"),
+        ForeignKey("block_imports.id", ondelete="CASCADE"),
         nullable=False,
     )
     calculated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    # NSR values
-    nsr_per_tonne: Mapped[float] = mapped_column(Float, nullable=False)
-    nsr_cu: Mapped[float] = mapped_column(Float, nullable=False)
-    nsr_au: Mapped[float] = mapped_column(Float, nullable=False)
-    nsr_ag: Mapped[float] = mapped_column(Float, nullable=False)
-
     # Prices used
     cu_price: Mapped[float] = mapped_column(Float, nullable=False)
     au_price: Mapped[float] = mapped_column(Float, nullable=False)
     ag_price: Mapped[float] = mapped_column(Float, nullable=False)
-
-    # Viability
     cutoff_cost: Mapped[float] = mapped_column(Float, nullable=False)  # $/t
-    is_viable: Mapped[bool] = mapped_column(Boolean, nullable=False)
-    margin: Mapped[float] = mapped_column(Float, nullable=False)  # nsr - cutoff
 
-    # Relationship
-    block: Mapped["Block"] = relationship(
-        "Block", back_populates="nsr_snapshots"
-    )
+    # Per-block results
+    block_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    block_ids: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    nsr_per_tonne: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    nsr_cu: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    nsr_au: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    nsr_ag: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
 
     __table_args__ = (
-        Index("ix_block_nsr_snapshots_block_calc", "block_id", "calculated_at"),
-        Index("ix_block_nsr_snapshots_calc", "calculated_at"),
+        Index("ix_block_nsr_snapshot_batches_import_calc", "import_id", "calculated_at"),
     )
 
+    @classmethod
+    def from_results(
+        cls,
+        results: Dict[uuid.UUID, Tuple[float, float, float, float]],
+        **kwargs: Any,
+    ) -> "BlockNsrSnapshotBatch":
+        """Build a batch from {block_id: (nsr_per_tonne, nsr_cu, nsr_au, nsr_ag)}."""
+        ids = sorted(results)
+        columns = list(zip(*(results[i] for i in ids), strict=True)) or [(), (), (), ()]
+        return cls(
+            block_count=len(ids),
+            block_ids=b"".join(i.bytes for i in ids),
+            nsr_per_tonne=pack_floats(columns[0]),
+            nsr_cu=pack_floats(columns[1]),
+            nsr_au=pack_floats(columns[2]),
+            nsr_ag=pack_floats(columns[3]),
+            **kwargs,
+        )
+
+    def _result(self, nsr: float, nsr_cu: float, nsr_au: float, nsr_ag: float) -> BlockNsr:
+        return BlockNsr(
+            nsr_per_tonne=nsr,
+            nsr_cu=nsr_cu,
+            nsr_au=nsr_au,
+            nsr_ag=nsr_ag,
+            is_viable=nsr >= self.cutoff_cost,
+            margin=nsr - self.cutoff_cost,
+        )
+
+    def _blobs(self) -> Tuple[bytes, ...]:
+        return (self.nsr_per_tonne, self.nsr_cu, self.nsr_au, self.nsr_ag)
+
+    def results(self) -> Dict[uuid.UUID, BlockNsr]:
+        """Decode every block's result."""
+        columns = [unpack_floats(blob) for blob in self._blobs()]
+        ids = self.block_ids
+        return {
+            uuid.UUID(bytes=ids[16 * i:16 * i + 16]): self._result(*values)
+            for i, values in enumerate(zip(*columns, strict=True))
+        }
+
+    def lookup(self, block_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, BlockNsr]:
+        """Decode the results of a few blocks without unpacking the whole batch.
+
+        Each block is found by binary search over ``block_ids``, and only its
+        8-byte values are read from the float columns.
+        """
+        blobs = self._blobs()
+        ids = self.block_ids
+        found: Dict[uuid.UUID, BlockNsr] = {}
+        for block_id in block_ids:
+            key = block_id.bytes
+            lo, hi = 0, self.block_count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if ids[16 * mid:16 * mid + 16] < key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < self.block_count and ids[16 * lo:16 * lo + 16] == key:
+                found[block_id] = self._result(
+                    *(_FLOAT64.unpack_from(blob, 8 * lo)[0] for blob in blobs)
+                )
+        return found
+
     def __repr__(self) -> str:
-        return f"<BlockNsrSnapshot block={self.block_id} NSR={self.nsr_per_tonne}>"
+        return f"<BlockNsrSnapshotBatch import={self.import_id} blocks={self.block_count}>"
@@ -4,10 +4,11 @@ import uuid
 from datetime import datetime
 from typing import Optional, Any, Dict, List, TYPE_CHECKING
 
-from sqlalchemy import String, Float, Boolean, DateTime, ForeignKey, func, JSON, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, Float, Boolean, DateTime, ForeignKey, func, Select, select
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.db.enums import AlertFrequencyEnum
 from app.db.session import Base
 
 if TYPE_CHECKING:
@@ -39,7 +40,7 @@ class GoalSeekScenario(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
 
     # Goal Seek parameters
-    base_inputs: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    base_inputs: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
     target_variable: Mapped[str] = mapped_column(String(50), nullable=False)
     target_nsr: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     threshold_value: Mapped[float] = mapped_column(Float, nullable=False)
@@ -48,7 +49,7 @@ class GoalSeekScenario(Base):
     alert_enabled: Mapped[bool] = mapped_column(Boolean, default=False)
     alert_email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     alert_frequency: Mapped[str] = mapped_column(
-        String(20), nullable=False, default="daily"
+        AlertFrequencyEnum, nullable=False, default="daily"
     )  # "hourly", "daily", "weekly"
     alert_last_checked_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -73,32 +74,59 @@ class GoalSeekScenario(Base):
         "NsrSnapshot",
         back_populates="scenario",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="NsrSnapshot.timestamp.desc()",
     )
 
+    @classmethod
+    def with_latest_snapshot(cls) -> Select:
+        """
+        Select (scenario, latest snapshot) pairs in a single query.
+
+        The snapshot is None for scenarios that have none yet. The latest
+        timestamp is an index-only probe of the (scenario_id, timestamp)
+        primary key, so callers do not need to load the snapshots
+        collection per scenario.
+        """
+        latest_timestamp = (
+            select(func.max(NsrSnapshot.timestamp))
+            .where(NsrSnapshot.scenario_id == cls.id)
+            .correlate(cls)
+            .scalar_subquery()
+        )
+        return select(cls, NsrSnapshot).outerjoin(
+            NsrSnapshot,
+            (NsrSnapshot.scenario_id == cls.id)
+            & (NsrSnapshot.timestamp == latest_timestamp),
+        )
+
     def __repr__(self) -> str:
         return f"<GoalSeekScenario {self.name} ({self.target_variable})>"
 
 
 class NsrSnapshot(Base):
-    """Periodic NSR computation snapshot for time series charting."""
+    """
+    Periodic NSR computation snapshot for time series charting.
+
+    Keyed by (scenario_id, timestamp), which also serves every history
+    and latest-snapshot query. On PostgreSQL the table is range-partitioned
+    by month on timestamp (see app.db.partitions).
+    """
 
     __tablename__ = "nsr_snapshots"
 
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
-        primary_key=True,
-        default=uuid.uuid4,
-    )
     scenario_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("goal_seek_scenarios.id", ondelete="CASCADE"),
-        nullable=False,
+        primary_key=True,
     )
 
-    # Timestamp
+    # Timestamp (partition key)
     timestamp: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False,
     )
 
     # NSR values
@@ -122,7 +150,7 @@ class NsrSnapshot(Base):
 
     # Extra data
     metadata_extra: Mapped[Optional[Dict[str, Any]]] = mapped_column(
-        JSON, nullable=True
+        JSONB, nullable=True
     )
 
     # Relationship
@@ -131,7 +159,7 @@ class NsrSnapshot(Base):
     )
 
     __table_args__ = (
-        Index("ix_nsr_snapshots_scenario_timestamp", "scenario_id", "timestamp"),
+        {"postgresql_partition_by": 'RANGE ("timestamp")'},
     )
 
     def __repr__(self) -> str:
@@ -4,12 +4,16 @@ import uuid
 from datetime import datetime
 from typing import List, TYPE_CHECKING, Optional, Any, Dict
 
-from sqlalchemy import String, DateTime, ForeignKey, func, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.db.enums import MetalEnum, MiningMethodEnum
 from app.db.session import Base
 
+# Deferred column group holding the mine's JSON configuration
+MINE_CONFIG = "config"
+
 if TYPE_CHECKING:
     from app.models.user import User
     from app.models.region import Region
@@ -41,26 +45,34 @@ class Mine(Base):
     
     # Mining details
     primary_metal: Mapped[str] = mapped_column(
-        String(10),
+        MetalEnum,
         nullable=False,
         default="Cu"
     )  # Cu, Au, Zn, Ni, Fe
     
     mining_method: Mapped[str] = mapped_column(
-        String(20),
+        MiningMethodEnum,
         nullable=False,
         default="UG"
     )  # UG (underground) or OP (open pit)
     
-    # Configuration stored as JSON
+    # Configuration stored as JSON. Only the NSR engine and the mine
+    # endpoints need it, so it is deferred and must be loaded explicitly
+    # with undefer_group(MINE_CONFIG); accidental access raises.
     recovery_params: Mapped[Optional[Dict[str, Any]]] = mapped_column(
-        JSON,
-        nullable=True
+        JSONB,
+        nullable=True,
+        deferred=True,
+        deferred_group=MINE_CONFIG,
+        deferred_raiseload=True,
     )  # {"areas": {"Area1": {"a": 2.8, "b": 92.5}, ...}}
     
     commercial_terms: Mapped[Optional[Dict[str, Any]]] = mapped_column(
-        JSON,
-        nullable=True
+        JSONB,
+        nullable=True,
+        deferred=True,
+        deferred_group=MINE_CONFIG,
+        deferred_raiseload=True,
     )  # {"payability": 0.965, "tc": 40, "rc": 1.9, ...}
     
     # Audit
@@ -4,10 +4,11 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, DateTime, ForeignKey, func, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, func, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.db.enums import UserRoleEnum
 from app.db.session import Base
 
 if TYPE_CHECKING:
@@ -44,7 +45,7 @@ class UserMine(Base):
     
     # Role within the mine
     role: Mapped[str] = mapped_column(
-        String(50),
+        UserRoleEnum,
         nullable=False,
         default="viewer"
     )  # admin, editor, viewer
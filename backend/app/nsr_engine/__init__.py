@@ -9,7 +9,12 @@ from app.nsr_engine.calculations import (
     compute_conc_price_ag,
     compute_gross_revenue,
     compute_deductions,
+    Deductions,
     compute_nsr_complete,
+    compute_nsr_complete_batch,
+    compute_nsr_summary,
+    get_area_ids,
+    NSRSummary,
 )
 from app.nsr_engine.models import (
     NSRInput,
@@ -24,7 +29,7 @@ from app.nsr_engine.goal_seek import (
     GOAL_SEEK_VARIABLES,
 )
 
-__all__ = [
+__all__ = (
     "compute_cu_recovery",
     "compute_payable_metal",
     "compute_conc_ratio",
@@ -33,7 +38,12 @@ __all__ = [
     "compute_conc_price_ag",
     "compute_gross_revenue",
     "compute_deductions",
+    "Deductions",
     "compute_nsr_complete",
+    "compute_nsr_complete_batch",
+    "compute_nsr_summary",
+    "get_area_ids",
+    "NSRSummary",
     "NSRInput",
     "NSRResult",
     "MetalResult",
@@ -42,4 +52,4 @@ __all__ = [
     "GoalSeekResult",
     "GoalSeekError",
     "GOAL_SEEK_VARIABLES",
-]
+)
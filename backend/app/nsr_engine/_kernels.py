@@ -0,0 +1,71 @@
+"""Compiled kernels for batch NSR calculations.
+
+Numba is optional: when it is not installed, get_nsr_kernel() returns None
+and callers fall back to the NumPy implementation. Kernels declare their
+signature, so get_nsr_kernel() compiles (or loads from the on-disk cache)
+eagerly; the app calls it at startup, and importing this module stays
+cheap.
+"""
+
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Below this many blocks, thread start-up outweighs the gain over NumPy
+KERNEL_MIN_BLOCKS = 10_000
+
+_kernel: Optional[Callable] = None
+_unavailable = False
+
+
+def _build_kernel() -> Callable:
+    from numba import njit, prange
+
+    grades = "f8[::1], f8[::1], f8[::1]"
+    recovery = "f8[::1], f8[::1], f8[::1]"
+    deck = "f8, f8, f8, f8"
+    outputs = ", ".join(["f8[::1]"] * 6)
+
+    # No fastmath: reassociation/FMA would change results at the cent level
+    # and break parity with compute_nsr_complete.
+    @njit(f"void({grades}, {recovery}, {deck}, {outputs})", parallel=True, cache=True)
+    def nsr_kernel(
+        cu, au, ag, a, b, fixed,
+        cu_conc_grade_frac, conc_price_cu, au_nsr_per_gpt, ag_nsr_per_gpt,
+        out_recovery, out_ratio, out_cu, out_au, out_ag, out_total,
+    ):
+        for i in prange(cu.shape[0]):
+            # NaN fixed: use the linear formula. Capped with min() as in
+            # compute_cu_recovery; the loop compiles to vminpd, branch-free.
+            linear = (a[i] * cu[i] + b[i]) / 100.0
+            recovery = min(linear if fixed[i] != fixed[i] else fixed[i] / 100.0, 1.0)
+
+            ratio = (cu[i] / 100.0) * recovery / cu_conc_grade_frac
+            nsr_cu = conc_price_cu * ratio
+            nsr_au = 0.0
+            nsr_ag = 0.0
+            if ratio > 0:
+                nsr_au = au_nsr_per_gpt * au[i]
+                nsr_ag = ag_nsr_per_gpt * ag[i]
+
+            out_recovery[i] = recovery
+            out_ratio[i] = ratio
+            out_cu[i] = nsr_cu
+            out_au[i] = nsr_au
+            out_ag[i] = nsr_ag
+            out_total[i] = nsr_cu + nsr_au + nsr_ag
+
+    return nsr_kernel
+
+
+def get_nsr_kernel() -> Optional[Callable]:
+    """Return the compiled NSR kernel, or None if numba is not installed."""
+    global _kernel, _unavailable
+    if _kernel is None and not _unavailable:
+        try:
+            _kernel = _build_kernel()
+        except ImportError:
+            logger.warning("numba not installed. Batch NSR uses the NumPy path.")
+            _unavailable = True
+    return _kernel
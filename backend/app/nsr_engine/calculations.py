@@ -6,6 +6,14 @@ following the Mina Caraíba methodology.
 All functions are pure (no side effects) and deterministic.
 """
 
+from functools import lru_cache
+from itertools import repeat
+from operator import attrgetter
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.nsr_engine._kernels import KERNEL_MIN_BLOCKS, get_nsr_kernel
 from app.nsr_engine.models import NSRInput, NSRResult, EBITDAResult
 from app.nsr_engine.constants import (
     # Conversions
@@ -38,6 +46,48 @@ from app.nsr_engine.constants import (
     DEFAULT_RECOVERY_PARAMS,
 )
 
+# Recovery parameters as parallel arrays indexed by area id; the last slot
+# holds the defaults used for unknown areas. fixed is NaN when unset.
+_AREA_IDX = {name: i for i, name in enumerate(RECOVERY_PARAMS)}
+_DEFAULT_AREA_IDX = len(RECOVERY_PARAMS)
+_RECOVERY_ROWS = (*RECOVERY_PARAMS.values(), DEFAULT_RECOVERY_PARAMS)
+_REC_A = np.array([p["a"] for p in _RECOVERY_ROWS], dtype=np.float64)
+_REC_B = np.array([p["b"] for p in _RECOVERY_ROWS], dtype=np.float64)
+_REC_FIXED = np.array(
+    [np.nan if p.get("fixed") is None else p["fixed"] for p in _RECOVERY_ROWS],
+    dtype=np.float64,
+)
+
+# Scalar lookups: one probe for (a, b, fixed) instead of a dict per field
+_RECOVERY_BY_AREA = {
+    name: (p["a"], p["b"], p.get("fixed")) for name, p in RECOVERY_PARAMS.items()
+}
+_DEFAULT_RECOVERY = (
+    DEFAULT_RECOVERY_PARAMS["a"],
+    DEFAULT_RECOVERY_PARAMS["b"],
+    DEFAULT_RECOVERY_PARAMS.get("fixed"),
+)
+
+
+def get_area_ids(areas: Sequence[str]) -> np.ndarray:
+    """
+    Map recovery area names to integer ids for compute_nsr_complete_batch.
+
+    Unknown areas map to the default recovery parameters. Callers that run
+    several batches over the same blocks can map their areas once.
+
+    Args:
+        areas: Recovery area name per block
+
+    Returns:
+        intp array of area ids, one per block
+    """
+    return np.fromiter(
+        map(_AREA_IDX.get, areas, repeat(_DEFAULT_AREA_IDX)),
+        dtype=np.intp,
+        count=len(areas),
+    )
+
 
 def compute_cu_recovery(cu_grade_pct: float, area: str) -> float:
     """
@@ -59,15 +109,13 @@ def compute_cu_recovery(cu_grade_pct: float, area: str) -> float:
         >>> compute_cu_recovery(1.4, "Vermelhos Sul")
         0.9654  # 2.8286 × 1.4 + 92.584 = 96.54%
     """
-    params = RECOVERY_PARAMS.get(area, DEFAULT_RECOVERY_PARAMS)
+    a, b, fixed = _RECOVERY_BY_AREA.get(area, _DEFAULT_RECOVERY)
 
     # Use fixed value if specified
-    if params.get("fixed") is not None:
-        return min(params["fixed"] / 100.0, 1.0)
+    if fixed is not None:
+        return min(fixed / 100.0, 1.0)
 
     # Calculate using linear formula
-    a = params["a"]
-    b = params["b"]
     recovery_pct = a * cu_grade_pct + b
 
     # Return as decimal, capped at 100%
@@ -168,6 +216,22 @@ def compute_conc_price_cu(
     Returns:
         Copper contribution to concentrate price ($/t concentrate)
     """
+    gross_revenue, total_deductions = _conc_price_cu_parts(
+        cu_price_per_lb, cu_conc_grade_pct, payability, tc, rc, freight, penalties
+    )
+    return gross_revenue - total_deductions
+
+
+def _conc_price_cu_parts(
+    cu_price_per_lb: float,
+    cu_conc_grade_pct: float,
+    payability: float,
+    tc: float,
+    rc: float,
+    freight: float,
+    penalties: float,
+) -> Tuple[float, float]:
+    """Gross revenue and total deductions ($/t concentrate) for copper."""
     cu_grade_fraction = cu_conc_grade_pct / 100.0
 
     # Gross revenue per tonne of concentrate
@@ -177,9 +241,7 @@ def compute_conc_price_cu(
     rc_total = rc * cu_grade_fraction * LB_PER_TONNE
 
     # Total deductions per tonne of concentrate
-    total_deductions = tc + rc_total + freight + penalties
-
-    return gross_revenue - total_deductions
+    return gross_revenue, tc + rc_total + freight + penalties
 
 
 def compute_conc_price_au(
@@ -200,12 +262,9 @@ def compute_conc_price_au(
     Returns:
         Gold contribution to concentrate price ($/t concentrate)
     """
-    # Convert g/t to oz/t
-    au_oz_per_tonne_conc = au_grade_in_conc_gpt * TROY_OZ_PER_GRAM
-
-    gross_revenue = au_price_per_oz * au_oz_per_tonne_conc * payability
-    rc_total = rc * au_oz_per_tonne_conc
-
+    gross_revenue, rc_total = _conc_price_precious_parts(
+        au_price_per_oz, au_grade_in_conc_gpt, payability, rc
+    )
     return gross_revenue - rc_total
 
 
@@ -227,13 +286,24 @@ def compute_conc_price_ag(
     Returns:
         Silver contribution to concentrate price ($/t concentrate)
     """
-    # Convert g/t to oz/t
-    ag_oz_per_tonne_conc = ag_grade_in_conc_gpt * TROY_OZ_PER_GRAM
+    gross_revenue, rc_total = _conc_price_precious_parts(
+        ag_price_per_oz, ag_grade_in_conc_gpt, payability, rc
+    )
+    return gross_revenue - rc_total
 
-    gross_revenue = ag_price_per_oz * ag_oz_per_tonne_conc * payability
-    rc_total = rc * ag_oz_per_tonne_conc
 
-    return gross_revenue - rc_total
+def _conc_price_precious_parts(
+    price_per_oz: float,
+    grade_in_conc_gpt: float,
+    payability: float,
+    rc: float,
+) -> Tuple[float, float]:
+    """Gross revenue and refining charge ($/t concentrate) for Au or Ag."""
+    # Convert g/t to oz/t
+    oz_per_tonne_conc = grade_in_conc_gpt * TROY_OZ_PER_GRAM
+
+    gross_revenue = price_per_oz * oz_per_tonne_conc * payability
+    return gross_revenue, rc * oz_per_tonne_conc
 
 
 def compute_gross_revenue(conc_price_total: float, conc_tonnage: float) -> float:
@@ -250,6 +320,18 @@ def compute_gross_revenue(conc_price_total: float, conc_tonnage: float) -> float
     return conc_price_total * conc_tonnage
 
 
+class Deductions(NamedTuple):
+    """Deductions breakdown ($). Use ``_asdict()`` for a dict."""
+
+    tc: float
+    rc_cu: float
+    rc_au: float
+    rc_ag: float
+    freight: float
+    penalties: float
+    total: float
+
+
 def compute_deductions(
     tc: float,
     rc_cu: float,
@@ -258,25 +340,25 @@ def compute_deductions(
     freight: float,
     penalties: float,
     conc_tonnage: float,
-) -> dict:
+) -> Deductions:
     """
     Compute total deductions.
 
-    Returns dict with breakdown and total.
+    Returns a Deductions tuple with the breakdown and total.
     """
     tc_total = tc * conc_tonnage
     freight_total = freight * conc_tonnage
     penalties_total = penalties * conc_tonnage
 
-    return {
-        "tc": tc_total,
-        "rc_cu": rc_cu,
-        "rc_au": rc_au,
-        "rc_ag": rc_ag,
-        "freight": freight_total,
-        "penalties": penalties_total,
-        "total": tc_total + rc_cu + rc_au + rc_ag + freight_total + penalties_total,
-    }
+    return Deductions(
+        tc_total,
+        rc_cu,
+        rc_au,
+        rc_ag,
+        freight_total,
+        penalties_total,
+        tc_total + rc_cu + rc_au + rc_ag + freight_total + penalties_total,
+    )
 
 
 def compute_ebitda(
@@ -337,67 +419,118 @@ def compute_ebitda(
     )
 
 
-def compute_nsr_complete(inputs: NSRInput) -> NSRResult:
-    """
-    Complete NSR calculation following Caraíba methodology.
-
-    This is the main entry point for NSR calculations.
-
-    Args:
-        inputs: NSRInput with all calculation parameters
+class _NSRTerms(NamedTuple):
+    """Resolved inputs and Steps 1-5 of the NSR calculation, unrounded."""
+
+    cu_price: float
+    au_price: float
+    ag_price: float
+    cu_payability: float
+    cu_tc: float
+    cu_rc: float
+    cu_freight: float
+    au_payability: float
+    au_rc: float
+    ag_payability: float
+    ag_rc: float
+    cu_conc_grade: float
+    cu_recovery: float
+    au_recovery: float
+    ag_recovery: float
+    conc_ratio: float
+    gross_rev_cu: float  # $/t conc before TC/RC/freight/penalties
+    deductions_cu: float
+    rc_au: float
+    rc_ag: float
+    conc_price_cu: float
+    conc_price_au: float
+    conc_price_ag: float
+    conc_price_total: float
+    nsr_cu: float
+    nsr_au: float
+    nsr_ag: float
+    nsr_total: float
+
+
+# NSRInput fields _nsr_terms depends on, in _nsr_terms_cached's argument order
+_TERM_FIELDS = attrgetter(
+    "area", "cu_grade", "au_grade", "ag_grade",
+    "cu_price", "au_price", "ag_price",
+    "cu_payability", "cu_tc", "cu_rc", "cu_freight", "cu_penalties",
+    "au_payability", "au_rc", "ag_payability", "ag_rc",
+    "cu_conc_grade",
+)
 
-    Returns:
-        NSRResult with complete breakdown
 
-    Example:
-        >>> inputs = NSRInput(
-        ...     mine="Vermelhos UG",
-        ...     area="Vermelhos Sul",
-        ...     cu_grade=1.4,
-        ...     au_grade=0.23,
-        ...     ag_grade=2.33,
-        ... )
-        >>> result = compute_nsr_complete(inputs)
-        >>> print(f"NSR: ${result.nsr_per_tonne:.2f}/t ore")
-    """
+def _nsr_terms(inputs: NSRInput) -> _NSRTerms:
+    """Resolve defaults and compute NSR per tonne of ore by metal."""
+    return _nsr_terms_cached(*_TERM_FIELDS(inputs))
+
+
+# Sliders and repeated API calls re-send the same grades and terms; the
+# result is an immutable tuple, so hits can share it
+@lru_cache(maxsize=4096)
+def _nsr_terms_cached(
+    area: str,
+    cu_grade: float,
+    au_grade: float,
+    ag_grade: float,
+    cu_price: Optional[float],
+    au_price: Optional[float],
+    ag_price: Optional[float],
+    cu_payability: Optional[float],
+    cu_tc: Optional[float],
+    cu_rc: Optional[float],
+    cu_freight: Optional[float],
+    cu_penalties: Optional[float],
+    au_payability: Optional[float],
+    au_rc: Optional[float],
+    ag_payability: Optional[float],
+    ag_rc: Optional[float],
+    cu_conc_grade: Optional[float],
+) -> _NSRTerms:
     # Get defaults for optional parameters
-    cu_price = inputs.cu_price or DEFAULT_CU_PRICE_PER_LB
-    au_price = inputs.au_price or DEFAULT_AU_PRICE_PER_OZ
-    ag_price = inputs.ag_price or DEFAULT_AG_PRICE_PER_OZ
+    cu_price = cu_price if cu_price is not None else DEFAULT_CU_PRICE_PER_LB
+    au_price = au_price if au_price is not None else DEFAULT_AU_PRICE_PER_OZ
+    ag_price = ag_price if ag_price is not None else DEFAULT_AG_PRICE_PER_OZ
 
-    cu_payability = inputs.cu_payability or DEFAULT_CU_PAYABILITY
-    cu_tc = inputs.cu_tc or DEFAULT_CU_TC
-    cu_rc = inputs.cu_rc or DEFAULT_CU_RC
-    cu_freight = inputs.cu_freight or DEFAULT_CU_FREIGHT
-    cu_penalties = inputs.cu_penalties or DEFAULT_CU_PENALTIES
+    cu_payability = cu_payability if cu_payability is not None else DEFAULT_CU_PAYABILITY
+    cu_tc = cu_tc if cu_tc is not None else DEFAULT_CU_TC
+    cu_rc = cu_rc if cu_rc is not None else DEFAULT_CU_RC
+    cu_freight = cu_freight if cu_freight is not None else DEFAULT_CU_FREIGHT
+    cu_penalties = cu_penalties if cu_penalties is not None else DEFAULT_CU_PENALTIES
 
-    au_payability = inputs.au_payability or DEFAULT_AU_PAYABILITY
-    au_rc = inputs.au_rc or DEFAULT_AU_RC
+    au_payability = au_payability if au_payability is not None else DEFAULT_AU_PAYABILITY
+    au_rc = au_rc if au_rc is not None else DEFAULT_AU_RC
 
-    ag_payability = inputs.ag_payability or DEFAULT_AG_PAYABILITY
-    ag_rc = inputs.ag_rc or DEFAULT_AG_RC
+    ag_payability = ag_payability if ag_payability is not None else DEFAULT_AG_PAYABILITY
+    ag_rc = ag_rc if ag_rc is not None else DEFAULT_AG_RC
 
-    cu_conc_grade = inputs.cu_conc_grade or DEFAULT_CU_CONC_GRADE
+    cu_conc_grade = cu_conc_grade if cu_conc_grade is not None else DEFAULT_CU_CONC_GRADE
 
     # Step 1: Calculate Cu recovery
-    cu_recovery = compute_cu_recovery(inputs.cu_grade, inputs.area)
+    cu_recovery = compute_cu_recovery(cu_grade, area)
     au_recovery = DEFAULT_AU_RECOVERY
     ag_recovery = DEFAULT_AG_RECOVERY
 
     # Step 2: Calculate concentrate ratio
-    conc_ratio = compute_conc_ratio(inputs.cu_grade, cu_recovery, cu_conc_grade)
+    conc_ratio = compute_conc_ratio(cu_grade, cu_recovery, cu_conc_grade)
 
     # Step 3: Calculate grades in concentrate (for Au and Ag)
     # Au/Ag in conc = (grade in ore × recovery) / conc_ratio
-    au_in_conc = (inputs.au_grade * au_recovery) / conc_ratio if conc_ratio > 0 else 0
-    ag_in_conc = (inputs.ag_grade * ag_recovery) / conc_ratio if conc_ratio > 0 else 0
+    au_in_conc = (au_grade * au_recovery) / conc_ratio if conc_ratio > 0 else 0
+    ag_in_conc = (ag_grade * ag_recovery) / conc_ratio if conc_ratio > 0 else 0
 
-    # Step 4: Calculate concentrate prices
-    conc_price_cu = compute_conc_price_cu(
+    # Step 4: Calculate concentrate prices, keeping gross revenue (before
+    # TC/RC/freight deductions) for the cascade
+    gross_rev_cu, deductions_cu = _conc_price_cu_parts(
         cu_price, cu_conc_grade, cu_payability, cu_tc, cu_rc, cu_freight, cu_penalties
     )
-    conc_price_au = compute_conc_price_au(au_price, au_in_conc, au_payability, au_rc)
-    conc_price_ag = compute_conc_price_ag(ag_price, ag_in_conc, ag_payability, ag_rc)
+    gross_rev_au, rc_au = _conc_price_precious_parts(au_price, au_in_conc, au_payability, au_rc)
+    gross_rev_ag, rc_ag = _conc_price_precious_parts(ag_price, ag_in_conc, ag_payability, ag_rc)
+    conc_price_cu = gross_rev_cu - deductions_cu
+    conc_price_au = gross_rev_au - rc_au
+    conc_price_ag = gross_rev_ag - rc_ag
     conc_price_total = conc_price_cu + conc_price_au + conc_price_ag
 
     # Step 5: Calculate NSR per tonne of ore (by metal)
@@ -407,27 +540,85 @@ def compute_nsr_complete(inputs: NSRInput) -> NSRResult:
     nsr_ag = conc_price_ag * conc_ratio
     nsr_total = nsr_cu + nsr_au + nsr_ag
 
-    # Final NSR per tonne
-    nsr_per_tonne = nsr_total
+    return _NSRTerms(
+        cu_price, au_price, ag_price,
+        cu_payability, cu_tc, cu_rc, cu_freight,
+        au_payability, au_rc, ag_payability, ag_rc,
+        cu_conc_grade,
+        cu_recovery, au_recovery, ag_recovery,
+        conc_ratio,
+        gross_rev_cu, deductions_cu, rc_au, rc_ag,
+        conc_price_cu, conc_price_au, conc_price_ag, conc_price_total,
+        nsr_cu, nsr_au, nsr_ag, nsr_total,
+    )
 
-    # ── CASCADE: decompose nsr_total into Mineral Resources → Mine → Processing → Final ──
 
-    # Gross conc revenue per tonne of concentrate (before TC/RC/freight deductions)
-    gross_rev_cu = cu_price * (cu_conc_grade / 100.0) * cu_payability * LB_PER_TONNE
-    gross_rev_au = au_price * au_in_conc * TROY_OZ_PER_GRAM * au_payability if conc_ratio > 0 else 0
-    gross_rev_ag = ag_price * ag_in_conc * TROY_OZ_PER_GRAM * ag_payability if conc_ratio > 0 else 0
+class NSRSummary(NamedTuple):
+    """NSR per tonne of ore, total and by metal, rounded as in NSRResult."""
+
+    nsr_per_tonne: float
+    nsr_cu: float
+    nsr_au: float
+    nsr_ag: float
+
+
+def compute_nsr_summary(inputs: NSRInput) -> NSRSummary:
+    """
+    NSR per tonne of ore without the cascade, EBITDA or inputs_used.
+
+    For callers that only read the headline numbers (goal seek, alert
+    checks, snapshot seeding); the values equal the matching fields of
+    compute_nsr_complete(inputs).
+
+    Args:
+        inputs: NSRInput with all calculation parameters
+
+    Returns:
+        NSRSummary with NSR per tonne and its Cu/Au/Ag split
+    """
+    t = _nsr_terms(inputs)
+    return NSRSummary(
+        round(t.nsr_total, 2), round(t.nsr_cu, 2), round(t.nsr_au, 2), round(t.nsr_ag, 2)
+    )
+
+
+def compute_nsr_complete(inputs: NSRInput) -> NSRResult:
+    """
+    Complete NSR calculation following Caraíba methodology.
+
+    This is the main entry point for NSR calculations.
+
+    Args:
+        inputs: NSRInput with all calculation parameters
+
+    Returns:
+        NSRResult with complete breakdown
+
+    Example:
+        >>> inputs = NSRInput(
+        ...     mine="Vermelhos UG",
+        ...     area="Vermelhos Sul",
+        ...     cu_grade=1.4,
+        ...     au_grade=0.23,
+        ...     ag_grade=2.33,
+        ... )
+        >>> result = compute_nsr_complete(inputs)
+        >>> print(f"NSR: ${result.nsr_per_tonne:.2f}/t ore")
+    """
+    t = _nsr_terms(inputs)
+
+    # ── CASCADE: decompose nsr_total into Mineral Resources → Mine → Processing → Final ──
 
     # Selling costs per tonne of ore = (gross - net) × conc_ratio
-    selling_costs_per_tonne = (
-        (gross_rev_cu + gross_rev_au + gross_rev_ag) - conc_price_total
-    ) * conc_ratio
+    selling_costs_per_tonne = (t.deductions_cu + t.rc_au + t.rc_ag) * t.conc_ratio
 
     # NSR Processing = after recovery, BEFORE selling costs
-    nsr_processing = nsr_total + selling_costs_per_tonne
+    nsr_processing = t.nsr_total + selling_costs_per_tonne
 
     # Recovery loss: only Cu is affected by Cu recovery; Au/Ag NSR per tonne ore is invariant
-    conc_ratio_100 = (inputs.cu_grade / 100.0) / (cu_conc_grade / 100.0) if cu_conc_grade > 0 else 0
-    recovery_loss = gross_rev_cu * conc_ratio_100 * (1 - cu_recovery)
+    # Concentrate ratio at 100% recovery; every area's recovery is positive
+    conc_ratio_100 = t.conc_ratio / t.cu_recovery
+    recovery_loss = t.gross_rev_cu * conc_ratio_100 * (1 - t.cu_recovery)
 
     # NSR Mine = after mine factors, BEFORE recovery and selling costs
     nsr_mine = nsr_processing + recovery_loss
@@ -438,8 +629,8 @@ def compute_nsr_complete(inputs: NSRInput) -> NSRResult:
     dilution_loss = nsr_mineral_resources - nsr_mine
 
     # Calculate revenue for given tonnage
-    conc_tonnage = inputs.ore_tonnage * conc_ratio
-    revenue_total = conc_price_total * conc_tonnage
+    conc_tonnage = inputs.ore_tonnage * t.conc_ratio
+    revenue_total = t.conc_price_total * conc_tonnage
 
     # EBITDA calculation (when any cost input is provided)
     has_costs = any(
@@ -475,18 +666,18 @@ def compute_nsr_complete(inputs: NSRInput) -> NSRResult:
         "ore_tonnage": inputs.ore_tonnage,
         "mine_dilution": inputs.mine_dilution,
         "ore_recovery": inputs.ore_recovery,
-        "cu_price": cu_price,
-        "au_price": au_price,
-        "ag_price": ag_price,
-        "cu_payability": cu_payability,
-        "cu_tc": cu_tc,
-        "cu_rc": cu_rc,
-        "cu_freight": cu_freight,
-        "au_payability": au_payability,
-        "au_rc": au_rc,
-        "ag_payability": ag_payability,
-        "ag_rc": ag_rc,
-        "cu_conc_grade": cu_conc_grade,
+        "cu_price": t.cu_price,
+        "au_price": t.au_price,
+        "ag_price": t.ag_price,
+        "cu_payability": t.cu_payability,
+        "cu_tc": t.cu_tc,
+        "cu_rc": t.cu_rc,
+        "cu_freight": t.cu_freight,
+        "au_payability": t.au_payability,
+        "au_rc": t.au_rc,
+        "ag_payability": t.ag_payability,
+        "ag_rc": t.ag_rc,
+        "cu_conc_grade": t.cu_conc_grade,
         "mine_cost": inputs.mine_cost,
         "development_cost": inputs.development_cost,
         "development_meters": inputs.development_meters,
@@ -497,27 +688,27 @@ def compute_nsr_complete(inputs: NSRInput) -> NSRResult:
 
     return NSRResult(
         # Concentrate prices
-        conc_price_cu=round(conc_price_cu, 2),
-        conc_price_au=round(conc_price_au, 2),
-        conc_price_ag=round(conc_price_ag, 2),
-        conc_price_total=round(conc_price_total, 2),
+        conc_price_cu=round(t.conc_price_cu, 2),
+        conc_price_au=round(t.conc_price_au, 2),
+        conc_price_ag=round(t.conc_price_ag, 2),
+        conc_price_total=round(t.conc_price_total, 2),
         # NSR by metal
-        nsr_cu=round(nsr_cu, 2),
-        nsr_au=round(nsr_au, 2),
-        nsr_ag=round(nsr_ag, 2),
+        nsr_cu=round(t.nsr_cu, 2),
+        nsr_au=round(t.nsr_au, 2),
+        nsr_ag=round(t.nsr_ag, 2),
         # NSR levels
         nsr_mineral_resources=round(nsr_mineral_resources, 2),
         nsr_processing=round(nsr_processing, 2),
         nsr_mine=round(nsr_mine, 2),
-        nsr_per_tonne=round(nsr_per_tonne, 2),
+        nsr_per_tonne=round(t.nsr_total, 2),
         # Losses
         dilution_loss=round(dilution_loss, 2),
         recovery_loss=round(recovery_loss, 2),
         # Ratios
-        conc_ratio=round(conc_ratio, 6),
-        cu_recovery=round(cu_recovery, 4),
-        au_recovery=round(au_recovery, 4),
-        ag_recovery=round(ag_recovery, 4),
+        conc_ratio=round(t.conc_ratio, 6),
+        cu_recovery=round(t.cu_recovery, 4),
+        au_recovery=round(t.au_recovery, 4),
+        ag_recovery=round(t.ag_recovery, 4),
         # Revenue
         revenue_total=round(revenue_total, 2),
         # EBITDA
@@ -528,3 +719,160 @@ def compute_nsr_complete(inputs: NSRInput) -> NSRResult:
         formula_applied="See NSR_REQUIREMENTS.md",
         inputs_used=inputs_used,
     )
+
+
+class _DeckCoefficients(NamedTuple):
+    """Block-independent terms of the NSR formulas for one price deck."""
+
+    cu_conc_grade_frac: float  # Cu grade of concentrate as a fraction
+    conc_price_cu: float  # $/t concentrate
+    au_nsr_per_gpt: float  # $/t ore per g/t Au in ore, when conc is produced
+    ag_nsr_per_gpt: float  # $/t ore per g/t Ag in ore, when conc is produced
+
+
+def _deck_coefficients(inputs: NSRInput) -> _DeckCoefficients:
+    """
+    Resolve defaults and fold everything that doesn't depend on the block.
+
+    Au and Ag NSR are linear in their grades: the concentrate ratio divides
+    the grade in concentrate and multiplies it back out, so
+    nsr_au = au_grade × au_recovery × oz/g × (price × payability − RC).
+    """
+    cu_price = inputs.cu_price if inputs.cu_price is not None else DEFAULT_CU_PRICE_PER_LB
+    au_price = inputs.au_price if inputs.au_price is not None else DEFAULT_AU_PRICE_PER_OZ
+    ag_price = inputs.ag_price if inputs.ag_price is not None else DEFAULT_AG_PRICE_PER_OZ
+
+    cu_payability = (
+        inputs.cu_payability if inputs.cu_payability is not None else DEFAULT_CU_PAYABILITY
+    )
+    cu_tc = inputs.cu_tc if inputs.cu_tc is not None else DEFAULT_CU_TC
+    cu_rc = inputs.cu_rc if inputs.cu_rc is not None else DEFAULT_CU_RC
+    cu_freight = inputs.cu_freight if inputs.cu_freight is not None else DEFAULT_CU_FREIGHT
+    cu_penalties = inputs.cu_penalties if inputs.cu_penalties is not None else DEFAULT_CU_PENALTIES
+
+    au_payability = (
+        inputs.au_payability if inputs.au_payability is not None else DEFAULT_AU_PAYABILITY
+    )
+    au_rc = inputs.au_rc if inputs.au_rc is not None else DEFAULT_AU_RC
+
+    ag_payability = (
+        inputs.ag_payability if inputs.ag_payability is not None else DEFAULT_AG_PAYABILITY
+    )
+    ag_rc = inputs.ag_rc if inputs.ag_rc is not None else DEFAULT_AG_RC
+
+    cu_conc_grade = (
+        inputs.cu_conc_grade if inputs.cu_conc_grade is not None else DEFAULT_CU_CONC_GRADE
+    )
+
+    return _DeckCoefficients(
+        cu_conc_grade_frac=cu_conc_grade / 100.0,
+        conc_price_cu=compute_conc_price_cu(
+            cu_price, cu_conc_grade, cu_payability, cu_tc, cu_rc, cu_freight, cu_penalties
+        ),
+        au_nsr_per_gpt=(
+            DEFAULT_AU_RECOVERY * TROY_OZ_PER_GRAM * (au_price * au_payability - au_rc)
+        ),
+        ag_nsr_per_gpt=(
+            DEFAULT_AG_RECOVERY * TROY_OZ_PER_GRAM * (ag_price * ag_payability - ag_rc)
+        ),
+    )
+
+
+def compute_nsr_complete_batch(
+    inputs: NSRInput,
+    cu_grade: np.ndarray,
+    au_grade: np.ndarray,
+    ag_grade: np.ndarray,
+    areas: Optional[Union[Sequence[str], np.ndarray]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized NSR per tonne for many blocks sharing one set of terms.
+
+    Evaluates the compute_nsr_complete formulas over float64 arrays in one
+    pass instead of one call per block, with the price-deck terms folded
+    once (see _deck_coefficients). Results agree to the cent. Large batches
+    run in a parallel Numba kernel when numba is installed. Prices,
+    commercial terms and the default area come from ``inputs``; its grades
+    are ignored.
+
+    Args:
+        inputs: Prices and commercial terms shared by every block
+        cu_grade: Copper grades (%)
+        au_grade: Gold grades (g/t)
+        ag_grade: Silver grades (g/t)
+        areas: Optional recovery area per block, as names or as ids from
+            get_area_ids (defaults to inputs.area)
+
+    Returns:
+        Dict of arrays: nsr_per_tonne, nsr_cu, nsr_au, nsr_ag (rounded to
+        cents), cu_recovery, conc_ratio, and a ``valid`` mask. Blocks whose
+        grades NSRInput would reject (negative, NaN, Cu above 100%) get zero
+        NSR and ``valid=False``.
+    """
+    cu_grade = np.asarray(cu_grade, dtype=np.float64)
+    au_grade = np.asarray(au_grade, dtype=np.float64)
+    ag_grade = np.asarray(ag_grade, dtype=np.float64)
+
+    deck = _deck_coefficients(inputs)
+
+    valid = (
+        (cu_grade >= 0) & (cu_grade <= 100) & (au_grade >= 0) & (ag_grade >= 0)
+    )
+    cu_grade = np.where(valid, cu_grade, 0.0)
+    au_grade = np.where(valid, au_grade, 0.0)
+    ag_grade = np.where(valid, ag_grade, 0.0)
+
+    # Per-area recovery parameters (a, b, fixed), gathered by area id
+    if areas is None:
+        area_id = np.full(
+            cu_grade.shape, _AREA_IDX.get(inputs.area, _DEFAULT_AREA_IDX), dtype=np.intp
+        )
+    elif isinstance(areas, np.ndarray) and areas.dtype.kind in "iu":
+        area_id = areas
+    else:
+        area_id = get_area_ids(areas)
+    a = _REC_A[area_id]
+    b = _REC_B[area_id]
+    fixed = _REC_FIXED[area_id]
+
+    # One buffer for every output row, so the NSR rows round in one pass
+    out = np.empty((6, cu_grade.size))
+    cu_recovery, conc_ratio, nsr_cu, nsr_au, nsr_ag, nsr_total = out
+
+    kernel = get_nsr_kernel() if cu_grade.size >= KERNEL_MIN_BLOCKS else None
+    if kernel is not None:
+        kernel(
+            cu_grade, au_grade, ag_grade, a, b, fixed, *deck,
+            cu_recovery, conc_ratio, nsr_cu, nsr_au, nsr_ag, nsr_total,
+        )
+    else:
+        # Step 1: Cu recovery
+        np.minimum(
+            np.where(np.isnan(fixed), a * cu_grade + b, fixed) / 100.0, 1.0, out=cu_recovery
+        )
+
+        # Step 2: Concentrate ratio
+        np.divide((cu_grade / 100.0) * cu_recovery, deck.cu_conc_grade_frac, out=conc_ratio)
+
+        # Step 3: NSR per tonne of ore; Au/Ag pay only if concentrate is produced
+        has_conc = conc_ratio > 0
+        np.multiply(deck.conc_price_cu, conc_ratio, out=nsr_cu)
+        nsr_au[:] = np.where(has_conc, deck.au_nsr_per_gpt * au_grade, 0.0)
+        nsr_ag[:] = np.where(has_conc, deck.ag_nsr_per_gpt * ag_grade, 0.0)
+        np.add(nsr_cu, nsr_au, out=nsr_total)
+        nsr_total += nsr_ag
+
+    # Round the NSR rows to cents once, then zero the rejected blocks
+    nsr = out[2:]
+    np.round(nsr, 2, out=nsr)
+    nsr[:, ~valid] = 0.0
+
+    return {
+        "nsr_per_tonne": nsr_total,
+        "nsr_cu": nsr_cu,
+        "nsr_au": nsr_au,
+        "nsr_ag": nsr_ag,
+        "cu_recovery": cu_recovery,
+        "conc_ratio": conc_ratio,
+        "valid": valid,
+    }
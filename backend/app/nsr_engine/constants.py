@@ -1,5 +1,7 @@
 """Physical and commercial constants for NSR calculations."""
 
+from types import MappingProxyType
+
 # =============================================================================
 # Weight Conversions
 # =============================================================================
@@ -81,8 +83,11 @@ DEFAULT_GA_COST = 5.0  # $/t ore (estimated)
 # Recovery Parameters by Area (Caraíba)
 # Format: {"a": slope, "b": intercept, "fixed": optional_fixed_value}
 # Recovery (%) = a * Cu Grade (%) + b
+#
+# Read-only: calculations.py builds its lookup arrays from these at import
+# and memoizes results, so an edit at runtime would be silently ignored.
 # =============================================================================
-RECOVERY_PARAMS = {
+_RECOVERY_PARAMS = {
     # Vermelhos UG
     "Vermelhos Sul": {"a": 2.8286, "b": 92.584, "fixed": None},
     "UG03": {"a": 2.8286, "b": 92.584, "fixed": None},
@@ -114,8 +119,12 @@ RECOVERY_PARAMS = {
     "S5": {"a": 4.0718, "b": 87.885, "fixed": None},
 }
 
+RECOVERY_PARAMS = MappingProxyType(
+    {area: MappingProxyType(params) for area, params in _RECOVERY_PARAMS.items()}
+)
+
 # Default recovery if area not found
-DEFAULT_RECOVERY_PARAMS = {"a": 3.0, "b": 90.0, "fixed": None}
+DEFAULT_RECOVERY_PARAMS = MappingProxyType({"a": 3.0, "b": 90.0, "fixed": None})
 
 # Default Au/Ag recovery (Base Case from Excel)
 DEFAULT_AU_RECOVERY = 0.60  # 60% (Base Case)
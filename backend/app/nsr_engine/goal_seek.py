@@ -1,18 +1,21 @@
 """Goal Seek solver for NSR calculations.
 
-Implements a bisection-based solver that finds the value of any input
+Implements a safeguarded Newton solver that finds the value of any input
 variable needed to achieve a target NSR value. Similar to Excel's
 Goal Seek feature but integrated with the NSR calculation engine.
 
 The NSR function is monotonic with respect to each individual variable,
-which guarantees bisection convergence.
+so a sign-change bracket always contains the solution; Newton steps that
+leave the bracket or stall fall back to bisection, which guarantees
+convergence. NSR is linear in prices and costs, so Newton usually lands
+in one or two steps.
 """
 
 from dataclasses import dataclass
 from typing import Dict, Tuple
 
 from app.nsr_engine.models import NSRInput
-from app.nsr_engine.calculations import compute_nsr_complete
+from app.nsr_engine.calculations import _nsr_terms, compute_nsr_summary
 
 
 # Variable definitions: name -> (direction, lower_bound, upper_bound, unit)
@@ -92,10 +95,13 @@ def _get_variable_value(inputs: NSRInput, variable: str) -> float:
 
 
 def _set_variable_value(inputs: NSRInput, variable: str, value: float) -> NSRInput:
-    """Create a copy of NSRInput with one variable changed."""
-    data = inputs.model_dump()
-    data[variable] = value
-    return NSRInput(**data)
+    """
+    Create a copy of NSRInput with one variable changed.
+
+    Skips re-validation: the solver only sets floats inside the
+    GOAL_SEEK_VARIABLES bounds, which sit within NSRInput's constraints.
+    """
+    return inputs.model_copy(update={variable: value})
 
 
 def _compute_nsr_for_value(
@@ -103,8 +109,15 @@ def _compute_nsr_for_value(
 ) -> float:
     """Compute NSR for a specific variable value."""
     modified = _set_variable_value(base_input, variable, value)
-    result = compute_nsr_complete(modified)
-    return result.nsr_per_tonne
+    return compute_nsr_summary(modified).nsr_per_tonne
+
+
+def _unrounded_nsr_for_value(
+    base_input: NSRInput, variable: str, value: float
+) -> float:
+    """NSR before rounding to cents, for finite-difference slopes."""
+    modified = _set_variable_value(base_input, variable, value)
+    return _nsr_terms(modified).nsr_total
 
 
 def goal_seek(
@@ -117,15 +130,17 @@ def goal_seek(
     """
     Find the value of target_variable that yields target_nsr.
 
-    Uses bisection method, which is guaranteed to converge for
-    monotonic functions.
+    Uses Newton's method with a finite-difference slope, safeguarded by
+    a bisection bracket: a step that leaves the bracket, or one that
+    follows a step which failed to halve the error, is replaced by
+    bisection. Converges for monotonic functions.
 
     Args:
         base_input: Base NSR calculation parameters.
         target_variable: Variable to solve for (e.g., "cu_price").
         target_nsr: Desired NSR value in $/t (default 0 = break-even).
         tolerance: Convergence tolerance in $/t (default $0.01).
-        max_iterations: Maximum bisection iterations (default 50).
+        max_iterations: Maximum solver iterations (default 50).
 
     Returns:
         GoalSeekResult with the threshold value and metadata.
@@ -163,75 +178,111 @@ def goal_seek(
             tolerance_achieved=abs(current_nsr - target_nsr),
         )
 
-    # Evaluate NSR at bounds
-    nsr_at_lower = _compute_nsr_for_value(base_input, target_variable, lower_bound)
-    nsr_at_upper = _compute_nsr_for_value(base_input, target_variable, upper_bound)
-
-    # For revenue variables: NSR increases with variable
-    # For cost variables: NSR decreases with variable
-    # We need f(x) = nsr(x) - target_nsr = 0
-
-    # Check if solution exists within bounds
-    f_lower = nsr_at_lower - target_nsr
-    f_upper = nsr_at_upper - target_nsr
-
-    if f_lower * f_upper > 0:
-        # No sign change -> no solution in bounds.
-        # Both bounds produce NSR on the same side of the target.
-        # For revenue vars: if both > 0, even at lower bound NSR exceeds target
-        # For cost vars: if both > 0, even at upper bound NSR exceeds target
-        if abs(f_lower) < abs(f_upper):
-            threshold = lower_bound
-            nsr_at_threshold = nsr_at_lower
-            hit = "lower"
+    # NSR is monotonic in the variable, so the root lies between the current
+    # value and the bound on the far side of the target. Evaluate only that
+    # bound; the other is needed only when it turns out not to bracket.
+    f_current = current_nsr - target_nsr
+    bracket = None
+    if lower_bound <= current_value <= upper_bound:
+        if (f_current > 0) == (direction == "revenue"):
+            f_lower = (
+                _compute_nsr_for_value(base_input, target_variable, lower_bound)
+                - target_nsr
+            )
+            if f_lower * f_current <= 0:
+                bracket = (lower_bound, current_value, f_lower)
         else:
-            threshold = upper_bound
-            nsr_at_threshold = nsr_at_upper
-            hit = "upper"
-
-        delta_pct = (
-            ((threshold - current_value) / current_value * 100)
-            if current_value != 0
-            else 0.0
-        )
+            f_upper = (
+                _compute_nsr_for_value(base_input, target_variable, upper_bound)
+                - target_nsr
+            )
+            if f_upper * f_current <= 0:
+                bracket = (current_value, upper_bound, f_current)
+
+    if bracket is None:
+        nsr_at_lower = _compute_nsr_for_value(base_input, target_variable, lower_bound)
+        nsr_at_upper = _compute_nsr_for_value(base_input, target_variable, upper_bound)
+        f_lower = nsr_at_lower - target_nsr
+        f_upper = nsr_at_upper - target_nsr
+        bracket = (lower_bound, upper_bound, f_lower)
+
+        if f_lower * f_upper > 0:
+            # No sign change -> no solution in bounds.
+            # Both bounds produce NSR on the same side of the target.
+            # For revenue vars: if both > 0, even at lower bound NSR exceeds target
+            # For cost vars: if both > 0, even at upper bound NSR exceeds target
+            if abs(f_lower) < abs(f_upper):
+                threshold = lower_bound
+                nsr_at_threshold = nsr_at_lower
+                hit = "lower"
+            else:
+                threshold = upper_bound
+                nsr_at_threshold = nsr_at_upper
+                hit = "upper"
+
+            delta_pct = (
+                ((threshold - current_value) / current_value * 100)
+                if current_value != 0
+                else 0.0
+            )
 
-        return GoalSeekResult(
-            target_variable=target_variable,
-            target_variable_unit=unit,
-            target_nsr=target_nsr,
-            threshold_value=round(threshold, 6),
-            current_value=current_value,
-            current_nsr=round(current_nsr, 2),
-            delta_percent=round(delta_pct, 2),
-            is_currently_viable=is_currently_viable,
-            converged=False,
-            iterations=0,
-            tolerance_achieved=abs(nsr_at_threshold - target_nsr),
-            bound_hit=hit,
-        )
+            return GoalSeekResult(
+                target_variable=target_variable,
+                target_variable_unit=unit,
+                target_nsr=target_nsr,
+                threshold_value=round(threshold, 6),
+                current_value=current_value,
+                current_nsr=round(current_nsr, 2),
+                delta_percent=round(delta_pct, 2),
+                is_currently_viable=is_currently_viable,
+                converged=False,
+                iterations=0,
+                tolerance_achieved=abs(nsr_at_threshold - target_nsr),
+                bound_hit=hit,
+            )
 
-    # Bisection method
-    a, b = lower_bound, upper_bound
-    fa = f_lower
+    # Newton's method inside the [a, b] bracket, starting from the
+    # current value when it lies inside
+    a, b, fa = bracket
+    x = current_value if a <= current_value <= b else (a + b) / 2.0
+    prev_error = float("inf")
 
     iterations = 0
     for i in range(max_iterations):
         iterations = i + 1
-        mid = (a + b) / 2.0
-        nsr_mid = _compute_nsr_for_value(base_input, target_variable, mid)
-        f_mid = nsr_mid - target_nsr
+        nsr_x = _unrounded_nsr_for_value(base_input, target_variable, x)
+        f_x = nsr_x - target_nsr
 
-        if abs(f_mid) <= tolerance:
-            # Converged
+        # Converged, judged on the cent-rounded NSR we report
+        if abs(round(nsr_x, 2) - target_nsr) <= tolerance:
             break
 
-        if fa * f_mid < 0:
-            b = mid
+        # Keep the root bracketed
+        if fa * f_x < 0:
+            b = x
         else:
-            a = mid
-            fa = f_mid
-
-    threshold = (a + b) / 2.0
+            a = x
+            fa = f_x
+
+        # A step that didn't halve the error is followed by bisection
+        use_newton = abs(f_x) < 0.5 * prev_error
+        prev_error = abs(f_x)
+
+        x_new = (a + b) / 2.0
+        if use_newton:
+            h = max(1e-6, 1e-6 * abs(x))
+            if x + h > upper_bound:
+                h = -h
+            slope = (
+                _unrounded_nsr_for_value(base_input, target_variable, x + h) - nsr_x
+            ) / h
+            if slope != 0:
+                x_newton = x - f_x / slope
+                if a < x_newton < b:
+                    x_new = x_newton
+        x = x_new
+
+    threshold = x
     nsr_at_threshold = _compute_nsr_for_value(base_input, target_variable, threshold)
 
     delta_pct = (
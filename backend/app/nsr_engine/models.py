@@ -61,7 +61,9 @@ class NSRInput(BaseModel):
     ag_payability: Optional[float] = Field(default=None, description="Ag payability")
     ag_rc: Optional[float] = Field(default=None, description="Refining charge Ag ($/oz)")
 
-    cu_conc_grade: Optional[float] = Field(default=None, description="Cu concentrate grade (%)")
+    cu_conc_grade: Optional[float] = Field(
+        default=None, gt=0, le=100, description="Cu concentrate grade (%)"
+    )
 
     # Operational costs (for EBITDA)
     mine_cost: Optional[float] = Field(default=None, ge=0, description="Mining cost ($/t ore)")
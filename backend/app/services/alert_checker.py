@@ -12,15 +12,21 @@ then:
 
 import logging
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
 
-from sqlalchemy import select, create_engine
-from sqlalchemy.orm import Session, sessionmaker
+import numpy as np
+from pydantic import ValidationError
+from sqlalchemy import Engine, insert, select, create_engine
+from sqlalchemy.orm import Session
 
 from app.config import get_settings
+from app.db.partitions import ensure_monthly_partitions
 from app.models.goal_seek import GoalSeekScenario, NsrSnapshot
 from app.nsr_engine.models import NSRInput
-from app.nsr_engine.calculations import compute_nsr_complete
+from app.nsr_engine.calculations import NSRSummary, compute_nsr_complete_batch
 from app.nsr_engine.constants import (
     DEFAULT_CU_PRICE_PER_LB,
     DEFAULT_AU_PRICE_PER_OZ,
@@ -40,12 +46,22 @@ FREQUENCY_INTERVALS = {
     "weekly": timedelta(days=7),
 }
 
+# base_inputs keys that set a scenario's commercial terms; prices come from
+# the live feed, so scenarios with equal terms share one NSR batch
+SCENARIO_TERMS = ("cu_payability", "cu_tc", "cu_rc", "cu_freight")
+
 # APScheduler instance (created on startup)
 _scheduler = None
 
 
-def _get_sync_session():
-    """Create a synchronous database session for the scheduler."""
+@lru_cache(maxsize=1)
+def _get_sync_engine() -> Engine:
+    """
+    Synchronous engine for the scheduler, created once per process.
+
+    Reusing it keeps the connection open between hourly runs instead of
+    reconnecting (and leaking the previous pool) on every run.
+    """
     settings = get_settings()
     db_url = settings.database_url
     # Ensure sync driver
@@ -56,9 +72,19 @@ def _get_sync_session():
     if "railway.internal" in db_url:
         connect_args["sslmode"] = "disable"
 
-    engine = create_engine(db_url, connect_args=connect_args)
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
+    # One job runs at a time, so a single pooled connection is enough;
+    # pre-ping replaces it if the server dropped it between runs
+    return create_engine(
+        db_url,
+        connect_args=connect_args,
+        pool_size=1,
+        pool_pre_ping=True,
+    )
+
+
+def _get_sync_session():
+    """Create a synchronous database session for the scheduler."""
+    return Session(_get_sync_engine())
 
 
 def _fetch_live_prices_sync() -> dict:
@@ -127,12 +153,11 @@ def check_alerts_job():
 
     session = _get_sync_session()
     try:
-        # Get all scenarios with alerts enabled
-        scenarios = (
-            session.query(GoalSeekScenario)
-            .filter(GoalSeekScenario.alert_enabled == True)
-            .all()
-        )
+        # Get all scenarios with alerts enabled, each with its latest snapshot
+        scenarios = session.execute(
+            GoalSeekScenario.with_latest_snapshot()
+            .where(GoalSeekScenario.alert_enabled == True)
+        ).all()
 
         if not scenarios:
             logger.info("No active alert scenarios found")
@@ -141,14 +166,14 @@ def check_alerts_job():
         # Fetch prices once for all scenarios
         prices = _fetch_live_prices_sync()
 
-        for scenario in scenarios:
-            try:
-                _process_scenario(session, scenario, prices, now)
-            except Exception as e:
-                logger.error(
-                    f"Error processing scenario {scenario.id} ({scenario.name}): {e}"
-                )
-                continue
+        # Snapshots go to monthly partitions: keep this month's and next
+        # month's in place ahead of the writes
+        if session.bind.dialect.name == "postgresql":
+            ensure_monthly_partitions(
+                session, NsrSnapshot.__tablename__, now, now + timedelta(days=31)
+            )
+
+        _check_scenarios(session, scenarios, prices, now)
 
         session.commit()
         logger.info(f"Alert checker completed. Processed {len(scenarios)} scenarios.")
@@ -160,76 +185,176 @@ def check_alerts_job():
         session.close()
 
 
-def _process_scenario(
+def _check_scenarios(
     session: Session,
-    scenario: GoalSeekScenario,
+    scenarios: Sequence[Tuple[GoalSeekScenario, Optional[NsrSnapshot]]],
     prices: dict,
     now: datetime,
 ):
-    """Process a single scenario: check frequency, compute, snapshot, alert."""
-    # Check if enough time has passed
-    interval = FREQUENCY_INTERVALS.get(scenario.alert_frequency, timedelta(hours=24))
-    if scenario.alert_last_checked_at:
-        elapsed = now - scenario.alert_last_checked_at
-        if elapsed < interval:
-            return  # Not due yet
+    """
+    Check every due scenario: compute, snapshot, alert.
 
-    # Build NSRInput from saved base_inputs, overriding prices with current
-    base = scenario.base_inputs
-    nsr_input = NSRInput(
-        mine=base.get("mine", ""),
-        area=base.get("area", ""),
-        cu_grade=base.get("cu_grade", 0),
-        au_grade=base.get("au_grade", 0),
-        ag_grade=base.get("ag_grade", 0),
-        ore_tonnage=base.get("ore_tonnage", 1000),
-        mine_dilution=base.get("mine_dilution", 0.14),
-        ore_recovery=base.get("ore_recovery", 0.98),
-        cu_price=prices["cu_price"],
-        au_price=prices["au_price"],
-        ag_price=prices["ag_price"],
-        cu_payability=base.get("cu_payability"),
-        cu_tc=base.get("cu_tc"),
-        cu_rc=base.get("cu_rc"),
-        cu_freight=base.get("cu_freight"),
+    NSR for all due scenarios is computed in one batch per set of
+    commercial terms, and threshold crossings are found on the arrays.
+    Snapshots are inserted together; nothing is committed here.
+    """
+    due = [
+        (scenario, latest) for scenario, latest in scenarios if _is_due(scenario, latest, now)
+    ]
+    if not due:
+        return
+
+    nsr = _compute_scenarios_nsr([scenario for scenario, _ in due], prices)
+
+    # Hysteresis: alert only when NSR rises from below the target to it or
+    # above. Scenarios without a previous value (NaN) never cross.
+    target = np.array([scenario.target_nsr for scenario, _ in due], dtype=np.float64)
+    previous = np.array(
+        [_previous_nsr(scenario, latest) for scenario, latest in due], dtype=np.float64
     )
+    current = nsr["nsr_per_tonne"]
+    crossed_up = np.logical_and(previous < target, current >= target)
+
+    snapshot_rows = []
+    for i, (scenario, _) in enumerate(due):
+        if not nsr["valid"][i]:
+            logger.error(
+                f"Error processing scenario {scenario.id} ({scenario.name}): "
+                f"invalid base inputs {scenario.base_inputs}"
+            )
+            continue
+        result = NSRSummary(*(float(nsr[key][i]) for key in NSRSummary._fields))
+        try:
+            snapshot_rows.append(
+                _process_scenario(scenario, prices, now, result, bool(crossed_up[i]))
+            )
+        except Exception as e:
+            logger.error(
+                f"Error processing scenario {scenario.id} ({scenario.name}): {e}"
+            )
+            continue
+
+    # One multi-row INSERT for every snapshot instead of one per scenario;
+    # the scenario UPDATEs share a column set and flush as one executemany
+    if snapshot_rows:
+        session.execute(insert(NsrSnapshot), snapshot_rows)
+
+
+def _is_due(
+    scenario: GoalSeekScenario, latest: Optional[NsrSnapshot], now: datetime
+) -> bool:
+    """Whether the scenario's alert_frequency interval has elapsed."""
+    # Scenarios with history but no checks yet (e.g. seeded) resume from
+    # their latest snapshot
+    last_checked_at = scenario.alert_last_checked_at
+    if latest is not None:
+        last_checked_at = last_checked_at or latest.timestamp
+    if not last_checked_at:
+        return True
 
-    # Compute NSR
-    result = compute_nsr_complete(nsr_input)
+    interval = FREQUENCY_INTERVALS.get(scenario.alert_frequency, timedelta(hours=24))
+    return now - last_checked_at >= interval
+
+
+def _previous_nsr(
+    scenario: GoalSeekScenario, latest: Optional[NsrSnapshot]
+) -> Optional[float]:
+    """The NSR from the last check, or from the latest snapshot if never checked."""
+    if scenario.last_nsr_value is not None:
+        return scenario.last_nsr_value
+    if latest is not None:
+        return latest.nsr_per_tonne
+    return None
+
+
+def _compute_scenarios_nsr(
+    scenarios: Sequence[GoalSeekScenario], prices: dict
+) -> Dict[str, np.ndarray]:
+    """
+    NSR per tonne for many scenarios at the current prices.
+
+    Scenarios are grouped by the commercial terms in their base_inputs and
+    each group is one compute_nsr_complete_batch call over its grades and
+    areas. Scenarios whose grades or terms NSRInput would reject get
+    ``valid=False``.
+    """
+    n = len(scenarios)
+    nsr = {key: np.zeros(n) for key in NSRSummary._fields}
+    nsr["valid"] = np.zeros(n, dtype=bool)
+
+    groups = defaultdict(list)
+    for i, scenario in enumerate(scenarios):
+        base = scenario.base_inputs
+        groups[tuple(base.get(key) for key in SCENARIO_TERMS)].append(i)
+
+    for terms, rows in groups.items():
+        try:
+            # Grades come from the arrays below; these only carry the terms
+            inputs = NSRInput(
+                mine="",
+                area="",
+                cu_grade=0,
+                au_grade=0,
+                ag_grade=0,
+                **prices,
+                **dict(zip(SCENARIO_TERMS, terms, strict=True)),
+            )
+        except ValidationError as e:
+            logger.error(f"Invalid commercial terms {terms}: {e}")
+            continue
+
+        bases = [scenarios[i].base_inputs for i in rows]
+        result = compute_nsr_complete_batch(
+            inputs,
+            np.array([base.get("cu_grade", 0) for base in bases], dtype=np.float64),
+            np.array([base.get("au_grade", 0) for base in bases], dtype=np.float64),
+            np.array([base.get("ag_grade", 0) for base in bases], dtype=np.float64),
+            areas=[base.get("area", "") for base in bases],
+        )
+        for key, values in nsr.items():
+            values[rows] = result[key]
+
+    return nsr
+
+
+def _process_scenario(
+    scenario: GoalSeekScenario,
+    prices: dict,
+    now: datetime,
+    result: NSRSummary,
+    crossed_up: bool,
+) -> Dict[str, Any]:
+    """
+    Update a due scenario's state and send its alert.
+
+    Returns:
+        The scenario's NsrSnapshot row, as column values for a bulk insert
+    """
+    base = scenario.base_inputs
     current_nsr = result.nsr_per_tonne
     is_viable = current_nsr >= scenario.target_nsr
 
     # Get cost values for snapshot
-    cu_tc = base.get("cu_tc") or DEFAULT_CU_TC
-    cu_rc = base.get("cu_rc") or DEFAULT_CU_RC
-    cu_freight = base.get("cu_freight") or DEFAULT_CU_FREIGHT
-
-    # Record snapshot
-    snapshot = NsrSnapshot(
-        scenario_id=scenario.id,
-        timestamp=now,
-        nsr_per_tonne=round(current_nsr, 2),
-        nsr_cu=round(result.nsr_cu, 2),
-        nsr_au=round(result.nsr_au, 2),
-        nsr_ag=round(result.nsr_ag, 2),
-        cu_price=prices["cu_price"],
-        au_price=prices["au_price"],
-        ag_price=prices["ag_price"],
-        cu_tc=cu_tc,
-        cu_rc=cu_rc,
-        cu_freight=cu_freight,
-        is_viable=is_viable,
-    )
-    session.add(snapshot)
-
-    # Check for threshold crossing (hysteresis)
-    previous_nsr = scenario.last_nsr_value
-    crossed_up = False
-
-    if previous_nsr is not None:
-        was_below = previous_nsr < scenario.target_nsr
-        is_above = current_nsr >= scenario.target_nsr
-        crossed_up = was_below and is_above
+    cu_tc = base["cu_tc"] if base.get("cu_tc") is not None else DEFAULT_CU_TC
+    cu_rc = base["cu_rc"] if base.get("cu_rc") is not None else DEFAULT_CU_RC
+    cu_freight = base["cu_freight"] if base.get("cu_freight") is not None else DEFAULT_CU_FREIGHT
+
+    # Snapshot row; _check_scenarios inserts all of them at once
+    snapshot = {
+        "scenario_id": scenario.id,
+        "timestamp": now,
+        "nsr_per_tonne": current_nsr,
+        "nsr_cu": result.nsr_cu,
+        "nsr_au": result.nsr_au,
+        "nsr_ag": result.nsr_ag,
+        "cu_price": prices["cu_price"],
+        "au_price": prices["au_price"],
+        "ag_price": prices["ag_price"],
+        "cu_tc": cu_tc,
+        "cu_rc": cu_rc,
+        "cu_freight": cu_freight,
+        "is_viable": is_viable,
+    }
 
     # Update scenario state
     scenario.last_nsr_value = current_nsr
@@ -258,6 +383,8 @@ def _process_scenario(
                 f"NSR crossed ${scenario.target_nsr}/t (now ${current_nsr:.2f}/t)"
             )
 
+    return snapshot
+
 
 def start_scheduler():
     """Start the APScheduler background scheduler."""
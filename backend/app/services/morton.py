@@ -0,0 +1,179 @@
+"""Morton (Z-order) codes for block model spatial indexing.
+
+Block centroids are quantized onto a per-import grid (origin + cell size)
+and the three 21-bit cell indices are bit-interleaved into one 63-bit
+code, which fits a signed BIGINT. Blocks that are close in space get close
+codes, so a 3D box query becomes a handful of 1-D ranges on the
+``(import_id, morton)`` index.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+BITS_PER_AXIS = 21
+MAX_CELL = (1 << BITS_PER_AXIS) - 1
+
+# Default cap on the number of ranges a box query is split into
+DEFAULT_MAX_RANGES = 32
+
+
+@dataclass(frozen=True)
+class MortonGrid:
+    """Quantization grid shared by all blocks of one import."""
+
+    origin_x: float
+    origin_y: float
+    origin_z: float
+    cell_size: float
+
+    def cell(self, value: float, origin: float) -> int:
+        """Cell index of a coordinate along one axis, clamped to the grid."""
+        index = math.floor((value - origin) / self.cell_size)
+        return min(max(index, 0), MAX_CELL)
+
+    def encode(self, x: float, y: float, z: float) -> int:
+        """Morton code of the cell containing a point."""
+        return encode(
+            self.cell(x, self.origin_x),
+            self.cell(y, self.origin_y),
+            self.cell(z, self.origin_z),
+        )
+
+    def ranges(
+        self,
+        lower: Tuple[Optional[float], Optional[float], Optional[float]],
+        upper: Tuple[Optional[float], Optional[float], Optional[float]],
+        max_ranges: int = DEFAULT_MAX_RANGES,
+    ) -> List[Tuple[int, int]]:
+        """Code ranges covering every cell that intersects a box.
+
+        A ``None`` bound leaves that side of the axis open.
+        """
+        origins = (self.origin_x, self.origin_y, self.origin_z)
+        lo = tuple(
+            0 if v is None else self.cell(v, o) for v, o in zip(lower, origins, strict=True)
+        )
+        hi = tuple(
+            MAX_CELL if v is None else self.cell(v, o)
+            for v, o in zip(upper, origins, strict=True)
+        )
+        return box_ranges(lo, hi, max_ranges)
+
+
+def _spread(v: int) -> int:
+    """Insert two zero bits between each of the low 21 bits of v."""
+    v &= MAX_CELL
+    v = (v | v << 32) & 0x1F00000000FFFF
+    v = (v | v << 16) & 0x1F0000FF0000FF
+    v = (v | v << 8) & 0x100F00F00F00F00F
+    v = (v | v << 4) & 0x10C30C30C30C30C3
+    v = (v | v << 2) & 0x1249249249249249
+    return v
+
+
+def encode(ix: int, iy: int, iz: int) -> int:
+    """Interleave three cell indices into a Morton code (x in the lowest bit)."""
+    return _spread(ix) | _spread(iy) << 1 | _spread(iz) << 2
+
+
+def grid_for_blocks(rows: Iterable[Dict[str, Any]]) -> Optional[MortonGrid]:
+    """Choose a grid for parsed block rows.
+
+    The origin is the minimum centroid on each axis. The cell size is the
+    smallest block dimension in the model (1.0 if none is given), widened
+    if needed so the whole extent fits in 21 bits per axis.
+    """
+    rows = list(rows)
+    if not rows:
+        return None
+
+    mins = [min(r[a] for r in rows) for a in ("x", "y", "z")]
+    maxs = [max(r[a] for r in rows) for a in ("x", "y", "z")]
+    sizes = [
+        r[d] for r in rows for d in ("dx", "dy", "dz")
+        if r[d] is not None and r[d] > 0
+    ]
+    cell_size = min(sizes) if sizes else 1.0
+
+    extent = max(hi - lo for lo, hi in zip(mins, maxs, strict=True))
+    cell_size = max(cell_size, extent / MAX_CELL)
+    return MortonGrid(mins[0], mins[1], mins[2], cell_size)
+
+
+def box_ranges(
+    lo: Tuple[int, int, int],
+    hi: Tuple[int, int, int],
+    max_ranges: int = DEFAULT_MAX_RANGES,
+) -> List[Tuple[int, int]]:
+    """Split an inclusive cell box into sorted, merged Morton code ranges.
+
+    Walks the implicit octree breadth first: octants inside the box become
+    one range each, octants outside are dropped and straddling octants are
+    split further. Once splitting would exceed ``max_ranges``, straddling
+    octants are emitted whole, so the result may cover a few cells outside
+    the box; callers still filter on the exact coordinates.
+    """
+    ranges: List[Tuple[int, int]] = []
+    frontier = [(0, 0, 0, BITS_PER_AXIS)]
+
+    while frontier:
+        inside: List[Tuple[int, int]] = []
+        next_frontier = []
+        for x0, y0, z0, level in frontier:
+            half = 1 << (level - 1)
+            for octant in range(8):
+                child = (
+                    x0 + (half if octant & 1 else 0),
+                    y0 + (half if octant & 2 else 0),
+                    z0 + (half if octant & 4 else 0),
+                    level - 1,
+                )
+                overlap = _classify(child, lo, hi)
+                if overlap == "inside":
+                    inside.append(_node_range(child))
+                elif overlap == "partial":
+                    next_frontier.append(child)
+
+        candidate = _merge(ranges + inside + [_node_range(n) for n in next_frontier])
+        if len(candidate) > max_ranges:
+            # Splitting further would exceed the budget: keep the octants whole
+            return _merge(ranges + [_node_range(n) for n in frontier])
+        ranges = _merge(ranges + inside)
+        frontier = next_frontier
+
+    return ranges
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sort ranges and join overlapping or adjacent ones."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _node_range(node: Tuple[int, int, int, int]) -> Tuple[int, int]:
+    x0, y0, z0, level = node
+    start = encode(x0, y0, z0)
+    return start, start + (1 << (3 * level)) - 1
+
+
+def _classify(
+    node: Tuple[int, int, int, int],
+    lo: Tuple[int, int, int],
+    hi: Tuple[int, int, int],
+) -> str:
+    x0, y0, z0, level = node
+    size = 1 << level
+    inside = True
+    for start, box_lo, box_hi in zip((x0, y0, z0), lo, hi, strict=True):
+        end = start + size - 1
+        if end < box_lo or start > box_hi:
+            return "outside"
+        if start < box_lo or end > box_hi:
+            inside = False
+    return "inside" if inside else "partial"
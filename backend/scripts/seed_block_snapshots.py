@@ -10,12 +10,14 @@ Usage:
 import uuid
 from datetime import datetime, timezone, timedelta
 
+import numpy as np
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.config import get_settings
+from app.models.block_model import pack_floats
 from app.nsr_engine.models import NSRInput
-from app.nsr_engine.calculations import compute_nsr_complete
+from app.nsr_engine.calculations import compute_nsr_complete_batch, get_area_ids
 
 settings = get_settings()
 database_url = settings.database_url
@@ -76,6 +78,41 @@ AG_PRICE_MONTHLY = {
 CUTOFF_COST = 45.0  # $/t
 
 
+def insert_batch(session, import_id, calc_date, prices, results):
+    """Insert one snapshot batch row: {block_id: (nsr, nsr_cu, nsr_au, nsr_ag)}."""
+    ids = sorted(results, key=lambda b: uuid.UUID(str(b)))
+    columns = list(zip(*(results[b] for b in ids), strict=True))
+    session.execute(
+        text("""
+            INSERT INTO block_nsr_snapshot_batches
+                (id, import_id, calculated_at,
+                 cu_price, au_price, ag_price, cutoff_cost,
+                 block_count, block_ids,
+                 nsr_per_tonne, nsr_cu, nsr_au, nsr_ag)
+            VALUES
+                (:id, :iid, :calc,
+                 :cup, :aup, :agp, :cutoff,
+                 :count, :ids,
+                 :nsr, :ncu, :nau, :nag)
+        """),
+        {
+            "id": uuid.uuid4(),
+            "iid": import_id,
+            "calc": calc_date,
+            "cup": prices[0],
+            "aup": prices[1],
+            "agp": prices[2],
+            "cutoff": CUTOFF_COST,
+            "count": len(ids),
+            "ids": b"".join(uuid.UUID(str(b)).bytes for b in ids),
+            "nsr": pack_floats(columns[0]),
+            "ncu": pack_floats(columns[1]),
+            "nau": pack_floats(columns[2]),
+            "nag": pack_floats(columns[3]),
+        },
+    )
+
+
 def main():
     session = Session()
 
@@ -121,15 +158,23 @@ def main():
 
     print(f"Blocks: {len(blocks)}")
 
-    # Delete any existing snapshots for these blocks
-    block_ids = [b[0] for b in blocks]
+    # Delete any existing snapshots for this import
     session.execute(
-        text("DELETE FROM block_nsr_snapshots WHERE block_id = ANY(:ids)"),
-        {"ids": block_ids},
+        text("DELETE FROM block_nsr_snapshot_batches WHERE import_id = :iid"),
+        {"iid": import_id},
     )
     session.commit()
     print("Cleared existing snapshots.")
 
+    # Block attributes don't change between months: build the arrays once
+    block_ids = [b[0] for b in blocks]
+    cu_grades = np.array(
+        [np.nan if b[1] is None else b[1] for b in blocks], dtype=np.float64
+    )
+    au_grades = np.array([b[2] or 0.0 for b in blocks], dtype=np.float64)
+    ag_grades = np.array([b[3] or 0.0 for b in blocks], dtype=np.float64)
+    areas = get_area_ids([b[5] or mine_name for b in blocks])
+
     # Generate snapshots for each month
     total_inserted = 0
     months = sorted(CU_PRICE_MONTHLY.keys())
@@ -145,90 +190,55 @@ def main():
 
         print(f"\n{month_key}: Cu=${cu_price}/lb, Au=${au_price}/oz, Ag=${ag_price}/oz")
 
-        viable_count = 0
-        marginal_count = 0
-        inviable_count = 0
-
-        for block in blocks:
-            block_id, cu_grade, au_grade, ag_grade, tonnage, zone = block
-            au_grade = au_grade or 0.0
-            ag_grade = ag_grade or 0.0
-
-            try:
-                nsr_input = NSRInput(
-                    mine=mine_name,
-                    area=zone or mine_name,
-                    cu_grade=cu_grade,
-                    au_grade=au_grade,
-                    ag_grade=ag_grade,
-                    ore_tonnage=tonnage or 1.0,
-                    cu_price=cu_price,
-                    au_price=au_price,
-                    ag_price=ag_price,
-                    cu_payability=ct.get("cu_payability"),
-                    cu_tc=ct.get("cu_tc"),
-                    cu_rc=ct.get("cu_rc"),
-                    cu_freight=ct.get("cu_freight"),
-                    au_payability=ct.get("au_payability"),
-                    au_rc=ct.get("au_rc"),
-                    ag_payability=ct.get("ag_payability"),
-                    ag_rc=ct.get("ag_rc"),
-                    cu_conc_grade=ct.get("cu_conc_grade"),
-                    mine_dilution=ct.get("mine_dilution", 0.14),
-                    ore_recovery=ct.get("ore_recovery", 0.98),
-                )
-                result = compute_nsr_complete(nsr_input)
-                nsr = result.nsr_per_tonne
-                nsr_cu = result.nsr_cu
-                nsr_au = result.nsr_au
-                nsr_ag = result.nsr_ag
-            except Exception as exc:
-                print(f"  WARN: block {block_id} failed: {exc}")
-                nsr = nsr_cu = nsr_au = nsr_ag = 0.0
-
-            margin = nsr - CUTOFF_COST
-            is_viable = nsr >= CUTOFF_COST
-
-            if is_viable:
-                if nsr <= CUTOFF_COST * 1.1:
-                    marginal_count += 1
-                else:
-                    viable_count += 1
-            else:
-                inviable_count += 1
-
-            snap_id = uuid.uuid4()
-            session.execute(
-                text("""
-                    INSERT INTO block_nsr_snapshots
-                        (id, block_id, calculated_at, nsr_per_tonne,
-                         nsr_cu, nsr_au, nsr_ag,
-                         cu_price, au_price, ag_price,
-                         cutoff_cost, is_viable, margin)
-                    VALUES
-                        (:id, :bid, :calc, :nsr,
-                         :ncu, :nau, :nag,
-                         :cup, :aup, :agp,
-                         :cutoff, :viable, :margin)
-                """),
-                {
-                    "id": snap_id,
-                    "bid": block_id,
-                    "calc": calc_date,
-                    "nsr": round(nsr, 2),
-                    "ncu": round(nsr_cu, 2),
-                    "nau": round(nsr_au, 2),
-                    "nag": round(nsr_ag, 2),
-                    "cup": cu_price,
-                    "aup": au_price,
-                    "agp": ag_price,
-                    "cutoff": CUTOFF_COST,
-                    "viable": is_viable,
-                    "margin": round(margin, 2),
-                },
-            )
-            total_inserted += 1
-
+        # Prices and commercial terms shared by every block; grades are
+        # placeholders, the batch call takes them as arrays
+        terms = NSRInput(
+            mine=mine_name,
+            area=mine_name,
+            cu_grade=0.0,
+            au_grade=0.0,
+            ag_grade=0.0,
+            cu_price=cu_price,
+            au_price=au_price,
+            ag_price=ag_price,
+            cu_payability=ct.get("cu_payability"),
+            cu_tc=ct.get("cu_tc"),
+            cu_rc=ct.get("cu_rc"),
+            cu_freight=ct.get("cu_freight"),
+            au_payability=ct.get("au_payability"),
+            au_rc=ct.get("au_rc"),
+            ag_payability=ct.get("ag_payability"),
+            ag_rc=ct.get("ag_rc"),
+            cu_conc_grade=ct.get("cu_conc_grade"),
+            mine_dilution=ct.get("mine_dilution", 0.14),
+            ore_recovery=ct.get("ore_recovery", 0.98),
+        )
+        nsr = compute_nsr_complete_batch(terms, cu_grades, au_grades, ag_grades, areas)
+        invalid = int(len(blocks) - nsr["valid"].sum())
+        if invalid:
+            print(f"  WARN: {invalid} blocks have invalid grades; NSR set to 0")
+
+        nsr_per_tonne = nsr["nsr_per_tonne"]
+        is_viable = nsr_per_tonne >= CUTOFF_COST
+        marginal = is_viable & (nsr_per_tonne <= CUTOFF_COST * 1.1)
+        viable_count = int((is_viable & ~marginal).sum())
+        marginal_count = int(marginal.sum())
+        inviable_count = int((~is_viable).sum())
+
+        results = dict(zip(
+            block_ids,
+            zip(
+                nsr_per_tonne.tolist(),
+                nsr["nsr_cu"].tolist(),
+                nsr["nsr_au"].tolist(),
+                nsr["nsr_ag"].tolist(),
+                strict=True,
+            ),
+            strict=True,
+        ))
+        total_inserted += len(results)
+
+        insert_batch(session, import_id, calc_date, (cu_price, au_price, ag_price), results)
         print(f"  Viable: {viable_count}, Marginal: {marginal_count}, Inviable: {inviable_count}")
 
     session.commit()
@@ -9,7 +9,9 @@ Usage:
 
 import json
 import os
+import sys
 import uuid
+from array import array
 from datetime import datetime, timezone
 
 from sqlalchemy import create_engine, text
@@ -102,15 +104,20 @@ def cu_recovery(cu_grade_pct: float, area: str) -> float:
 
 def compute_nsr(cu_grade, au_grade, ag_grade, area, tonnage, ct,
                 cu_price, au_price, ag_price):
-    cu_pay = ct.get("cu_payability") or DEFAULT_CU_PAYABILITY
-    cu_tc = ct.get("cu_tc") or DEFAULT_CU_TC
-    cu_rc = ct.get("cu_rc") or DEFAULT_CU_RC
-    cu_frt = ct.get("cu_freight") or DEFAULT_CU_FREIGHT
-    au_pay = ct.get("au_payability") or DEFAULT_AU_PAYABILITY
-    au_rc = ct.get("au_rc") or DEFAULT_AU_RC
-    ag_pay = ct.get("ag_payability") or DEFAULT_AG_PAYABILITY
-    ag_rc = ct.get("ag_rc") or DEFAULT_AG_RC
-    cu_cg = ct.get("cu_conc_grade") or DEFAULT_CU_CONC_GRADE
+    def term(key, default):
+        # An explicit 0 is a real term (e.g. no freight), not "unset"
+        value = ct.get(key)
+        return default if value is None else value
+
+    cu_pay = term("cu_payability", DEFAULT_CU_PAYABILITY)
+    cu_tc = term("cu_tc", DEFAULT_CU_TC)
+    cu_rc = term("cu_rc", DEFAULT_CU_RC)
+    cu_frt = term("cu_freight", DEFAULT_CU_FREIGHT)
+    au_pay = term("au_payability", DEFAULT_AU_PAYABILITY)
+    au_rc = term("au_rc", DEFAULT_AU_RC)
+    ag_pay = term("ag_payability", DEFAULT_AG_PAYABILITY)
+    ag_rc = term("ag_rc", DEFAULT_AG_RC)
+    cu_cg = term("cu_conc_grade", DEFAULT_CU_CONC_GRADE)
 
     rec = cu_recovery(cu_grade, area)
     conc_ratio = (cu_grade / 100.0) * rec / (cu_cg / 100.0)
@@ -134,6 +141,42 @@ def compute_nsr(cu_grade, au_grade, ag_grade, area, tonnage, ct,
     return round(nsr_total, 2), round(nsr_cu, 2), round(nsr_au, 2), round(nsr_ag, 2)
 
 
+# ── Snapshot batches ──────────────────────────────────────────
+def pack_floats(values) -> bytes:
+    """Little-endian float64, as stored in block_nsr_snapshot_batches."""
+    packed = array("d", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def insert_batch(session, import_id, calc_date, prices, results):
+    """Insert one snapshot batch row: {block_id: (nsr, nsr_cu, nsr_au, nsr_ag)}."""
+    ids = sorted(results, key=lambda b: uuid.UUID(str(b)))
+    columns = list(zip(*(results[b] for b in ids), strict=True))
+    session.execute(
+        text("""
+            INSERT INTO block_nsr_snapshot_batches
+                (id, import_id, calculated_at,
+                 cu_price, au_price, ag_price, cutoff_cost,
+                 block_count, block_ids,
+                 nsr_per_tonne, nsr_cu, nsr_au, nsr_ag)
+            VALUES (:id, :iid, :calc,
+                    :cup, :aup, :agp, :cutoff,
+                    :count, :ids,
+                    :nsr, :ncu, :nau, :nag)
+        """),
+        {
+            "id": uuid.uuid4(), "iid": import_id, "calc": calc_date,
+            "cup": prices[0], "aup": prices[1], "agp": prices[2],
+            "cutoff": CUTOFF_COST, "count": len(ids),
+            "ids": b"".join(uuid.UUID(str(b)).bytes for b in ids),
+            "nsr": pack_floats(columns[0]), "ncu": pack_floats(columns[1]),
+            "nau": pack_floats(columns[2]), "nag": pack_floats(columns[3]),
+        },
+    )
+
+
 # ── Main ──────────────────────────────────────────────────────
 def main():
     session = Session()
@@ -169,10 +212,9 @@ def main():
     ).fetchall()
     print(f"Blocks: {len(blocks)}")
 
-    block_ids = [b[0] for b in blocks]
     session.execute(
-        text("DELETE FROM block_nsr_snapshots WHERE block_id = ANY(:ids)"),
-        {"ids": block_ids},
+        text("DELETE FROM block_nsr_snapshot_batches WHERE import_id = :iid"),
+        {"iid": import_id},
     )
     session.commit()
     print("Cleared existing snapshots.")
@@ -188,6 +230,7 @@ def main():
         print(f"\n{month_key}: Cu=${cu_p}/lb  Au=${au_p}/oz  Ag=${ag_p}/oz")
 
         v, m, inv = 0, 0, 0
+        results = {}
         for block in blocks:
             bid, cu_g, au_g, ag_g, ton, zone = block
             au_g = au_g or 0.0
@@ -201,7 +244,6 @@ def main():
                 print(f"  WARN: block {bid} failed: {exc}")
                 nsr = nsr_cu = nsr_au = nsr_ag = 0.0
 
-            margin = nsr - CUTOFF_COST
             is_viable = nsr >= CUTOFF_COST
             if is_viable:
                 if nsr <= CUTOFF_COST * 1.1:
@@ -211,28 +253,10 @@ def main():
             else:
                 inv += 1
 
-            session.execute(
-                text("""
-                    INSERT INTO block_nsr_snapshots
-                        (id, block_id, calculated_at, nsr_per_tonne,
-                         nsr_cu, nsr_au, nsr_ag,
-                         cu_price, au_price, ag_price,
-                         cutoff_cost, is_viable, margin)
-                    VALUES (:id, :bid, :calc, :nsr,
-                            :ncu, :nau, :nag,
-                            :cup, :aup, :agp,
-                            :cutoff, :viable, :margin)
-                """),
-                {
-                    "id": uuid.uuid4(), "bid": bid, "calc": calc_date,
-                    "nsr": nsr, "ncu": nsr_cu, "nau": nsr_au, "nag": nsr_ag,
-                    "cup": cu_p, "aup": au_p, "agp": ag_p,
-                    "cutoff": CUTOFF_COST, "viable": is_viable,
-                    "margin": round(margin, 2),
-                },
-            )
+            results[bid] = (nsr, nsr_cu, nsr_au, nsr_ag)
             total_inserted += 1
 
+        insert_batch(session, import_id, calc_date, (cu_p, au_p, ag_p), results)
         print(f"  Viable: {v}  Marginal: {m}  Inviable: {inv}")
 
     session.commit()
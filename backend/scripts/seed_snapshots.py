@@ -14,12 +14,14 @@ import uuid
 import random
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, insert, text
 from sqlalchemy.orm import sessionmaker
 
 from app.config import get_settings
+from app.db.partitions import ensure_monthly_partitions
+from app.models.goal_seek import NsrSnapshot
 from app.nsr_engine.models import NSRInput
-from app.nsr_engine.calculations import compute_nsr_complete
+from app.nsr_engine.calculations import compute_nsr_summary
 from app.nsr_engine.constants import DEFAULT_CU_TC, DEFAULT_CU_RC, DEFAULT_CU_FREIGHT
 
 # ── Real historical prices (monthly averages from market data) ──
@@ -152,9 +154,9 @@ def main():
                 cu_grade=1.4, au_grade=0.23, ag_grade=2.33,
                 cu_price=cu_price, au_price=au_price, ag_price=ag_price,
             )
-            result = compute_nsr_complete(inp)
+            result = compute_nsr_summary(inp)
             daily_data.append({
-                "ts": current.isoformat(),
+                "ts": current,
                 "nsr": result.nsr_per_tonne,
                 "nsr_cu": result.nsr_cu,
                 "nsr_au": result.nsr_au,
@@ -167,6 +169,9 @@ def main():
             current += timedelta(days=1)
         print(f"Computed {len(daily_data)} daily data points")
 
+        # nsr_snapshots is partitioned by month
+        ensure_monthly_partitions(session, "nsr_snapshots", start_date, end_date)
+
         # Create scenario + snapshots for each user
         for user_id, user_email in users:
             scenario_id = uuid.uuid4()
@@ -175,7 +180,7 @@ def main():
                     INSERT INTO goal_seek_scenarios 
                     (id, user_id, name, base_inputs, target_variable, target_nsr, 
                      threshold_value, alert_enabled, alert_frequency, created_at, updated_at)
-                    VALUES (:id, :user_id, :name, CAST(:base_inputs AS json), :target_variable, 
+                    VALUES (:id, :user_id, :name, CAST(:base_inputs AS jsonb), :target_variable, 
                             :target_nsr, :threshold_value, false, 'daily', now(), now())
                 """),
                 {
@@ -189,32 +194,28 @@ def main():
                 },
             )
 
-            for day in daily_data:
-                session.execute(
-                    text("""
-                        INSERT INTO nsr_snapshots
-                        (id, scenario_id, timestamp, nsr_per_tonne, nsr_cu, nsr_au, nsr_ag,
-                         cu_price, au_price, ag_price, cu_tc, cu_rc, cu_freight, is_viable)
-                        VALUES (:id, :scenario_id, :ts, :nsr, :nsr_cu, :nsr_au, :nsr_ag,
-                                :cu, :au, :ag, :tc, :rc, :freight, :viable)
-                    """),
+            # One multi-row INSERT batch instead of a round trip per day
+            session.execute(
+                insert(NsrSnapshot),
+                [
                     {
-                        "id": str(uuid.uuid4()),
-                        "scenario_id": str(scenario_id),
-                        "ts": day["ts"],
-                        "nsr": day["nsr"],
+                        "scenario_id": scenario_id,
+                        "timestamp": day["ts"],
+                        "nsr_per_tonne": day["nsr"],
                         "nsr_cu": day["nsr_cu"],
                         "nsr_au": day["nsr_au"],
                         "nsr_ag": day["nsr_ag"],
-                        "cu": day["cu"],
-                        "au": day["au"],
-                        "ag": day["ag"],
-                        "tc": DEFAULT_CU_TC,
-                        "rc": DEFAULT_CU_RC,
-                        "freight": DEFAULT_CU_FREIGHT,
-                        "viable": day["viable"],
-                    },
-                )
+                        "cu_price": day["cu"],
+                        "au_price": day["au"],
+                        "ag_price": day["ag"],
+                        "cu_tc": DEFAULT_CU_TC,
+                        "cu_rc": DEFAULT_CU_RC,
+                        "cu_freight": DEFAULT_CU_FREIGHT,
+                        "is_viable": day["viable"],
+                    }
+                    for day in daily_data
+                ],
+            )
             print(f"Created scenario + {len(daily_data)} snapshots for user {user_email}")
 
         session.commit()
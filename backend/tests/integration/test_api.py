@@ -1,7 +1,12 @@
 """Integration tests for API endpoints."""
 
+import uuid
+
 import pytest
 
+from app.auth.dependencies import get_current_user
+from app.main import app
+
 
 class TestHealthEndpoint:
     """Tests for /health endpoint."""
@@ -93,3 +98,21 @@ class TestComputeNSREndpoint:
         assert data["inputs_used"]["mine"] == sample_nsr_input["mine"]
         assert data["inputs_used"]["area"] == sample_nsr_input["area"]
         assert data["inputs_used"]["cu_grade"] == sample_nsr_input["cu_grade"]
+
+
+class TestListBlocksEndpoint:
+    """Tests for /api/v1/blocks/imports/{import_id}/blocks."""
+
+    def test_inverted_box_is_rejected(self, client):
+        """Test a lower bound above its upper bound returns 422."""
+        app.dependency_overrides[get_current_user] = lambda: None
+        try:
+            response = client.get(
+                f"/api/v1/blocks/imports/{uuid.uuid4()}/blocks",
+                params={"x_min": 10.0, "x_max": 5.0},
+            )
+        finally:
+            app.dependency_overrides.pop(get_current_user)
+
+        assert response.status_code == 422
+        assert "x_min" in response.text
@@ -0,0 +1,183 @@
+"""Unit tests for authentication helpers."""
+
+import asyncio
+import uuid
+from datetime import timedelta
+
+import bcrypt
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.auth import dependencies, router
+from app.auth.jwt import create_access_token, issue_token_pair, verify_token
+from app.auth.oauth_state import STATE_TTL_SECONDS, mint_state, verify_state
+from app.auth.passwords import (
+    check_user_password,
+    hash_password,
+    verify_and_update_password,
+    verify_password,
+)
+from app.models.user import User
+
+
+class TestPasswordHashing:
+    """Tests for the pooled password hashing helpers."""
+
+    def test_hash_and_verify_roundtrip(self):
+        """Test a hashed password verifies and a wrong one does not."""
+        async def run():
+            password_hash = await hash_password("secret123")
+            assert password_hash != "secret123"
+            assert await verify_password("secret123", password_hash)
+            assert not await verify_password("wrong", password_hash)
+
+        asyncio.run(run())
+
+    def test_new_hashes_use_argon2id(self):
+        """Test new hashes are argon2id."""
+        password_hash = asyncio.run(hash_password("secret123"))
+        assert password_hash.startswith("$argon2id$")
+
+    def test_legacy_bcrypt_hash_is_upgraded(self):
+        """Test a bcrypt hash still verifies and is flagged for rehash."""
+        legacy = bcrypt.hashpw(b"secret123", bcrypt.gensalt(4)).decode()
+        valid, new_hash = asyncio.run(verify_and_update_password("secret123", legacy))
+        assert valid
+        assert new_hash is not None and new_hash.startswith("$argon2id$")
+
+    def test_cached_check_requires_matching_hash(self):
+        """Test a cached login is not reused once the stored hash changes."""
+        async def run():
+            user_id = uuid.uuid4()
+            old_hash = await hash_password("secret123")
+            assert (await check_user_password(user_id, "secret123", old_hash))[0]
+            assert (await check_user_password(user_id, "secret123", old_hash))[0]
+
+            new_hash = await hash_password("other456")
+            assert not (await check_user_password(user_id, "secret123", new_hash))[0]
+            assert not (await check_user_password(user_id, "wrong", old_hash))[0]
+
+        asyncio.run(run())
+
+
+class TestVerifyToken:
+    """Tests for JWT verification."""
+
+    def test_valid_token_verifies_repeatedly(self):
+        """Test a token verifies on both the decode and the cached path."""
+        token = create_access_token({"sub": "user-1"})
+        assert verify_token(token, "access")["sub"] == "user-1"
+        assert verify_token(token, "access")["sub"] == "user-1"
+
+    def test_wrong_type_rejected_from_cache(self):
+        """Test a cached access token is still rejected as a refresh token."""
+        token = create_access_token({"sub": "user-1"})
+        assert verify_token(token, "access") is not None
+        assert verify_token(token, "refresh") is None
+
+    def test_token_pair_has_matching_types(self):
+        """Test issue_token_pair returns an access and a refresh token for the same user."""
+        user_id = uuid.uuid4()
+        access_token, refresh_token = issue_token_pair(user_id, "a@example.com")
+
+        access = verify_token(access_token, "access")
+        refresh = verify_token(refresh_token, "refresh")
+        assert access["sub"] == refresh["sub"] == str(user_id)
+        assert access["email"] == "a@example.com"
+        assert access["exp"] < refresh["exp"]
+        assert verify_token(refresh_token, "access") is None
+
+    def test_expired_token_rejected(self):
+        """Test an expired token is rejected."""
+        token = create_access_token({"sub": "user-1"}, timedelta(seconds=-1))
+        assert verify_token(token, "access") is None
+
+    def test_tampered_token_rejected(self):
+        """Test a token with a modified signature is rejected."""
+        token = create_access_token({"sub": "user-1"})
+        assert verify_token(token[:-2] + "xx", "access") is None
+
+
+class TestOAuthState:
+    """Tests for signed OAuth state tokens."""
+
+    def test_fresh_state_verifies(self):
+        """Test a newly minted state verifies and states are unique."""
+        state = mint_state()
+        assert verify_state(state)
+        assert mint_state() != state
+
+    def test_expired_state_rejected(self):
+        """Test a state older than the TTL is rejected."""
+        state = mint_state(now=1_000_000)
+        assert verify_state(state, now=1_000_000 + STATE_TTL_SECONDS)
+        assert not verify_state(state, now=1_000_000 + STATE_TTL_SECONDS + 1)
+
+    def test_tampered_state_rejected(self):
+        """Test changing any part of the state invalidates it."""
+        state = mint_state()
+        middle = len(state) // 2
+        flipped = "A" if state[middle] != "A" else "B"
+        assert not verify_state(state[:middle] + flipped + state[middle + 1:])
+
+    def test_malformed_state_rejected(self):
+        """Test garbage and truncated states are rejected."""
+        assert not verify_state("")
+        assert not verify_state("not-a-state!")
+        assert not verify_state(mint_state()[:-4])
+
+
+class TestUserCacheInvalidation:
+    """Tests for evicting cached users when they are written."""
+
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://")
+        User.metadata.create_all(engine, tables=[User.__table__])
+        with Session(engine) as session:
+            yield session
+
+    def _cached_users(self, session, count):
+        users = [
+            User(id=uuid.uuid4(), email=f"user{i}@example.com", name=f"User {i}")
+            for i in range(count)
+        ]
+        session.add_all(users)
+        session.commit()
+        for user in users:
+            dependencies._user_cache[user.id] = user
+        return users
+
+    def test_commit_evicts_updated_user(self, session):
+        """Test an ORM update evicts only that user, and only on commit."""
+        changed, untouched = self._cached_users(session, 2)
+
+        changed.is_admin = True
+        session.flush()
+        assert changed.id in dependencies._user_cache
+
+        session.commit()
+        assert changed.id not in dependencies._user_cache
+        assert untouched.id in dependencies._user_cache
+        dependencies.invalidate_user_cache(untouched.id)
+
+
+class TestAuthErrors:
+    """Tests for the 401s raised by failed logins and bad credentials."""
+
+    def test_invalid_credentials_is_fresh_per_raise(self):
+        """Test each failure gets its own exception, so tracebacks don't pile up."""
+        first, second = router._invalid_credentials(), router._invalid_credentials()
+
+        assert first is not second
+        assert first.status_code == second.status_code == 401
+        assert first.detail == second.detail
+
+    def test_credentials_exception_is_fresh_per_raise(self):
+        """Test every rejected token gets its own exception."""
+        first = dependencies._credentials_exception()
+
+        assert first is not dependencies._credentials_exception()
+        assert first.status_code == 401
+        assert first.headers == {"WWW-Authenticate": "Bearer"}
@@ -0,0 +1,45 @@
+"""Tests for packed block NSR snapshot batches."""
+
+import uuid
+
+from app.models.block_model import BlockNsrSnapshotBatch, pack_floats, unpack_floats
+
+
+def _batch(results, cutoff_cost=25.0):
+    return BlockNsrSnapshotBatch.from_results(results, cutoff_cost=cutoff_cost)
+
+
+class TestSnapshotBatch:
+    """Tests for encoding and reading back per-block results."""
+
+    def test_float_packing_round_trips(self):
+        values = [0.0, -1.5, 1e300, 123.456]
+        assert list(unpack_floats(pack_floats(values))) == values
+        assert len(pack_floats(values)) == 8 * len(values)
+
+    def test_results_round_trip_with_derived_viability(self):
+        ids = [uuid.uuid4() for _ in range(50)]
+        results = {b: (float(i), i * 0.5, i * 0.25, i * 0.125) for i, b in enumerate(ids)}
+        decoded = _batch(results).results()
+
+        assert set(decoded) == set(ids)
+        for i, block_id in enumerate(ids):
+            snap = decoded[block_id]
+            assert (snap.nsr_per_tonne, snap.nsr_cu, snap.nsr_au, snap.nsr_ag) == results[block_id]
+            assert snap.is_viable == (i >= 25)
+            assert snap.margin == i - 25.0
+
+    def test_lookup_finds_requested_blocks_only(self):
+        ids = [uuid.uuid4() for _ in range(200)]
+        batch = _batch({b: (float(i), 0.0, 0.0, 0.0) for i, b in enumerate(ids)})
+        missing = uuid.uuid4()
+
+        found = batch.lookup([ids[0], ids[137], ids[-1], missing])
+        assert set(found) == {ids[0], ids[137], ids[-1]}
+        assert found[ids[137]].nsr_per_tonne == 137.0
+
+    def test_empty_batch(self):
+        batch = _batch({})
+        assert batch.block_count == 0
+        assert batch.results() == {}
+        assert batch.lookup([uuid.uuid4()]) == {}
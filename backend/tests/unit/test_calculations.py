@@ -1,5 +1,6 @@
 """Unit tests for NSR calculation functions."""
 
+import numpy as np
 import pytest
 from app.nsr_engine.calculations import (
     compute_cu_recovery,
@@ -8,8 +9,14 @@ from app.nsr_engine.calculations import (
     compute_conc_price_cu,
     compute_conc_price_au,
     compute_conc_price_ag,
+    compute_deductions,
     compute_nsr_complete,
+    compute_nsr_complete_batch,
+    compute_nsr_summary,
+    get_area_ids,
+    _nsr_terms_cached,
 )
+from app.nsr_engine.constants import RECOVERY_PARAMS
 from app.nsr_engine.models import NSRInput
 
 
@@ -47,6 +54,18 @@ class TestComputeCuRecovery:
         # 2.8286 × 0 + 92.584 = 92.584%
         assert recovery == pytest.approx(0.92584, rel=0.001)
 
+    def test_recovery_params_are_read_only(self):
+        """Test the recovery table can't drift from the lookups built from it."""
+        with pytest.raises(TypeError):
+            RECOVERY_PARAMS["Vermelhos Sul"]["a"] = 0.0
+        with pytest.raises(TypeError):
+            RECOVERY_PARAMS["New Area"] = {"a": 1.0, "b": 90.0, "fixed": None}
+
+    @pytest.mark.parametrize("area", [*RECOVERY_PARAMS, "Unknown Area"])
+    def test_recovery_is_positive_at_zero_grade(self, area):
+        """Test no area has zero recovery (the cascade divides by it)."""
+        assert compute_cu_recovery(0.0, area) > 0
+
 
 class TestComputePayableMetal:
     """Tests for compute_payable_metal function."""
@@ -146,6 +165,22 @@ class TestComputeConcPriceCu:
         assert 1000 < price < 1500
 
 
+class TestComputeDeductions:
+    """Tests for compute_deductions function."""
+
+    def test_breakdown_and_total(self):
+        """Test per-tonne charges scale with tonnage and sum into the total."""
+        deductions = compute_deductions(
+            tc=40.0, rc_cu=100.0, rc_au=20.0, rc_ag=5.0,
+            freight=84.0, penalties=2.0, conc_tonnage=10.0,
+        )
+        assert deductions.tc == 400.0
+        assert deductions.freight == 840.0
+        assert deductions.penalties == 20.0
+        assert deductions.total == pytest.approx(400 + 100 + 20 + 5 + 840 + 20)
+        assert deductions._asdict()["total"] == deductions.total
+
+
 class TestComputeNSRComplete:
     """Tests for complete NSR calculation."""
 
@@ -219,3 +254,143 @@ class TestComputeNSRComplete:
         assert result.inputs_used["mine"] == "Vermelhos UG"
         assert result.inputs_used["area"] == "Vermelhos Sul"
         assert result.inputs_used["cu_grade"] == 1.4
+
+    def test_explicit_zero_terms_are_used(self):
+        """Test a 0 commercial term is applied, not replaced by the default."""
+        base = {
+            "mine": "Vermelhos UG", "area": "Vermelhos Sul",
+            "cu_grade": 1.4, "au_grade": 0.23, "ag_grade": 2.33,
+        }
+
+        default = compute_nsr_complete(NSRInput(**base))
+        no_freight = compute_nsr_complete(NSRInput(**base, cu_tc=0.0, cu_freight=0.0))
+
+        assert no_freight.inputs_used["cu_tc"] == 0.0
+        assert no_freight.inputs_used["cu_freight"] == 0.0
+        assert no_freight.nsr_per_tonne > default.nsr_per_tonne
+
+    def test_rejects_zero_conc_grade(self):
+        """Test a 0% concentrate grade fails validation instead of dividing by zero."""
+        with pytest.raises(ValueError):
+            NSRInput(
+                mine="Vermelhos UG", area="Vermelhos Sul",
+                cu_grade=1.4, au_grade=0.23, ag_grade=2.33, cu_conc_grade=0.0,
+            )
+
+
+class TestComputeNsrSummary:
+    """Tests for the headline-only NSR calculation."""
+
+    @pytest.mark.parametrize("cu_grade,area", [
+        (1.4, "Vermelhos Sul"),
+        (0.6, "Deepening Above - 965"),
+        (0.0, "Vermelhos Sul"),
+    ])
+    def test_matches_complete(self, cu_grade, area):
+        """Summary values equal the matching compute_nsr_complete fields."""
+        inputs = NSRInput(
+            mine="Vermelhos UG",
+            area=area,
+            cu_grade=cu_grade,
+            au_grade=0.23,
+            ag_grade=2.33,
+            cu_price=4.1,
+        )
+
+        full = compute_nsr_complete(inputs)
+        summary = compute_nsr_summary(inputs)
+
+        assert summary.nsr_per_tonne == full.nsr_per_tonne
+        assert summary.nsr_cu == full.nsr_cu
+        assert summary.nsr_au == full.nsr_au
+        assert summary.nsr_ag == full.nsr_ag
+
+    def test_repeated_inputs_hit_cache(self):
+        """Identical grades and terms reuse the cached core terms."""
+        inputs = NSRInput(
+            mine="Vermelhos UG", area="MSBSUL", cu_grade=1.1, au_grade=0.2, ag_grade=2.0
+        )
+        first = compute_nsr_summary(inputs)
+        hits = _nsr_terms_cached.cache_info().hits
+
+        assert compute_nsr_summary(inputs.model_copy()) == first
+        assert _nsr_terms_cached.cache_info().hits == hits + 1
+
+
+class TestComputeNsrCompleteBatch:
+    """Tests for the vectorized block NSR calculation."""
+
+    TERMS = NSRInput(
+        mine="Vermelhos UG",
+        area="Vermelhos Sul",
+        cu_grade=0.0,
+        au_grade=0.0,
+        ag_grade=0.0,
+        cu_price=4.5,
+        cu_tc=50.0,
+    )
+
+    def test_matches_scalar_calculation(self):
+        """Test every block matches compute_nsr_complete to the cent."""
+        cu = [0.0, 0.4, 1.4, 3.2, 12.0, 100.0]
+        au = [0.0, 0.1, 0.23, 1.5, 0.0, 2.0]
+        ag = [0.0, 1.0, 2.33, 10.0, 4.0, 0.0]
+        areas = ["Vermelhos Sul", "MSBSUL", "P1P2W", "Unknown Area", "EAST LIMB", "UG03"]
+
+        batch = compute_nsr_complete_batch(self.TERMS, cu, au, ag, areas)
+
+        for i in range(len(cu)):
+            scalar = compute_nsr_complete(self.TERMS.model_copy(update={
+                "cu_grade": cu[i], "au_grade": au[i], "ag_grade": ag[i], "area": areas[i],
+            }))
+            assert batch["nsr_per_tonne"][i] == scalar.nsr_per_tonne
+            assert batch["nsr_cu"][i] == scalar.nsr_cu
+            assert batch["nsr_au"][i] == scalar.nsr_au
+            assert batch["nsr_ag"][i] == scalar.nsr_ag
+
+    def test_defaults_to_inputs_area(self):
+        """Test blocks use inputs.area when no per-block areas are given."""
+        batch = compute_nsr_complete_batch(self.TERMS, [1.4], [0.23], [2.33])
+        assert batch["cu_recovery"][0] == pytest.approx(
+            compute_cu_recovery(1.4, "Vermelhos Sul")
+        )
+
+    def test_accepts_area_ids(self):
+        """Test ids from get_area_ids give the same results as area names."""
+        cu, au, ag = [1.4, 0.8, 2.0], [0.23, 0.1, 0.5], [2.33, 1.0, 3.0]
+        areas = ["Vermelhos Sul", "Unknown Area", "UG03"]
+
+        by_name = compute_nsr_complete_batch(self.TERMS, cu, au, ag, areas)
+        by_id = compute_nsr_complete_batch(self.TERMS, cu, au, ag, get_area_ids(areas))
+
+        for key in ("nsr_per_tonne", "cu_recovery"):
+            assert by_id[key].tolist() == by_name[key].tolist()
+
+    def test_invalid_grades_give_zero_nsr(self):
+        """Test grades NSRInput would reject are zeroed and flagged."""
+        batch = compute_nsr_complete_batch(
+            self.TERMS, [1.4, -1.0, 150.0, np.nan], [0.2] * 4, [2.0] * 4
+        )
+        assert batch["valid"].tolist() == [True, False, False, False]
+        assert batch["nsr_per_tonne"][0] > 0
+        assert batch["nsr_per_tonne"][1:].tolist() == [0.0, 0.0, 0.0]
+
+    def test_kernel_matches_numpy_path(self, monkeypatch):
+        """Test the Numba kernel gives the same results as the NumPy path."""
+        pytest.importorskip("numba")
+        import app.nsr_engine.calculations as calculations
+
+        rng = np.random.default_rng(0)
+        n = 2000
+        cu = np.where(rng.random(n) < 0.1, 0.0, rng.uniform(0, 5, n))
+        au = rng.uniform(0, 3, n)
+        ag = rng.uniform(0, 20, n)
+        areas = rng.choice(["Vermelhos Sul", "MSBSUL", "P1P2W", "UG03", "Unknown"], n)
+
+        monkeypatch.setattr(calculations, "KERNEL_MIN_BLOCKS", 0)
+        kernel = compute_nsr_complete_batch(self.TERMS, cu, au, ag, areas)
+        monkeypatch.setattr(calculations, "KERNEL_MIN_BLOCKS", n + 1)
+        numpy = compute_nsr_complete_batch(self.TERMS, cu, au, ag, areas)
+
+        for key in numpy:
+            assert np.array_equal(kernel[key], numpy[key]), key
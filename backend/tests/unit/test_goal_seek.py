@@ -0,0 +1,53 @@
+"""Unit tests for the Goal Seek solver."""
+
+import pytest
+
+from app.nsr_engine.calculations import compute_nsr_complete
+from app.nsr_engine.goal_seek import goal_seek
+from app.nsr_engine.models import NSRInput
+
+BASE = NSRInput(
+    mine="Vermelhos UG",
+    area="Vermelhos Sul",
+    cu_grade=1.4,
+    au_grade=0.23,
+    ag_grade=2.33,
+)
+
+
+class TestGoalSeek:
+    """Tests for goal_seek convergence and bounds."""
+
+    @pytest.mark.parametrize("variable", ["cu_price", "cu_grade", "cu_tc", "cu_rc"])
+    def test_threshold_reaches_target(self, variable):
+        """Test the threshold value gives the target NSR within tolerance."""
+        result = goal_seek(BASE, variable, target_nsr=120.0)
+
+        assert result.converged
+        check = compute_nsr_complete(
+            BASE.model_copy(update={variable: result.threshold_value})
+        )
+        assert check.nsr_per_tonne == pytest.approx(120.0, abs=0.011)
+
+    def test_linear_variable_converges_in_few_iterations(self):
+        """Test Newton steps solve a price (NSR is linear in it) quickly."""
+        result = goal_seek(BASE, "cu_price", target_nsr=0.0)
+
+        assert result.converged
+        assert result.iterations <= 3
+
+    def test_reports_bound_when_target_out_of_range(self):
+        """Test an unreachable target returns the nearest bound."""
+        result = goal_seek(BASE, "au_grade", target_nsr=120.0)
+
+        assert not result.converged
+        assert result.bound_hit == "lower"
+        assert result.threshold_value == 0.001
+
+    @pytest.mark.parametrize("target, bound", [(1000.0, "lower"), (-50.0, "upper")])
+    def test_cost_variable_reports_nearest_bound(self, target, bound):
+        """Test a cost variable (NSR falls as it rises) hits the right bound."""
+        result = goal_seek(BASE, "cu_tc", target_nsr=target)
+
+        assert not result.converged
+        assert result.bound_hit == bound
@@ -0,0 +1,149 @@
+"""Tests for loading Goal Seek scenarios with their latest snapshot."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.models.goal_seek import GoalSeekScenario, NsrSnapshot
+from app.nsr_engine.calculations import compute_nsr_summary
+from app.nsr_engine.models import NSRInput
+from app.services.alert_checker import _check_scenarios, _compute_scenarios_nsr
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+PRICES = {"cu_price": 4.5, "au_price": 2000.0, "ag_price": 25.0}
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    tables = [GoalSeekScenario.__table__, NsrSnapshot.__table__]
+    GoalSeekScenario.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield session
+
+
+def _scenario(name, **kwargs):
+    return GoalSeekScenario(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        name=name,
+        base_inputs={"mine": "Vermelhos UG", "area": "Vermelhos Sul", "cu_grade": 1.4},
+        target_variable="cu_price",
+        target_nsr=50.0,
+        threshold_value=4.0,
+        alert_enabled=True,
+        alert_frequency="daily",
+        **kwargs,
+    )
+
+
+def _snapshot(scenario, timestamp, nsr):
+    return NsrSnapshot(
+        scenario_id=scenario.id,
+        timestamp=timestamp,
+        nsr_per_tonne=nsr,
+        nsr_cu=nsr,
+        nsr_au=0.0,
+        nsr_ag=0.0,
+        cu_price=4.5,
+        au_price=2000.0,
+        ag_price=25.0,
+        cu_tc=50.0,
+        cu_rc=0.05,
+        cu_freight=100.0,
+        is_viable=nsr >= 50.0,
+    )
+
+
+class TestWithLatestSnapshot:
+    """Tests for GoalSeekScenario.with_latest_snapshot."""
+
+    def test_returns_newest_snapshot_per_scenario(self, session):
+        seeded, empty = _scenario("Seeded"), _scenario("Empty")
+        session.add_all([seeded, empty])
+        session.add_all([
+            _snapshot(seeded, NOW - timedelta(days=d), float(d)) for d in (3, 1, 2)
+        ])
+        session.commit()
+
+        rows = session.execute(GoalSeekScenario.with_latest_snapshot()).all()
+        latest = {scenario.name: snapshot for scenario, snapshot in rows}
+
+        assert len(rows) == 2
+        assert latest["Seeded"].nsr_per_tonne == 1.0
+        assert latest["Empty"] is None
+
+
+class TestCheckScenarios:
+    """Tests for resuming alert state from the latest snapshot."""
+
+    def test_not_due_until_interval_after_latest_snapshot(self, session):
+        scenario = _scenario("Seeded")
+        latest = _snapshot(scenario, NOW - timedelta(hours=2), 10.0)
+
+        _check_scenarios(session, [(scenario, latest)], PRICES, NOW)
+
+        assert scenario.alert_last_checked_at is None
+        assert scenario.last_nsr_value is None
+
+    def test_previous_nsr_falls_back_to_latest_snapshot(self, session, monkeypatch):
+        sent = []
+        monkeypatch.setattr("app.services.alert_checker.is_email_configured", lambda: True)
+        monkeypatch.setattr(
+            "app.services.alert_checker.send_viability_alert",
+            lambda **kwargs: sent.append(kwargs) or True,
+        )
+        scenario = _scenario("Seeded", alert_email="ops@example.com")
+        latest = _snapshot(scenario, NOW - timedelta(days=2), 10.0)
+
+        _check_scenarios(session, [(scenario, latest)], PRICES, NOW)
+
+        assert scenario.alert_last_checked_at == NOW
+        assert scenario.last_nsr_value >= scenario.target_nsr
+        assert len(sent) == 1
+        assert scenario.alert_triggered_at == NOW
+
+    def test_invalid_base_inputs_are_skipped(self, session):
+        scenario = _scenario("Broken")
+        scenario.base_inputs = {**scenario.base_inputs, "cu_grade": -1.0}
+
+        _check_scenarios(session, [(scenario, None)], PRICES, NOW)
+
+        assert scenario.alert_last_checked_at is None
+        assert session.scalar(select(func.count()).select_from(NsrSnapshot)) == 0
+
+    def test_inserts_one_snapshot_per_due_scenario(self, session):
+        due, recent = _scenario("Due"), _scenario("Recent")
+        recent.alert_last_checked_at = NOW - timedelta(hours=1)
+
+        _check_scenarios(session, [(due, None), (recent, None)], PRICES, NOW)
+
+        snapshots = session.scalars(select(NsrSnapshot)).all()
+        assert [s.scenario_id for s in snapshots] == [due.id]
+        assert snapshots[0].nsr_per_tonne == due.last_nsr_value
+
+
+class TestComputeScenariosNsr:
+    """Tests for the batched NSR over scenarios."""
+
+    def test_matches_compute_nsr_summary(self):
+        base = {
+            "mine": "Vermelhos UG", "area": "Vermelhos Sul",
+            "cu_grade": 1.4, "au_grade": 0.23, "ag_grade": 2.33,
+        }
+        scenarios = [_scenario(f"S{i}") for i in range(4)]
+        scenarios[0].base_inputs = base
+        scenarios[1].base_inputs = {**base, "mine": "Pilar UG", "area": "MSBSUL", "cu_grade": 0.7}
+        scenarios[2].base_inputs = {**base, "cu_tc": 60.0}
+        scenarios[3].base_inputs = {**base, "cu_rc": 0.0, "ag_grade": 3.0}
+
+        nsr = _compute_scenarios_nsr(scenarios, PRICES)
+
+        assert nsr["valid"].all()
+        for i, scenario in enumerate(scenarios):
+            expected = compute_nsr_summary(NSRInput(**scenario.base_inputs, **PRICES))
+            assert nsr["nsr_per_tonne"][i] == pytest.approx(expected.nsr_per_tonne, abs=0.01)
+            assert nsr["nsr_cu"][i] == pytest.approx(expected.nsr_cu, abs=0.01)
@@ -0,0 +1,63 @@
+"""Tests for Morton code encoding and box range decomposition."""
+
+import random
+
+from app.services.morton import MAX_CELL, MortonGrid, box_ranges, encode, grid_for_blocks
+
+
+def _covered(ranges, code):
+    return any(start <= code <= end for start, end in ranges)
+
+
+class TestEncode:
+    """Tests for bit interleaving."""
+
+    def test_interleaves_x_y_z_bits(self):
+        assert encode(1, 0, 0) == 0b001
+        assert encode(0, 1, 0) == 0b010
+        assert encode(0, 0, 1) == 0b100
+        assert encode(3, 0, 0) == 0b001001
+
+    def test_max_cell_fits_signed_bigint(self):
+        assert encode(MAX_CELL, MAX_CELL, MAX_CELL) == 2**63 - 1
+
+
+class TestBoxRanges:
+    """Tests for splitting a cell box into code ranges."""
+
+    def test_ranges_cover_every_cell_in_box(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            lo = tuple(rng.randrange(30) for _ in range(3))
+            hi = tuple(v + rng.randrange(10) for v in lo)
+            ranges = box_ranges(lo, hi)
+            for x in range(lo[0], hi[0] + 1):
+                for y in range(lo[1], hi[1] + 1):
+                    for z in range(lo[2], hi[2] + 1):
+                        assert _covered(ranges, encode(x, y, z))
+
+    def test_respects_range_budget(self):
+        for budget in (1, 4, 16):
+            assert len(box_ranges((3, 5, 7), (40, 51, 19), budget)) <= budget
+
+    def test_aligned_octant_is_a_single_range(self):
+        assert box_ranges((0, 0, 0), (7, 7, 7)) == [(0, 511)]
+
+
+class TestGrid:
+    """Tests for per-import quantization grids."""
+
+    def test_grid_uses_min_corner_and_smallest_block_size(self):
+        rows = [
+            {"x": 10.0, "y": 20.0, "z": 30.0, "dx": 5.0, "dy": 5.0, "dz": 10.0},
+            {"x": 15.0, "y": 25.0, "z": 40.0, "dx": 5.0, "dy": None, "dz": 10.0},
+        ]
+        grid = grid_for_blocks(rows)
+        assert grid == MortonGrid(10.0, 20.0, 30.0, 5.0)
+        assert grid.encode(15.0, 25.0, 40.0) == encode(1, 1, 2)
+
+    def test_open_bounds_cover_whole_axis(self):
+        grid = MortonGrid(0.0, 0.0, 0.0, 1.0)
+        ranges = grid.ranges((None, None, 2.0), (None, None, 2.0))
+        assert _covered(ranges, encode(MAX_CELL, 0, 2))
+        assert grid.ranges((None,) * 3, (None,) * 3) == [(0, 2**63 - 1)]
@@ -0,0 +1,32 @@
+"""Tests for monthly partition helpers."""
+
+from datetime import datetime, timedelta, timezone
+
+from app.db.partitions import month_start, months_between, partition_ddl
+
+
+class TestMonthlyPartitions:
+    """Tests for month bounds and partition DDL."""
+
+    def test_month_start_is_utc(self):
+        local = timezone(timedelta(hours=-3))
+        # 22:00 on Jan 31 at UTC-3 is already February in UTC
+        ts = datetime(2026, 1, 31, 22, 0, tzinfo=local)
+        assert month_start(ts) == datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+    def test_months_between_spans_year_end(self):
+        first = datetime(2025, 11, 15, tzinfo=timezone.utc)
+        last = datetime(2026, 1, 3, tzinfo=timezone.utc)
+        bounds = list(months_between(first, last))
+
+        assert [start.month for start, _ in bounds] == [11, 12, 1]
+        assert bounds[1][1] == datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert all(end == bounds[i + 1][0] for i, (_, end) in enumerate(bounds[:-1]))
+
+    def test_partition_ddl(self):
+        start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        end = datetime(2026, 4, 1, tzinfo=timezone.utc)
+        assert partition_ddl("nsr_snapshots", start, end) == (
+            "CREATE TABLE IF NOT EXISTS nsr_snapshots_y2026m03 PARTITION OF nsr_snapshots "
+            "FOR VALUES FROM ('2026-03-01T00:00:00+00:00') TO ('2026-04-01T00:00:00+00:00')"
+        )
@@ -0,0 +1,26 @@
+"""Tests for the UUIDv7 generator."""
+
+import time
+import uuid
+
+from app.db.uuid7 import uuid7
+
+
+class TestUuid7:
+    """Tests for time-ordered primary key generation."""
+
+    def test_version_and_variant(self):
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_embeds_current_millisecond_timestamp(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+        assert before <= value.int >> 80 <= after + 1
+
+    def test_ids_are_unique_and_increasing(self):
+        ids = [uuid7() for _ in range(10_000)]
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids)
@@ -99,10 +99,18 @@ export default function UsersPage() {
 
   const fetchUsers = async () => {
     try {
-      const response = await authFetch(`${API_BASE_URL}/api/v1/users`);
-      if (!response.ok) throw new Error('Failed to fetch users');
-      const data = await response.json();
-      setUsers(data.users);
+      const allUsers: User[] = [];
+      let after: string | null = null;
+      do {
+        const params = new URLSearchParams({ limit: '200' });
+        if (after) params.set('after', after);
+        const response = await authFetch(`${API_BASE_URL}/api/v1/users?${params}`);
+        if (!response.ok) throw new Error('Failed to fetch users');
+        const data = await response.json();
+        allUsers.push(...data.users);
+        after = data.next;
+      } while (after);
+      setUsers(allUsers);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Error fetching users');
     } finally {
@@ -112,8 +120,8 @@ export default function UsersPage() {
 
   const toggleAdmin = async (userId: string, currentStatus: boolean) => {
     try {
-      const response = await authFetch(`${API_BASE_URL}/api/v1/users/${userId}`, {
-        method: 'PUT',
+      const response = await authFetch(`${API_BASE_URL}/api/v1/users/${userId}/status`, {
+        method: 'PATCH',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ is_admin: !currentStatus }),
       });
@@ -126,8 +134,8 @@ export default function UsersPage() {
 
   const toggleActive = async (userId: string, currentStatus: boolean) => {
     try {
-      const response = await authFetch(`${API_BASE_URL}/api/v1/users/${userId}`, {
-        method: 'PUT',
+      const response = await authFetch(`${API_BASE_URL}/api/v1/users/${userId}/status`, {
+        method: 'PATCH',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ is_active: !currentStatus }),
       });
@@ -271,7 +279,7 @@ export default function UsersPage() {
       }
 
       // Update user info
-      const response = await authFetch(`${API_BASE_URL}/api/v1/users/${editingUser.id}`, {
+      const response = await authFetch(`${API_BASE_URL}/api/v1/users/${editingUser.id}?include_mine_access=false`, {
         method: 'PUT',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(updateData),